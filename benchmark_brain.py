@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do Motor de IA do JARVIS
+Carga crescente sobre AIBrain.process_command e /api/analyze do jarvis-cyber
+
+Por padrão sobe o servidor LLM simulado (llm_stub_server.py) no próprio
+processo; nenhuma chave de API é necessária.
+
+Uso:
+    python benchmark_brain.py                                   # AIBrain, concorrência 1..16
+    python benchmark_brain.py --concurrency 1,4,16,64 --requests 128
+    python benchmark_brain.py --latency 0.8 --failure-rate 0.05 --no-streaming
+    python benchmark_brain.py --target cyber --cyber-url http://127.0.0.1:8000
+        (servidor iniciado com OPENAI_API_KEY=stub OPENAI_API_BASE=http://127.0.0.1:8089/v1)
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Adicionar src ao Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from llm_stub_server import StubLLMServer, StubSettings
+
+FALLBACK_RESPONSE = "Desculpe, não consigo processar essa solicitação no momento."
+
+def percentile(values, pct):
+    """Percentil simples por interpolação"""
+    if not values:
+        return float('nan')
+    return float(np.percentile(values, pct))
+
+def describe(name, latencies, errors, elapsed):
+    """Formata as métricas de um nível de concorrência"""
+    if not latencies:
+        return f"{name:<14} sem amostras ({errors} erros)"
+    ms = [v * 1000 for v in latencies]
+    return (f"{name:<14} n={len(ms):<5} erros={errors:<4} "
+            f"p50={percentile(ms, 50):7.1f}ms p95={percentile(ms, 95):7.1f}ms "
+            f"p99={percentile(ms, 99):7.1f}ms  {len(ms) / max(elapsed, 1e-9):7.1f} req/s")
+
+def run_level(call, concurrency, total):
+    """Executa ``total`` chamadas com ``concurrency`` threads simultâneas
+    
+    ``call(n)`` retorna True em caso de sucesso. Retorna as latências das
+    chamadas bem-sucedidas, o número de erros e o tempo total.
+    """
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    
+    def timed(n):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            ok = call(n)
+        except Exception:
+            ok = False
+        duration = time.perf_counter() - start
+        with lock:
+            if ok:
+                latencies.append(duration)
+            else:
+                errors += 1
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, range(total)))
+    return latencies, errors, time.perf_counter() - started
+
+def make_brain_target(args, api_base):
+    """AIBrain real, apontado para o servidor simulado"""
+    from core.events import EventManager, Events
+    from ai.brain import AIBrain
+    
+    config = {
+        'ai': {
+            'openai_api_key': 'stub',
+            'api_base': api_base,
+            'streaming': args.streaming,
+            'client': {'max_concurrency': args.client_concurrency, 'timeout': args.timeout},
+            'response_cache': {'enabled': False},
+            'partial_matching': {'enabled': False}
+        }
+    }
+    brain = AIBrain(config)
+    
+    # Comandos únicos: sem coalescência, sem cache e sem respostas pré-definidas
+    template = "resuma o relatório técnico {} em uma frase"
+    assert brain._try_predefined_response(template.format(0)) is None
+    
+    responses = {}
+    received = threading.Condition()
+    
+    def on_response(data):
+        with received:
+            responses[data['command']] = data['text']
+            received.notify_all()
+    
+    EventManager.get_instance().subscribe(Events.AI_RESPONSE, on_response)
+    counter = itertools.count()
+    
+    def call(_):
+        command = template.format(next(counter))
+        brain.process_command({'text': command})
+        
+        # A resposta é entregue por evento; falhas do modelo viram a resposta padrão
+        with received:
+            received.wait_for(lambda: command in responses, timeout=args.timeout)
+            text = responses.pop(command, None)
+        return text is not None and text != FALLBACK_RESPONSE
+    
+    def close():
+        EventManager.get_instance().unsubscribe(Events.AI_RESPONSE, on_response)
+        stats = brain.get_client_stats()
+        brain.shutdown()
+        return stats
+    
+    return call, close
+
+def make_cyber_target(args):
+    """Endpoint /api/analyze do servidor jarvis-cyber em execução"""
+    url = args.cyber_url.rstrip('/') + '/api/analyze'
+    
+    def call(n):
+        body = json.dumps({'text': f"Resuma o alerta de segurança {n}", 'context': 'benchmark'}).encode('utf-8')
+        request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=args.timeout) as response:
+                return response.status == 200
+        except urllib.error.URLError:
+            return False
+    
+    return call, lambda: {}
+
+def run_benchmark(args):
+    """Sobe o servidor simulado (se preciso) e percorre os níveis de concorrência"""
+    server = None
+    api_base = args.api_base
+    if not api_base:
+        settings = StubSettings(
+            latency=args.latency, jitter=args.jitter, tokens_per_second=args.tokens_per_second,
+            failure_rate=args.failure_rate, rate_limit_rate=args.rate_limit_rate, seed=42
+        )
+        server = StubLLMServer(settings, port=args.stub_port).start()
+        api_base = server.api_base
+    
+    levels = [int(level) for level in args.concurrency.split(',')]
+    
+    print("=" * 78)
+    print("🧠 Benchmark do motor de IA")
+    print("=" * 78)
+    print(f"LLM: {api_base}" + (f" (simulado: latência {args.latency}s ±{args.jitter}s, "
+                                f"{args.tokens_per_second} tokens/s, falhas {args.failure_rate:.0%}, "
+                                f"429 {args.rate_limit_rate:.0%})" if server else ""))
+    print(f"Requisições por nível: {args.requests} | Streaming: {args.streaming} | "
+          f"Concorrência do cliente: {args.client_concurrency}")
+    
+    targets = []
+    if args.target in ('brain', 'all'):
+        targets.append(('AIBrain', make_brain_target(args, api_base)))
+    if args.target in ('cyber', 'all'):
+        if args.cyber_url:
+            targets.append(('/api/analyze', make_cyber_target(args)))
+        else:
+            print("Obs.: --cyber-url não informado; /api/analyze ignorado")
+    
+    for name, (call, close) in targets:
+        print("-" * 78)
+        print(f"{name}")
+        call(-1)  # Aquecimento: conexões e threads
+        for concurrency in levels:
+            latencies, errors, elapsed = run_level(call, concurrency, args.requests)
+            print(describe(f"  c={concurrency}", latencies, errors, elapsed))
+        stats = close()
+        if stats:
+            print(f"  Cliente LLM: {stats}")
+    
+    if server:
+        print("-" * 78)
+        print(f"Servidor simulado: {server.get_stats()}")
+        server.stop()
+
+def main():
+    """Ponto de entrada"""
+    parser = argparse.ArgumentParser(description="Benchmark do motor de IA do JARVIS")
+    parser.add_argument('--target', default='brain', choices=['brain', 'cyber', 'all'])
+    parser.add_argument('--concurrency', default='1,2,4,8,16', help="Níveis de concorrência (lista)")
+    parser.add_argument('--requests', type=int, default=64, help="Requisições por nível")
+    parser.add_argument('--api-base', help="LLM externo (padrão: servidor simulado embutido)")
+    parser.add_argument('--stub-port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.3, help="Simulado: tempo até o primeiro token (s)")
+    parser.add_argument('--jitter', type=float, default=0.1, help="Simulado: variação da latência (± s)")
+    parser.add_argument('--tokens-per-second', type=float, default=50.0, help="Simulado: velocidade de geração")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Simulado: fração de HTTP 500")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Simulado: fração de HTTP 429")
+    parser.add_argument('--no-streaming', dest='streaming', action='store_false', help="Desativa o streaming no AIBrain")
+    parser.add_argument('--client-concurrency', type=int, default=8, help="Chamadas simultâneas do cliente LLM")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Prazo por chamada (s)")
+    parser.add_argument('--cyber-url', help="URL do servidor jarvis-cyber (ex.: http://127.0.0.1:8000)")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING)
+    run_benchmark(args)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark da Análise de Sentimento do JARVIS
+Compara o léxico compilado (texto a texto, com cache e em lote) com o TextBlob
+
+Uso:
+    python benchmark_sentiment.py                       # 20000 frases, 80% repetidas
+    python benchmark_sentiment.py --samples 100000 --repeat-ratio 0.8
+    python benchmark_sentiment.py --textblob-samples 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Adicionar src ao Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from ai.advanced_brain import AdvancedAI
+from ai.sentiment import SentimentScorer, TextBlob
+
+TEMPLATES = [
+    "jarvis {mod} {adj} o sistema hoje",
+    "eu {neg} gostei do resultado, foi {adj}",
+    "a rede está {adj} e {adj}",
+    "obrigado jarvis, ficou {mod} {adj}",
+    "que {adj}, o servidor {neg} respondeu",
+    "acender a luz da sala por favor",
+    "qual a temperatura do quarto agora",
+    "toque uma música {adj} para mim"
+]
+ADJECTIVES = ['bom', 'ótimo', 'excelente', 'ruim', 'péssimo', 'lento', 'rápido', 'horrível',
+              'incrível', 'estável', 'normal', 'chato', 'legal', 'travando']
+MODIFIERS = ['muito', 'super', 'pouco', 'bem', '']
+NEGATIONS = ['não', 'nunca', '']
+
+def make_samples(count, repeat_ratio, seed=42):
+    """Frases sintéticas de comandos; ``repeat_ratio`` delas repetem frases anteriores"""
+    rnd = random.Random(seed)
+    samples = []
+    for n in range(count):
+        if samples and rnd.random() < repeat_ratio:
+            samples.append(rnd.choice(samples))
+            continue
+        text = rnd.choice(TEMPLATES).format(
+            adj=rnd.choice(ADJECTIVES), mod=rnd.choice(MODIFIERS), neg=rnd.choice(NEGATIONS)
+        )
+        samples.append(f"{' '.join(text.split())} #{n}")
+    return samples
+
+def timed(name, fn, count):
+    """Executa ``fn`` e mostra microssegundos por texto e textos por segundo"""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<30} {elapsed * 1e6 / count:9.2f} us/texto  {count / max(elapsed, 1e-9):12.0f} textos/s")
+    return result
+
+def run_benchmark(args):
+    samples = make_samples(args.samples, args.repeat_ratio)
+    labels = AdvancedAI.emotion_label
+    
+    print("=" * 78)
+    print("💬 Benchmark de análise de sentimento")
+    print("=" * 78)
+    print(f"Frases: {len(samples)} | Repetidas: {args.repeat_ratio:.0%}")
+    print("-" * 78)
+    
+    cold = SentimentScorer(cache_size=0)
+    timed("Léxico, sem cache", lambda: [cold.score(text) for text in samples], len(samples))
+    
+    cached = SentimentScorer()
+    single = timed("Léxico, cache LRU", lambda: [cached.score(text) for text in samples], len(samples))
+    print(f"{'':<30} cache: {cached.cache_info()}")
+    
+    batch = SentimentScorer()
+    polarities, _ = timed("Léxico, lote (numpy)", lambda: batch.score_batch(samples), len(samples))
+    mismatch = np.abs(polarities - np.array([result.polarity for result in single])).max()
+    print(f"{'':<30} diferença máxima lote x individual: {mismatch:.2e}")
+    
+    if TextBlob is None:
+        print("TextBlob                       não instalado (pip install textblob) — comparação ignorada")
+        return
+    
+    subset = samples[:args.textblob_samples]
+    blob = timed("TextBlob", lambda: [SentimentScorer.score_textblob(text) for text in subset], len(subset))
+    agreement = np.mean([labels(a.polarity) == labels(b.polarity) for a, b in zip(single, blob)])
+    print(f"{'':<30} mesma classe de emoção que o léxico: {agreement:.0%} ({len(subset)} frases)")
+
+def main():
+    """Ponto de entrada"""
+    parser = argparse.ArgumentParser(description="Benchmark da análise de sentimento do JARVIS")
+    parser.add_argument('--samples', type=int, default=20000, help="Número de frases")
+    parser.add_argument('--repeat-ratio', type=float, default=0.8, help="Fração de frases repetidas")
+    parser.add_argument('--textblob-samples', type=int, default=2000, help="Frases medidas com o TextBlob")
+    args = parser.parse_args()
+    
+    run_benchmark(args)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do Front-end de Voz do JARVIS
+Reproduz fixtures WAV no VoiceRecognizer e mede latências sem microfone
+
+Uso:
+    python benchmark_voice.py                       # fixture sintética, ASR roteirizado
+    python benchmark_voice.py --speed 4 --rounds 10
+    python benchmark_voice.py --wav fixture.wav --transcripts fixture.txt
+    python benchmark_voice.py --wav fixture.wav --engine sphinx
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+import numpy as np
+
+# Adicionar src ao Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.audio_capture import WavFileSource
+from core.events import EventManager, Events
+from core.voice_recognition import VoiceRecognizer
+import speech_recognition as sr
+
+SAMPLE_RATE = 16000
+CHUNK_SIZE = 1024
+
+def generate_fixture(path, rounds=5, wake_word='jarvis', command='acender as luzes da sala'):
+    """Gera uma fixture sintética alternando wake word e comando
+    
+    Retorna a lista de transcrições e os segmentos de fala (início, fim) em segundos.
+    """
+    rng = np.random.default_rng(42)
+    pieces = []
+    segments = []
+    transcripts = []
+    position = 0.0
+    
+    def add_silence(seconds):
+        nonlocal position
+        pieces.append((rng.standard_normal(int(seconds * SAMPLE_RATE)) * 30).astype(np.int16))
+        position += seconds
+    
+    def add_speech(seconds, text):
+        nonlocal position
+        t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        # Sinal harmônico modulado, com energia bem acima do limiar padrão
+        envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+        signal = envelope * (np.sin(2 * np.pi * 180 * t) + 0.5 * np.sin(2 * np.pi * 360 * t))
+        pieces.append((signal * 6000).astype(np.int16))
+        segments.append((position, position + seconds))
+        transcripts.append(text)
+        position += seconds
+    
+    add_silence(1.0)
+    for _ in range(rounds):
+        add_speech(0.6, wake_word)
+        add_silence(1.2)
+        add_speech(1.5, command)
+        add_silence(1.5)
+    
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(np.concatenate(pieces).tobytes())
+    
+    return transcripts, segments
+
+def find_speech_segments(path, energy_threshold, pause_threshold=0.8):
+    """Segmenta uma fixture real por energia (referência para o endpointing)"""
+    with wave.open(path, 'rb') as wav:
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    
+    chunk_duration = CHUNK_SIZE / SAMPLE_RATE
+    pause_chunks = max(1, int(round(pause_threshold / chunk_duration)))
+    segments = []
+    start = None
+    silent = 0
+    
+    for index in range(0, len(samples) // CHUNK_SIZE):
+        chunk = samples[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE].astype(np.float32)
+        speech = np.sqrt(np.mean(chunk * chunk)) > energy_threshold
+        if speech:
+            if start is None:
+                start = index
+            silent = 0
+            end = index + 1
+        elif start is not None:
+            silent += 1
+            if silent >= pause_chunks:
+                segments.append((start * chunk_duration, end * chunk_duration))
+                start = None
+    
+    if start is not None:
+        segments.append((start * chunk_duration, end * chunk_duration))
+    return segments
+
+def percentile(values, pct):
+    """Percentil simples por interpolação"""
+    if not values:
+        return float('nan')
+    return float(np.percentile(values, pct))
+
+def describe(name, values):
+    """Formata estatísticas de uma série de latências (ms)"""
+    if not values:
+        return f"{name:<28} sem amostras"
+    ms = [v * 1000 for v in values]
+    return (f"{name:<28} n={len(ms):<4} média={statistics.mean(ms):7.1f}ms "
+            f"p50={percentile(ms, 50):7.1f}ms p95={percentile(ms, 95):7.1f}ms")
+
+def run_benchmark(args):
+    """Executa a reprodução e coleta as métricas"""
+    temp_dir = None
+    if args.wav:
+        wav_path = args.wav
+        segments = find_speech_segments(wav_path, args.energy_threshold)
+        transcripts = []
+        if args.transcripts:
+            with open(args.transcripts, 'r', encoding='utf-8') as f:
+                transcripts = [line.strip() for line in f if line.strip()]
+    else:
+        temp_dir = tempfile.mkdtemp(prefix='jarvis_bench_')
+        wav_path = os.path.join(temp_dir, 'fixture.wav')
+        transcripts, segments = generate_fixture(wav_path, rounds=args.rounds)
+    
+    config = {
+        'audio': {
+            'sample_rate': SAMPLE_RATE,
+            'chunk_size': CHUNK_SIZE,
+            'recognition': {'engine': args.engine, 'workers': args.workers, 'queue_size': args.queue_size},
+            'calibration': {'path': None, 'adaptive': not args.fixed_threshold}
+        },
+        'jarvis': {'wake_word': 'jarvis', 'personality': {'language': args.language}}
+    }
+    
+    # ASR roteirizado: retorna as transcrições na ordem, com latência simulada
+    asr_times = []
+    audio_seconds = []
+    script = iter(transcripts)
+    script_lock = threading.Lock()
+    
+    def scripted(audio):
+        time.sleep(args.asr_delay)
+        with script_lock:
+            text = next(script, None)
+        if text is None:
+            raise sr.UnknownValueError()
+        return text
+    
+    base_recognize = scripted if args.engine == 'scripted' else None
+    
+    source = WavFileSource(wav_path, SAMPLE_RATE, CHUNK_SIZE, speed=args.speed)
+    recognizer = VoiceRecognizer(config, audio_source=source)
+    recognizer.noise_tracker.energy_threshold = args.energy_threshold
+    recognizer.phrase_detector.energy_threshold = args.energy_threshold
+    engine = base_recognize or recognizer._recognize
+    
+    def timed_recognize(audio):
+        start = time.perf_counter()
+        try:
+            return engine(audio)
+        finally:
+            asr_times.append(time.perf_counter() - start)
+            audio_seconds.append(len(audio.frame_data) / (audio.sample_rate * audio.sample_width))
+    
+    recognizer.recognize = timed_recognize
+    
+    # Coletar eventos
+    events = []
+    events_lock = threading.Lock()
+    
+    def collector(event_type):
+        def callback(data):
+            with events_lock:
+                events.append((event_type, time.time(), data))
+        return callback
+    
+    event_manager = EventManager.get_instance()
+    on_wake = collector(Events.WAKE_WORD_DETECTED)
+    on_command = collector(Events.VOICE_COMMAND)
+    event_manager.subscribe(Events.WAKE_WORD_DETECTED, on_wake)
+    event_manager.subscribe(Events.VOICE_COMMAND, on_command)
+    
+    started = time.time()
+    recognizer.start_listening()
+    source.finished.wait()
+    
+    # Aguardar o pool drenar
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        stats = recognizer.get_recognition_stats()
+        if stats['queue_depth'] == 0 and stats['active'] == 0 and stats['processed'] >= stats['submitted']:
+            break
+        time.sleep(0.05)
+    time.sleep(0.2)
+    recognizer.stop_listening()
+    elapsed = time.time() - started
+    
+    event_manager.unsubscribe(Events.WAKE_WORD_DETECTED, on_wake)
+    event_manager.unsubscribe(Events.VOICE_COMMAND, on_command)
+    
+    # Associar cada evento ao segmento de fala que o originou
+    segment_ends = [source.wall_time(end) for _, end in segments]
+    endpoint_latency = []
+    wake_latency = []
+    command_latency = []
+    
+    for event_type, received_at, data in events:
+        captured_at = data.get('captured_at')
+        if captured_at is None:
+            continue
+        candidates = [end for end in segment_ends if end <= captured_at]
+        if not candidates:
+            continue
+        speech_end = candidates[-1]
+        endpoint_latency.append(captured_at - speech_end)
+        if event_type == Events.WAKE_WORD_DETECTED:
+            wake_latency.append(received_at - speech_end)
+        else:
+            command_latency.append(received_at - speech_end)
+    
+    stats = recognizer.get_recognition_stats()
+    total_asr = sum(asr_times)
+    total_audio = sum(audio_seconds)
+    
+    print("=" * 72)
+    print("🎤 Benchmark do front-end de voz")
+    print("=" * 72)
+    print(f"Fixture: {wav_path} ({source.duration:.1f}s de áudio, {len(segments)} segmentos de fala)")
+    print(f"Velocidade: {args.speed}x | Engine: {args.engine} | Workers: {args.workers}")
+    print(f"Tempo total: {elapsed:.2f}s | Overruns do buffer: {source.ring.overruns}")
+    print("-" * 72)
+    print(describe("Latência do endpointing", endpoint_latency))
+    print(describe("Latência da wake word", wake_latency))
+    print(describe("Latência do comando", command_latency))
+    print("-" * 72)
+    if asr_times:
+        print(f"ASR: {len(asr_times)} frases em {total_asr:.2f}s de processamento "
+              f"→ {len(asr_times) / max(total_asr, 1e-9):.1f} frases/s, "
+              f"RTF={total_asr / max(total_audio, 1e-9):.3f}")
+    else:
+        print("ASR: nenhuma frase reconhecida")
+    print(f"Pool: {stats}")
+    if args.speed != 1.0:
+        print(f"Obs.: com {args.speed}x, a pausa de endpointing também é acelerada.")
+    
+    if temp_dir:
+        os.remove(wav_path)
+        os.rmdir(temp_dir)
+
+def main():
+    """Ponto de entrada"""
+    parser = argparse.ArgumentParser(description="Benchmark do front-end de voz do JARVIS")
+    parser.add_argument('--wav', help="Fixture WAV 16 kHz mono 16 bits (padrão: sintética)")
+    parser.add_argument('--transcripts', help="Transcrições por frase, uma por linha (engine scripted)")
+    parser.add_argument('--engine', default='scripted', choices=['scripted', 'sphinx', 'google'])
+    parser.add_argument('--language', default='pt-BR')
+    parser.add_argument('--speed', type=float, default=1.0, help="Velocidade de reprodução")
+    parser.add_argument('--rounds', type=int, default=5, help="Repetições na fixture sintética")
+    parser.add_argument('--asr-delay', type=float, default=0.15, help="Latência simulada do ASR roteirizado (s)")
+    parser.add_argument('--energy-threshold', type=float, default=300, help="Limiar inicial de energia")
+    parser.add_argument('--fixed-threshold', action='store_true', help="Desativa a calibração adaptativa")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--queue-size', type=int, default=4)
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING)
+    run_benchmark(args)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
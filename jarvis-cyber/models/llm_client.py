@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JARVIS Cyber Security - Cliente LLM
+Reexporta o cliente assíncrono do JARVIS principal (src/ai/llm_client.py)
+
+Não há cópia: o módulo é carregado pelo caminho do arquivo, sem pôr o
+``src/`` inteiro no ``sys.path``. ``JARVIS_SRC`` aponta para outro checkout
+do JARVIS quando o jarvis-cyber não estiver dentro dele.
+"""
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+JARVIS_SRC = Path(os.getenv("JARVIS_SRC", Path(__file__).resolve().parents[2] / "src"))
+MODULE_NAME = "jarvis_llm_client"
+
+def _load_client_module():
+    """Carrega (uma vez por processo) o ``ai/llm_client.py`` do JARVIS"""
+    module = sys.modules.get(MODULE_NAME)
+    if module is not None:
+        return module
+    
+    path = JARVIS_SRC / "ai" / "llm_client.py"
+    if not path.is_file():
+        raise ImportError(f"Cliente LLM do JARVIS não encontrado em {path} (defina JARVIS_SRC)")
+    
+    spec = importlib.util.spec_from_file_location(MODULE_NAME, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[MODULE_NAME] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[MODULE_NAME]
+        raise
+    return module
+
+_client_module = _load_client_module()
+
+LLMClient = _client_module.LLMClient
+LLMError = _client_module.LLMError
+DEFAULT_API_BASE = _client_module.DEFAULT_API_BASE
\ No newline at end of file
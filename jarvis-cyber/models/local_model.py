@@ -15,6 +15,10 @@ logger = logging.getLogger('jarvis.model')
 
 # Configurações
 OPENAI_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_API_BASE = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "20"))
 USE_LOCAL = os.getenv("USE_LOCAL_MODEL", "false").lower() == "true"
 LLAMA_MODEL_PATH = os.getenv("LLAMA_MODEL_PATH", "./models/ggml-model.bin")
 GPT4ALL_MODEL_PATH = os.getenv("GPT4ALL_MODEL_PATH", "./models/gpt4all-model.bin")
@@ -30,6 +34,7 @@ class LocalModelWrapper:
         self.model_type = None
         self.model = None
         self.openai = None
+        self.llm_client = None
         
         # Estatísticas de uso
         self.request_count = 0
@@ -47,7 +52,7 @@ class LocalModelWrapper:
         if not self.model and OPENAI_KEY:
             self._initialize_openai()
         
-        if not self.model and not self.openai:
+        if not self.model and not self.openai and not self.llm_client:
             logger.warning("Nenhum modelo disponível. Sistema funcionará com respostas limitadas.")
     
     def _try_local_models(self):
@@ -116,6 +121,25 @@ class LocalModelWrapper:
             logger.error("Biblioteca openai não disponível")
         except Exception as e:
             logger.error(f"Erro ao configurar OpenAI: {e}")
+        
+        # Cliente assíncrono com pool de conexões e limite de concorrência
+        try:
+            try:
+                from .llm_client import LLMClient
+            except ImportError:  # Execução direta (python models/local_model.py)
+                from llm_client import LLMClient
+            self.llm_client = LLMClient(
+                api_key=OPENAI_KEY,
+                api_base=OPENAI_API_BASE,
+                max_concurrency=LLM_MAX_CONCURRENCY,
+                timeout=LLM_TIMEOUT
+            )
+            self.model_type = "openai"
+            logger.info(f"✅ Cliente LLM assíncrono configurado ({OPENAI_API_BASE})")
+        except ImportError as e:
+            logger.info(f"Cliente LLM assíncrono não disponível: {e}")
+        except Exception as e:
+            logger.error(f"Erro ao configurar cliente LLM assíncrono: {e}")
     
     def chat(self, prompt: str, max_tokens: int = 512, temperature: float = 0.7) -> str:
         """
@@ -198,10 +222,18 @@ class LocalModelWrapper:
     def _generate_openai(self, prompt: str, max_tokens: int, temperature: float) -> str:
         """Gerar resposta com OpenAI"""
         try:
+            if self.llm_client:
+                return self.llm_client.chat(
+                    [{"role": "system", "content": prompt}],
+                    model=OPENAI_MODEL,
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                )
+            
             # Usar ChatCompletion se disponível
             if hasattr(self.openai, 'ChatCompletion'):
                 response = self.openai.ChatCompletion.create(
-                    model="gpt-4o-mini",
+                    model=OPENAI_MODEL,
                     messages=[{"role": "system", "content": prompt}],
                     max_tokens=max_tokens,
                     temperature=temperature
@@ -275,7 +307,7 @@ class LocalModelWrapper:
         
         return {
             "type": self.model_type,
-            "available": self.model is not None or self.openai is not None,
+            "available": self.model is not None or self.openai is not None or self.llm_client is not None,
             "requests": self.request_count,
             "total_tokens": self.total_tokens,
             "uptime_seconds": uptime,
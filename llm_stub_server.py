@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servidor LLM Simulado do JARVIS
+API compatível com OpenAI (/v1/chat/completions) para testes de carga sem chave
+
+Uso:
+    python llm_stub_server.py                                   # porta 8089
+    python llm_stub_server.py --latency 0.4 --tokens-per-second 40
+    python llm_stub_server.py --failure-rate 0.05 --rate-limit-rate 0.05
+
+Aponte os clientes para ele:
+    config.json → "ai": {"api_base": "http://127.0.0.1:8089/v1", ...}
+    jarvis-cyber → OPENAI_API_KEY=stub OPENAI_API_BASE=http://127.0.0.1:8089/v1
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+
+from aiohttp import web
+
+DEFAULT_RESPONSE = ("Certamente, senhor. Analisei a sua solicitação e aqui está um resumo objetivo. "
+                    "Os sistemas estão operando dentro dos parâmetros esperados. "
+                    "Posso detalhar qualquer ponto se desejar.")
+
+class StubSettings:
+    """Comportamento simulado do modelo"""
+    
+    def __init__(self, latency=0.3, jitter=0.1, tokens_per_second=50.0, max_tokens=None,
+                 failure_rate=0.0, rate_limit_rate=0.0, retry_after=0.2, response=DEFAULT_RESPONSE,
+                 seed=None):
+        self.latency = latency                      # Tempo até o primeiro token (s)
+        self.jitter = jitter                        # Variação uniforme ± sobre a latência (s)
+        self.tokens_per_second = tokens_per_second  # Velocidade de geração (0 = instantânea)
+        self.max_tokens = max_tokens
+        self.failure_rate = failure_rate            # Fração de respostas HTTP 500
+        self.rate_limit_rate = rate_limit_rate      # Fração de respostas HTTP 429
+        self.retry_after = retry_after
+        self.response = response
+        self.random = random.Random(seed)
+
+def tokenize(text):
+    """Divide o texto em "tokens" (palavras com o espaço anterior)"""
+    tokens = []
+    for index, word in enumerate(text.split(' ')):
+        tokens.append(word if index == 0 else ' ' + word)
+    return [token for token in tokens if token]
+
+class StubLLMServer:
+    """Servidor aiohttp com as rotas mínimas da API de chat"""
+    
+    def __init__(self, settings=None, host='127.0.0.1', port=8089):
+        self.settings = settings or StubSettings()
+        self.host = host
+        self.port = port
+        
+        self.requests = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.cancelled = 0
+        self.active = 0
+        self.max_active = 0
+        
+        self._loop = None
+        self._runner = None
+        self._thread = None
+    
+    def build_app(self):
+        app = web.Application()
+        app.router.add_post('/v1/chat/completions', self.chat_completions)
+        app.router.add_get('/v1/models', self.models)
+        app.router.add_get('/stats', self.stats)
+        return app
+    
+    def _reply_text(self, payload):
+        """Texto da resposta, limitado por max_tokens"""
+        tokens = tokenize(self.settings.response)
+        limit = payload.get('max_tokens') or self.settings.max_tokens
+        return tokens[:limit] if limit else tokens
+    
+    async def chat_completions(self, request):
+        settings = self.settings
+        self.requests += 1
+        payload = await request.json()
+        
+        roll = settings.random.random()
+        if roll < settings.rate_limit_rate:
+            self.rate_limited += 1
+            return web.json_response(
+                {'error': {'message': 'Rate limit simulado', 'type': 'rate_limit'}},
+                status=429, headers={'Retry-After': str(settings.retry_after)}
+            )
+        if roll < settings.rate_limit_rate + settings.failure_rate:
+            self.failures += 1
+            return web.json_response({'error': {'message': 'Falha simulada', 'type': 'server_error'}}, status=500)
+        
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            delay = settings.latency + settings.random.uniform(-settings.jitter, settings.jitter)
+            await asyncio.sleep(max(0.0, delay))
+            if self._disconnected(request):
+                return web.Response(status=499)
+            
+            tokens = self._reply_text(payload)
+            token_delay = 1.0 / settings.tokens_per_second if settings.tokens_per_second else 0.0
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            model = payload.get('model', 'stub')
+            
+            if payload.get('stream'):
+                return await self._stream(request, tokens, token_delay, completion_id, model)
+            
+            await asyncio.sleep(token_delay * len(tokens))
+            if self._disconnected(request):
+                return web.Response(status=499)
+            return web.json_response({
+                'id': completion_id,
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': ''.join(tokens)},
+                    'finish_reason': 'stop'
+                }],
+                'usage': {'prompt_tokens': 0, 'completion_tokens': len(tokens), 'total_tokens': len(tokens)}
+            })
+        finally:
+            self.active -= 1
+    
+    async def _stream(self, request, tokens, token_delay, completion_id, model):
+        """Resposta em Server-Sent Events, um token por evento"""
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'})
+        await response.prepare(request)
+        
+        for token in tokens:
+            if self._disconnected(request):
+                break  # Cliente cancelou (ex.: perdeu a disputa de um hedge)
+            event = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'model': model,
+                'choices': [{'index': 0, 'delta': {'content': token}, 'finish_reason': None}]
+            }
+            await response.write(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode('utf-8'))
+            await asyncio.sleep(token_delay)
+        
+        if not self._disconnected(request):
+            await response.write(b"data: [DONE]\n\n")
+            await response.write_eof()
+        return response
+    
+    def _disconnected(self, request):
+        """Indica se o cliente já fechou a conexão"""
+        if request.transport is None or request.transport.is_closing():
+            self.cancelled += 1
+            return True
+        return False
+    
+    async def models(self, request):
+        return web.json_response({'object': 'list', 'data': [{'id': 'stub', 'object': 'model'}]})
+    
+    async def stats(self, request):
+        return web.json_response(self.get_stats())
+    
+    def get_stats(self):
+        return {
+            'requests': self.requests,
+            'failures': self.failures,
+            'rate_limited': self.rate_limited,
+            'cancelled': self.cancelled,
+            'active': self.active,
+            'max_active': self.max_active
+        }
+    
+    @property
+    def api_base(self):
+        return f"http://{self.host}:{self.port}/v1"
+    
+    def start(self):
+        """Inicia o servidor numa thread de fundo (uso embutido em benchmarks)"""
+        ready = threading.Event()
+        
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._runner = web.AppRunner(self.build_app())
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, self.host, self.port)
+            self._loop.run_until_complete(site.start())
+            ready.set()
+            self._loop.run_forever()
+        
+        self._thread = threading.Thread(target=run, name="LLMStubServer", daemon=True)
+        self._thread.start()
+        ready.wait(10)
+        return self
+    
+    def stop(self):
+        """Encerra o servidor iniciado com ``start``"""
+        if not self._loop:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+
+def main():
+    """Ponto de entrada"""
+    parser = argparse.ArgumentParser(description="Servidor LLM simulado compatível com OpenAI")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.3, help="Tempo até o primeiro token (s)")
+    parser.add_argument('--jitter', type=float, default=0.1, help="Variação da latência (± s)")
+    parser.add_argument('--tokens-per-second', type=float, default=50.0, help="Velocidade de geração (0 = instantânea)")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Fração de respostas HTTP 500")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Fração de respostas HTTP 429")
+    parser.add_argument('--retry-after', type=float, default=0.2, help="Retry-After das respostas 429 (s)")
+    parser.add_argument('--response', default=DEFAULT_RESPONSE, help="Texto fixo das respostas")
+    parser.add_argument('--seed', type=int, help="Semente da injeção de falhas")
+    args = parser.parse_args()
+    
+    settings = StubSettings(
+        latency=args.latency, jitter=args.jitter, tokens_per_second=args.tokens_per_second,
+        failure_rate=args.failure_rate, rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after, response=args.response, seed=args.seed
+    )
+    server = StubLLMServer(settings, args.host, args.port)
+    
+    print(f"🧪 LLM simulado em {server.api_base} "
+          f"(latência {args.latency}s ±{args.jitter}s, {args.tokens_per_second} tokens/s, "
+          f"falhas {args.failure_rate:.0%}, 429 {args.rate_limit_rate:.0%})")
+    web.run_app(server.build_app(), host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -9,12 +9,16 @@ import os
 
 # OpenAI API
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', 'sk-proj-YOUR_API_KEY_HERE')
+CHAT_MAX_TURNS = 10         # interações guardadas antes de virarem resumo
+CHAT_TOKEN_BUDGET = 1200    # limite de tokens do prompt (histórico + pergunta)
 
 # Voice Settings
 VOICE_RATE = 150
 VOICE_VOLUME = 1.0
 LISTEN_TIMEOUT = 5
 LANGUAGE = 'pt-BR'
+CALIBRATION_FILE = 'data/audio_calibration.json'  # Última calibração de ruído
+BARGE_IN_MIN_SPEECH = 0.15  # segundos de fala para interromper o JARVIS
 
 # UI Settings
 THEME_COLOR = '#4fe0ff'      # Azul neon principal
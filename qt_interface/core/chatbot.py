@@ -13,6 +13,8 @@ from pathlib import Path
 parent_dir = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(parent_dir))
 
+from src.ai.conversation_memory import ConversationMemory
+
 try:
     from src.ai.advanced_brain import AdvancedAI
     from qt_interface.config import settings
@@ -35,7 +37,9 @@ class ChatBot:
     
     def __init__(self):
         self.ai_brain = None
-        self.conversation_history = []
+        
+        # Histórico limitado: interações antigas viram resumo e o prompt respeita o orçamento
+        self.memory = ConversationMemory(max_turns=settings.CHAT_MAX_TURNS, token_budget=settings.CHAT_TOKEN_BUDGET)
         
         if ADVANCED_AI_AVAILABLE:
             try:
@@ -54,12 +58,11 @@ class ChatBot:
                 response = response_data.get('response', 'Desculpe, não consegui processar isso.')
                 
                 # Adicionar ao histórico
-                self.conversation_history.append({
-                    'user': prompt,
-                    'assistant': response,
-                    'emotion': response_data.get('emotion', 'neutral'),
-                    'confidence': response_data.get('confidence', 0.5)
-                })
+                self.memory.add(
+                    prompt, response,
+                    emotion=response_data.get('emotion', 'neutral'),
+                    confidence=response_data.get('confidence', 0.5)
+                )
                 
                 return response
             
@@ -77,17 +80,11 @@ class ChatBot:
     def get_openai_response(self, prompt):
         """Resposta direta do OpenAI"""
         try:
-            # Construir contexto com histórico
-            messages = [
-                {"role": "system", "content": "Você é JARVIS, um assistente inteligente inspirado no Homem de Ferro. Seja útil, inteligente e um pouco tecnológico."}
-            ]
-            
-            # Adicionar histórico recente
-            for item in self.conversation_history[-5:]:
-                messages.append({"role": "user", "content": item['user']})
-                messages.append({"role": "assistant", "content": item['assistant']})
-            
-            messages.append({"role": "user", "content": prompt})
+            # Construir contexto com resumo e histórico recente dentro do orçamento de tokens
+            messages = self.memory.build_messages(
+                "Você é JARVIS, um assistente inteligente inspirado no Homem de Ferro. Seja útil, inteligente e um pouco tecnológico.",
+                prompt
+            )
             
             response = openai.ChatCompletion.create(
                 model='gpt-4o-mini',
@@ -99,12 +96,7 @@ class ChatBot:
             answer = response.choices[0].message.content.strip()
             
             # Adicionar ao histórico
-            self.conversation_history.append({
-                'user': prompt,
-                'assistant': answer,
-                'emotion': 'neutral',
-                'confidence': 0.8
-            })
+            self.memory.add(prompt, answer, emotion='neutral', confidence=0.8)
             
             return answer
             
@@ -114,17 +106,19 @@ class ChatBot:
     
     def get_conversation_summary(self):
         """Obter resumo da conversa"""
-        if not self.conversation_history:
+        history = self.memory.recent()
+        if not history:
             return "Nenhuma conversa ainda."
         
-        total = len(self.conversation_history)
-        emotions = [item.get('emotion', 'neutral') for item in self.conversation_history]
+        total = len(history) + self.memory.summarized_turns
+        emotions = [item.get('emotion', 'neutral') for item in history]
         most_common_emotion = max(set(emotions), key=emotions.count)
         
         return {
             'total_exchanges': total,
             'dominant_emotion': most_common_emotion,
-            'last_exchange': self.conversation_history[-1] if self.conversation_history else None
+            'last_exchange': history[-1],
+            'summary': self.memory.summary
         }
 
 # Função para compatibilidade
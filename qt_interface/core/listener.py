@@ -6,33 +6,112 @@ Sistema de reconhecimento de voz integrado
 """
 
 import speech_recognition as sr
+import math
 import threading
 import time
+from collections import deque
+import numpy as np
 from qt_interface.config import settings
 from PyQt5.QtCore import QThread, pyqtSignal
+from src.core.noise_calibration import load_calibration, save_calibration
+
+def create_recognizer():
+    """Cria um Recognizer com a última calibração salva e ajuste contínuo
+    
+    O ``dynamic_energy_threshold`` do speech_recognition recalibra o limiar a
+    cada trecho sem fala, então não é preciso calibrar (e bloquear) na partida.
+    """
+    recognizer = sr.Recognizer()
+    recognizer.dynamic_energy_threshold = True
+    
+    calibration = load_calibration(settings.CALIBRATION_FILE)
+    if calibration:
+        recognizer.energy_threshold = calibration['energy_threshold']
+    return recognizer
+
+def persist_calibration(recognizer):
+    """Salva o limiar atual para a próxima inicialização"""
+    save_calibration(settings.CALIBRATION_FILE, recognizer.energy_threshold)
+
+def frame_energy(data):
+    """Energia RMS de um bloco PCM de 16 bits"""
+    samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+    return float(np.sqrt(np.mean(samples * samples))) if samples.size else 0.0
+
+def capture_phrase(recognizer, source, timeout=None, phrase_time_limit=None,
+                   on_speech=None, should_stop=None):
+    """Captura uma frase bloco a bloco (substitui ``recognizer.listen``)
+    
+    ``on_speech`` é chamado assim que a fala começa, depois de
+    ``settings.BARGE_IN_MIN_SPEECH`` segundos acima do limiar, e não só
+    quando a frase termina; é isso que permite interromper o JARVIS
+    (barge-in). O limiar dinâmico segue a mesma regra do speech_recognition.
+    """
+    seconds_per_chunk = source.CHUNK / source.SAMPLE_RATE
+    pause_chunks = int(math.ceil(recognizer.pause_threshold / seconds_per_chunk))
+    onset_chunks = max(1, int(math.ceil(settings.BARGE_IN_MIN_SPEECH / seconds_per_chunk)))
+    pre_roll = deque(maxlen=max(onset_chunks, int(math.ceil(recognizer.non_speaking_duration / seconds_per_chunk))))
+    
+    frames = []
+    speaking = False
+    loud_chunks = 0
+    silent_chunks = 0
+    waited = 0.0
+    
+    while not (should_stop and should_stop()):
+        data = source.stream.read(source.CHUNK)
+        energy = frame_energy(data)
+        
+        if not speaking:
+            waited += seconds_per_chunk
+            pre_roll.append(data)
+            
+            if energy > recognizer.energy_threshold:
+                loud_chunks += 1
+                if loud_chunks >= onset_chunks:
+                    speaking = True
+                    frames = list(pre_roll)
+                    if on_speech:
+                        on_speech()
+                continue
+            
+            loud_chunks = 0
+            if recognizer.dynamic_energy_threshold:
+                damping = recognizer.dynamic_energy_adjustment_damping ** seconds_per_chunk
+                target = energy * recognizer.dynamic_energy_ratio
+                recognizer.energy_threshold = recognizer.energy_threshold * damping + target * (1 - damping)
+            
+            if timeout and waited > timeout:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            continue
+        
+        frames.append(data)
+        silent_chunks = silent_chunks + 1 if energy <= recognizer.energy_threshold else 0
+        if silent_chunks >= pause_chunks:
+            break
+        if phrase_time_limit and len(frames) * seconds_per_chunk > phrase_time_limit:
+            break
+    
+    if not speaking:
+        return None
+    return sr.AudioData(b''.join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
 
 class VoiceListener(QThread):
     """Thread para reconhecimento de voz"""
     
     # Sinais
     command_recognized = pyqtSignal(str)
+    speech_detected = pyqtSignal()  # Usuário começou a falar (barge-in)
     listening_started = pyqtSignal()
     listening_stopped = pyqtSignal()
     error_occurred = pyqtSignal(str)
     
     def __init__(self):
         super().__init__()
-        self.recognizer = sr.Recognizer()
+        self.recognizer = create_recognizer()
         self.microphone = sr.Microphone()
         self.is_listening = False
         self.should_stop = False
-        
-        # Calibrar ruído ambiente
-        try:
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-        except Exception as e:
-            print(f"Erro ao calibrar microfone: {e}")
     
     def start_listening(self):
         """Iniciar escuta contínua"""
@@ -44,6 +123,7 @@ class VoiceListener(QThread):
         """Parar escuta"""
         self.should_stop = True
         self.is_listening = False
+        persist_calibration(self.recognizer)
         self.listening_stopped.emit()
     
     def listen_once(self):
@@ -51,7 +131,14 @@ class VoiceListener(QThread):
         try:
             with self.microphone as source:
                 self.listening_started.emit()
-                audio = self.recognizer.listen(source, timeout=settings.LISTEN_TIMEOUT)
+                audio = capture_phrase(
+                    self.recognizer, source,
+                    timeout=settings.LISTEN_TIMEOUT,
+                    on_speech=self.speech_detected.emit,
+                    should_stop=lambda: self.should_stop
+                )
+                if audio is None:
+                    return None
                 text = self.recognizer.recognize_google(audio, language=settings.LANGUAGE)
                 self.command_recognized.emit(text)
                 return text
@@ -86,14 +173,14 @@ class VoiceListener(QThread):
         
         self.is_listening = False
 
-def listen_command(timeout=settings.LISTEN_TIMEOUT):
+def listen_command(timeout=settings.LISTEN_TIMEOUT, on_speech=None):
     """Função simples para compatibilidade"""
-    recognizer = sr.Recognizer()
+    recognizer = create_recognizer()
     with sr.Microphone() as source:
-        recognizer.adjust_for_ambient_noise(source, duration=0.5)
         print('Ouvindo...')
         try:
-            audio = recognizer.listen(source, timeout=timeout)
+            audio = capture_phrase(recognizer, source, timeout=timeout, on_speech=on_speech)
+            persist_calibration(recognizer)
             text = recognizer.recognize_google(audio, language=settings.LANGUAGE)
             return text
         except sr.WaitTimeoutError:
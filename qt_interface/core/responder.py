@@ -5,71 +5,118 @@ JARVIS Qt Voice Responder
 Sistema de síntese de voz integrado
 """
 
-import pyttsx3
+import queue
 import threading
 from qt_interface.config import settings
 from PyQt5.QtCore import QThread, pyqtSignal
+from src.core.tts_engine import SpeechEngine
+
+def get_speech_engine():
+    """Engine de fala compartilhado (workers de síntese iniciados uma vez)"""
+    return SpeechEngine.get_instance(rate=settings.VOICE_RATE, volume=settings.VOICE_VOLUME)
 
 class VoiceResponder(QThread):
-    """Thread para síntese de voz"""
+    """Thread para síntese de voz
+    
+    Uma única thread de longa duração consome a fila de falas. ``barge_in()``
+    pode ser chamado de qualquer thread: descarta as falas pendentes e corta
+    a atual no próximo bloco de áudio.
+    """
     
     # Sinais
     speech_started = pyqtSignal(str)
     speech_finished = pyqtSignal()
+    speech_interrupted = pyqtSignal(str)
     speech_error = pyqtSignal(str)
     
     def __init__(self):
         super().__init__()
-        self.engine = pyttsx3.init()
+        self.engine = get_speech_engine()
+        self.voice = None
         self.configure_voice()
-        self.speech_queue = []
+        self.speech_queue = queue.Queue()
         self.is_speaking = False
+        self._cancel = None
+        self._cancel_lock = threading.Lock()
+        self._should_stop = False
         
     def configure_voice(self):
         """Configurar parâmetros de voz"""
         try:
-            self.engine.setProperty('rate', settings.VOICE_RATE)
-            self.engine.setProperty('volume', settings.VOICE_VOLUME)
-            
             # Tentar definir voz em português
-            voices = self.engine.getProperty('voices')
+            voices = self.engine.list_voices()
             for voice in voices:
-                if 'portuguese' in voice.name.lower() or 'brasil' in voice.name.lower():
-                    self.engine.setProperty('voice', voice.id)
+                if 'portuguese' in voice['name'].lower() or 'brasil' in voice['name'].lower():
+                    self.voice = voice['id']
                     break
         except Exception as e:
             print(f"Erro ao configurar voz: {e}")
     
     def speak_async(self, text):
         """Falar texto de forma assíncrona"""
-        self.speech_queue.append(text)
-        if not self.is_speaking:
+        self.speech_queue.put(text)
+        if not self.isRunning():
+            self._should_stop = False
             self.start()
     
     def speak_sync(self, text):
-        """Falar texto de forma síncrona"""
+        """Falar texto de forma síncrona
+        
+        Retorna False se a fala foi interrompida por ``barge_in()``.
+        """
+        cancel = threading.Event()
+        with self._cancel_lock:
+            self._cancel = cancel
+        
         try:
+            self.is_speaking = True
             self.speech_started.emit(text)
-            self.engine.say(text)
-            self.engine.runAndWait()
+            completed = self.engine.speak(text, settings.VOICE_RATE, settings.VOICE_VOLUME, self.voice, cancel)
+            if not completed:
+                self.speech_interrupted.emit(text)
             self.speech_finished.emit()
+            return completed
         except Exception as e:
             self.speech_error.emit(f"Erro na síntese de voz: {e}")
+            return False
+        finally:
+            self.is_speaking = False
+            with self._cancel_lock:
+                if self._cancel is cancel:
+                    self._cancel = None
     
-    def run(self):
-        """Processar fila de fala"""
-        self.is_speaking = True
+    def barge_in(self):
+        """Interrompe a fala atual e descarta as pendentes (usuário falando)"""
+        dropped = 0
+        while True:
+            try:
+                self.speech_queue.get_nowait()
+                dropped += 1
+            except queue.Empty:
+                break
         
-        while self.speech_queue:
-            text = self.speech_queue.pop(0)
+        with self._cancel_lock:
+            cancel = self._cancel
+        if cancel is not None:
+            cancel.set()
+            self.engine.stop_saying()
+        return cancel is not None or dropped > 0
+    
+    def stop(self):
+        """Encerra o worker de fala"""
+        self._should_stop = True
+        self.barge_in()
+        self.speech_queue.put(None)
+        self.wait(2000)
+    
+    def run(self):
+        """Worker de fala: processa a fila até ``stop()``"""
+        while not self._should_stop:
+            text = self.speech_queue.get()
+            if text is None:
+                break
             self.speak_sync(text)
-        
-        self.is_speaking = False
 
 def speak(text):
     """Função simples para compatibilidade"""
-    engine = pyttsx3.init()
-    engine.setProperty('rate', settings.VOICE_RATE)
-    engine.setProperty('volume', settings.VOICE_VOLUME)
-    engine.say(text)
-    engine.runAndWait()
\ No newline at end of file
+    get_speech_engine().speak(text, settings.VOICE_RATE, settings.VOICE_VOLUME)
\ No newline at end of file
@@ -77,9 +77,14 @@ class JarvisController(QtCore.QObject):
         self.voice_listener.listening_stopped.connect(lambda: self.listening_state.emit(False))
         self.voice_listener.error_occurred.connect(self.handle_voice_error)
         
+        # Barge-in: fala do usuário interrompe o JARVIS. Conexão direta, pois
+        # barge_in() é thread-safe e não deve esperar o loop de eventos da UI
+        self.voice_listener.speech_detected.connect(self.voice_responder.barge_in, QtCore.Qt.DirectConnection)
+        
         # Conectar sinais do voice responder
         self.voice_responder.speech_started.connect(lambda text: self.log_message.emit(f"🔊 Falando: {text}", "assistant"))
         self.voice_responder.speech_finished.connect(lambda: self.processing_state.emit(False))
+        self.voice_responder.speech_interrupted.connect(lambda text: self.log_message.emit("⏹️ Fala interrompida pelo usuário", "system"))
         self.voice_responder.speech_error.connect(self.handle_voice_error)
         
         # Conectar checkboxes da UI
@@ -105,7 +110,7 @@ class JarvisController(QtCore.QObject):
     def _listen_thread(self):
         """Thread de escuta"""
         try:
-            command = listen_command()
+            command = listen_command(on_speech=self.voice_listener.speech_detected.emit)
             if command:
                 self.voice_listener.command_recognized.emit(command)
             else:
@@ -273,6 +278,7 @@ def main():
         
         # Conectar sinal de comando da UI
         window.command_requested.connect(controller.start_listen)
+        app.aboutToQuit.connect(controller.voice_responder.stop)
         
         # Definir tempo de início
         window._start_time = time.time()
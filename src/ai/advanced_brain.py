@@ -6,20 +6,64 @@ Sistema de IA avançado com aprendizado e personalidade
 """
 
 import json
+import re
 import sqlite3
 import openai
 import time
 import random
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
 import numpy as np
-from textblob import TextBlob
 import pickle
 import os
+import threading
+from .intent_matcher import IntentMatcher
+from .memory_store import MemoryStore
+from .response_cache import normalize_text
+from .semantic_index import HashingEmbedder, SemanticIndex
+from .sentiment import SentimentScorer
+from .single_flight import SingleFlight
+
+# Palavras frequentes demais para ajudar na busca (forma normalizada, sem acentos)
+SEARCH_STOPWORDS = {
+    'que', 'como', 'para', 'por', 'com', 'sem', 'uma', 'umas', 'uns', 'dos', 'das', 'nos', 'nas',
+    'num', 'numa', 'pelo', 'pela', 'sobre', 'entre', 'ate', 'mais', 'muito', 'qual', 'quais',
+    'quando', 'onde', 'porque', 'voce', 'isso', 'isto', 'esse', 'essa', 'este', 'esta', 'ele',
+    'ela', 'seu', 'sua', 'meu', 'minha', 'sao', 'foi', 'ser', 'ter', 'tem', 'pode', 'nao', 'sim'
+}
 
 class AdvancedAI:
     """Sistema de IA avançado do JARVIS"""
     
+    # Palavras-chave para diferentes intenções (a primeira intenção que casar vence)
+    INTENT_KEYWORDS = {
+        'question': ['o que', 'como', 'quando', 'onde', 'por que', 'quem', '?'],
+        'command': ['faça', 'execute', 'rode', 'inicie', 'pare', 'abra', 'feche'],
+        'learning': ['aprenda', 'lembre', 'salve', 'memorize', 'guarde'],
+        'personal': ['prefiro', 'gosto', 'odeio', 'amo', 'não gosto'],
+        'network': ['rede', 'scan', 'dispositivos', 'ip', 'hack', 'vulnerabilidades'],
+        'system': ['status', 'sistema', 'módulos', 'funcionando', 'online'],
+        'casual': ['oi', 'olá', 'tchau', 'obrigado', 'valeu']
+    }
+    
+    # Tabelas com total mantido em learning_stats
+    COUNTED_TABLES = ('conversations', 'user_preferences', 'knowledge_base')
+    
+    # Origens da busca semântica: texto das linhas ainda não indexadas e campos devolvidos por id
+    SEMANTIC_SOURCES = {
+        'knowledge': (
+            "SELECT id, topic || ' ' || knowledge_data FROM knowledge_base WHERE id > ? ORDER BY id LIMIT ?",
+            'SELECT id, topic, knowledge_data FROM knowledge_base WHERE id IN ({})',
+            'SELECT MAX(id) FROM knowledge_base'
+        ),
+        'conversation': (
+            "SELECT id, user_input || ' ' || ai_response FROM conversations "
+            "WHERE id > ? AND ai_response != '' ORDER BY id LIMIT ?",
+            'SELECT id, timestamp, user_input, ai_response FROM conversations WHERE id IN ({})',
+            'SELECT MAX(id) FROM conversations'
+        )
+    }
+    
     def __init__(self, config=None):
         self.config = config or {}
         self.personality = {
@@ -30,21 +74,53 @@ class AdvancedAI:
             'curiosity': 0.8
         }
         
-        self.knowledge_base = {}
+        self.fts_enabled = False
         self.user_preferences = {}
         self.conversation_history = []
         self.learning_patterns = defaultdict(int)
         self.db_path = "data/ai_memory.sqlite"
         
+        # Entradas idênticas simultâneas (API, socket, voz) geram uma única resposta
+        self.single_flight = SingleFlight()
+        
+        # Sentimento por léxico em português (TextBlob só se pedido e instalado)
+        self.sentiment = SentimentScorer(use_textblob=self.config.get('sentiment', {}).get('textblob', False))
+        
+        # Todas as palavras-chave de intenção num único autômato
+        self.intent_matcher = IntentMatcher()
+        for rank, (intent, keywords) in enumerate(self.INTENT_KEYWORDS.items()):
+            self.intent_matcher.add_family(intent, keywords, rank=rank)
+        self.intent_matcher.build()
+        
+        self.last_batch_stats = None
+        
+        # Índices semânticos por origem, atualizados por uma thread avisada pelas gravações
+        self.semantic_indexes = {}
+        self._semantic_dirty = threading.Event()
+        self._semantic_thread = None
+        self._semantic_closed = False
+        
         self.init_database()
         self.load_personality()
         self.load_knowledge()
+        self.init_semantic_index()
     
     def init_database(self):
         """Inicializar banco de dados de memória"""
         os.makedirs("data", exist_ok=True)
         
-        conn = sqlite3.connect(self.db_path)
+        # Conexão única em WAL: as escritas são enfileiradas e gravadas em lotes
+        store_config = self.config.get('memory_store', {})
+        self.store = MemoryStore(
+            self.db_path,
+            batch_size=store_config.get('batch_size', 128),
+            flush_interval=store_config.get('flush_interval', 0.05),
+            max_readers=store_config.get('max_readers', 4)
+        )
+        self.store.call(self._create_tables)
+    
+    def _create_tables(self, conn):
+        """Cria as tabelas (executado na thread de escrita)"""
         cursor = conn.cursor()
         
         # Tabela de conversas
@@ -75,22 +151,144 @@ class AdvancedAI:
         # Tabela de conhecimento aprendido
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS knowledge_base (
-                topic TEXT PRIMARY KEY,
+                id INTEGER PRIMARY KEY,
+                topic TEXT UNIQUE,
                 knowledge_data TEXT,
                 source TEXT,
                 confidence REAL,
                 created_at DATETIME
             )
         ''')
+        self._migrate_knowledge_ids(cursor)
+        
+        # Índice de texto completo da base de conhecimento (conteúdo externo, mantido por triggers)
+        self.fts_enabled = self._create_knowledge_index(cursor)
+        
+        # Contadores das tabelas, mantidos por triggers
+        self._create_learning_stats(cursor)
+    
+    def _migrate_knowledge_ids(self, cursor):
+        """Acrescenta a chave inteira ``id`` a uma knowledge_base antiga
+        
+        A tabela antiga tinha só o tópico como chave, e o índice FTS e o
+        semântico apontavam para o rowid implícito, que um VACUUM pode
+        renumerar. A tabela é recriada com ``id`` igual ao rowid atual (o FTS
+        continua válido); os triggers são recriados em seguida. O índice
+        semântico antigo (``data/semantic_index.*``, as duas origens na mesma
+        matriz) é apagado junto: os índices por origem são refeitos do banco.
+        """
+        cursor.execute('PRAGMA table_info(knowledge_base)')
+        if any(column[1] == 'id' for column in cursor.fetchall()):
+            return
+        
+        for suffix in ('.f32', '.keys', '.json'):
+            if os.path.exists("data/semantic_index" + suffix):
+                os.remove("data/semantic_index" + suffix)
+        
+        cursor.execute('''
+            CREATE TABLE knowledge_base_new (
+                id INTEGER PRIMARY KEY,
+                topic TEXT UNIQUE,
+                knowledge_data TEXT,
+                source TEXT,
+                confidence REAL,
+                created_at DATETIME
+            )
+        ''')
+        cursor.execute('''
+            INSERT INTO knowledge_base_new (id, topic, knowledge_data, source, confidence, created_at)
+            SELECT rowid, topic, knowledge_data, source, confidence, created_at FROM knowledge_base
+        ''')
+        cursor.execute('DROP TABLE knowledge_base')
+        cursor.execute('ALTER TABLE knowledge_base_new RENAME TO knowledge_base')
+    
+    def _create_learning_stats(self, cursor):
+        """Cria a tabela learning_stats e os triggers que a mantêm
+        
+        Cada tabela contada tem uma linha com o total, atualizada a cada
+        INSERT/DELETE; consultar as estatísticas não percorre as tabelas.
+        As contagens completas só rodam uma vez, quando a tabela é criada
+        num banco já existente. (INSERT OR REPLACE apagaria sem disparar o
+        trigger de remoção: as gravações usam UPSERT.)
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'learning_stats'")
+        exists = cursor.fetchone() is not None
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS learning_stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
         
-        conn.commit()
-        conn.close()
+        for table in self.COUNTED_TABLES:
+            if not exists:
+                cursor.execute(f"INSERT OR REPLACE INTO learning_stats (name, value) SELECT '{table}', COUNT(*) FROM {table}")
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS learning_stats_{table}_insert AFTER INSERT ON {table} BEGIN
+                    UPDATE learning_stats SET value = value + 1 WHERE name = '{table}';
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS learning_stats_{table}_delete AFTER DELETE ON {table} BEGIN
+                    UPDATE learning_stats SET value = value - 1 WHERE name = '{table}';
+                END
+            ''')
+    
+    def _create_knowledge_index(self, cursor):
+        """Cria o índice FTS5 de knowledge_base; False se o SQLite não tiver FTS5
+        
+        O índice aponta para o rowid de knowledge_base, que é o ``id``
+        (INTEGER PRIMARY KEY): um VACUUM não renumera as linhas.
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'knowledge_fts'")
+        exists = cursor.fetchone() is not None
+        
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_fts USING fts5(
+                    topic,
+                    knowledge_data,
+                    content='knowledge_base',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            return False
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS knowledge_fts_insert AFTER INSERT ON knowledge_base BEGIN
+                INSERT INTO knowledge_fts (rowid, topic, knowledge_data)
+                VALUES (new.id, new.topic, new.knowledge_data);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS knowledge_fts_delete AFTER DELETE ON knowledge_base BEGIN
+                INSERT INTO knowledge_fts (knowledge_fts, rowid, topic, knowledge_data)
+                VALUES ('delete', old.id, old.topic, old.knowledge_data);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS knowledge_fts_update AFTER UPDATE ON knowledge_base BEGIN
+                INSERT INTO knowledge_fts (knowledge_fts, rowid, topic, knowledge_data)
+                VALUES ('delete', old.id, old.topic, old.knowledge_data);
+                INSERT INTO knowledge_fts (rowid, topic, knowledge_data)
+                VALUES (new.id, new.topic, new.knowledge_data);
+            END
+        ''')
+        
+        # Linhas gravadas antes do índice existir
+        if not exists:
+            cursor.execute("INSERT INTO knowledge_fts (knowledge_fts) VALUES ('rebuild')")
+        return True
     
     def analyze_emotion(self, text):
         """Análise de emoção no texto"""
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
-        
+        return self.emotion_label(self.sentiment.score(text).polarity)
+    
+    @staticmethod
+    def emotion_label(polarity):
+        """Classe de emoção de uma polaridade"""
         if polarity > 0.3:
             return "positive"
         elif polarity < -0.3:
@@ -100,27 +298,20 @@ class AdvancedAI:
         else:
             return "mixed"
     
+    @staticmethod
+    def emotion_labels(polarities):
+        """``emotion_label`` para um array de polaridades"""
+        polarities = np.asarray(polarities)
+        return np.select(
+            [polarities > 0.3, polarities < -0.3, np.abs(polarities) < 0.1],
+            ['positive', 'negative', 'neutral'],
+            'mixed'
+        ).tolist()
+    
     def detect_intent(self, text):
         """Detectar intenção do usuário"""
-        text_lower = text.lower()
-        
-        # Palavras-chave para diferentes intenções
-        intents = {
-            'question': ['o que', 'como', 'quando', 'onde', 'por que', 'quem', '?'],
-            'command': ['faça', 'execute', 'rode', 'inicie', 'pare', 'abra', 'feche'],
-            'learning': ['aprenda', 'lembre', 'salve', 'memorize', 'guarde'],
-            'personal': ['prefiro', 'gosto', 'odeio', 'amo', 'não gosto'],
-            'network': ['rede', 'scan', 'dispositivos', 'ip', 'hack', 'vulnerabilidades'],
-            'system': ['status', 'sistema', 'módulos', 'funcionando', 'online'],
-            'casual': ['oi', 'olá', 'tchau', 'obrigado', 'valeu']
-        }
-        
-        detected_intents = []
-        for intent, keywords in intents.items():
-            if any(keyword in text_lower for keyword in keywords):
-                detected_intents.append(intent)
-        
-        return detected_intents[0] if detected_intents else 'general'
+        intent = self.intent_matcher.match(text.lower()).best
+        return intent.family if intent else 'general'
     
     def learn_from_interaction(self, user_input, context=None):
         """Aprender com a interação do usuário"""
@@ -171,7 +362,17 @@ class AdvancedAI:
             self.save_preference('general', category, value, 0.8)
     
     def generate_response(self, user_input, context=None):
-        """Gerar resposta inteligente"""
+        """Gerar resposta inteligente
+        
+        Chamadas concorrentes com a mesma entrada e contexto compartilham uma
+        única geração (e um único registro da conversa).
+        """
+        key = (normalize_text(user_input), json.dumps(context, sort_keys=True, default=str))
+        response, _ = self.single_flight.do(key, self._generate_response, user_input, context)
+        return response
+    
+    def _generate_response(self, user_input, context=None):
+        """Gera a resposta (ver ``generate_response``)"""
         # Analisar entrada
         analysis = self.learn_from_interaction(user_input, context)
         intent = analysis['intent']
@@ -179,7 +380,15 @@ class AdvancedAI:
         
         # Buscar na base de conhecimento
         relevant_knowledge = self.search_knowledge(user_input)
+        response = self._respond(user_input, intent, emotion, relevant_knowledge)
+        
+        # Salvar conversa completa
+        self.save_conversation(user_input, response, context, emotion, [intent])
         
+        return response
+    
+    def _respond(self, user_input, intent, emotion, relevant_knowledge, record=True):
+        """Resposta para uma entrada já analisada (``record=False`` não grava o que for pedido para aprender)"""
         # Gerar resposta baseada na intenção
         if intent == 'question':
             response = self.answer_question(user_input, relevant_knowledge)
@@ -188,19 +397,91 @@ class AdvancedAI:
         elif intent == 'network':
             response = self.handle_network_query(user_input)
         elif intent == 'learning':
-            response = self.handle_learning_request(user_input)
+            response = self.handle_learning_request(user_input, record)
         elif intent == 'casual':
             response = self.casual_response(user_input, emotion)
         else:
             response = self.general_response(user_input, relevant_knowledge)
         
         # Personalizar resposta baseada na personalidade
-        response = self.add_personality(response, emotion)
-        
-        # Salvar conversa completa
-        self.save_conversation(user_input, response, context, emotion, [intent])
-        
-        return response
+        return self.add_personality(response, emotion)
+    
+    def generate_responses(self, inputs, context=None, record=True):
+        """Gerar respostas para muitas entradas de uma vez (reprocessar histórico, avaliar intenções)
+        
+        As emoções são calculadas em lote (léxico vetorizado com numpy); as
+        intenções, por uma passada do autômato de palavras-chave por entrada.
+        A base de conhecimento é consultada de uma vez para todas as entradas
+        e as conversas são gravadas numa única transação (uma linha por
+        entrada; ``record=False`` não grava nada: nem conversas, nem
+        preferências, nem fatos de pedidos de aprendizado).
+        Retorna ``{'results': [...], 'stats': {...}}``: para cada entrada,
+        ``input``, ``intent``, ``emotion`` e ``response``; nas métricas, o
+        tempo de cada etapa e a vazão. As métricas também ficam em
+        ``last_batch_stats``.
+        """
+        inputs = list(inputs)
+        started = time.perf_counter()
+        timings = {}
+        
+        # Emoções: léxico vetorizado
+        phase = time.perf_counter()
+        polarities, _ = self.sentiment.score_batch(inputs)
+        emotions = self.emotion_labels(polarities)
+        timings['emotion'] = time.perf_counter() - phase
+        
+        # Intenções: uma passada do autômato por entrada
+        phase = time.perf_counter()
+        intents = [self.detect_intent(text) for text in inputs]
+        timings['intent'] = time.perf_counter() - phase
+        
+        # Conhecimento: uma consulta para todas as entradas
+        phase = time.perf_counter()
+        knowledge = self.search_knowledge_batch(inputs)
+        timings['knowledge'] = time.perf_counter() - phase
+        
+        phase = time.perf_counter()
+        results = []
+        for text, intent, emotion, relevant_knowledge in zip(inputs, intents, emotions, knowledge):
+            if intent == 'personal' and record:
+                self.extract_preferences(text)
+            response = self._respond(text, intent, emotion, relevant_knowledge, record)
+            results.append({'input': text, 'intent': intent, 'emotion': emotion, 'response': response})
+        timings['respond'] = time.perf_counter() - phase
+        
+        for pattern, count in Counter([f"intent_{intent}" for intent in intents] +
+                                      [f"emotion_{emotion}" for emotion in emotions]).items():
+            self.learning_patterns[pattern] += count
+        
+        # Gravação: uma transação com todas as conversas (e preferências já enfileiradas)
+        phase = time.perf_counter()
+        if record and results:
+            timestamp = datetime.now().isoformat()
+            context_json = json.dumps(context) if context else None
+            rows = [
+                (timestamp, result['input'], result['response'], context_json, result['emotion'],
+                 json.dumps([result['intent']]))
+                for result in results
+            ]
+            self.store.call(lambda conn: conn.executemany('''
+                INSERT INTO conversations 
+                (timestamp, user_input, ai_response, context, emotion_detected, learning_tags)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows))
+            self._semantic_dirty.set()
+        timings['write'] = time.perf_counter() - phase
+        
+        elapsed = time.perf_counter() - started
+        stats = {
+            'inputs': len(inputs),
+            'elapsed': elapsed,
+            'throughput': len(inputs) / elapsed if elapsed > 0 else 0.0,
+            'timings': timings,
+            'intents': dict(Counter(intents)),
+            'emotions': dict(Counter(emotions))
+        }
+        self.last_batch_stats = stats
+        return {'results': results, 'stats': stats}
     
     def answer_question(self, question, knowledge):
         """Responder perguntas usando conhecimento"""
@@ -214,7 +495,7 @@ class AdvancedAI:
             return "Sou um sistema de IA avançado com capacidades de aprendizado, análise de rede e automação. Posso aprender com nossas conversas e me adaptar às suas preferências."
         
         if 'o que você sabe' in question_lower:
-            return f"Tenho conhecimento sobre {len(self.knowledge_base)} tópicos diferentes e {len(self.conversation_history)} conversas anteriores registradas."
+            return f"Tenho conhecimento sobre {self.count_knowledge()} tópicos diferentes e {len(self.conversation_history)} conversas anteriores registradas."
         
         return "Interessante pergunta. Deixe-me pensar... Posso pesquisar mais sobre isso se desejar."
     
@@ -230,6 +511,26 @@ class AdvancedAI:
         
         return "Comando recebido. Executando..."
     
+    def handle_learning_request(self, text, record=True):
+        """Guardar na base de conhecimento o que o usuário pediu para aprender
+        
+        Com ``record=False`` só monta a resposta, sem gravar o fato.
+        """
+        match = re.search(r'(?:aprenda|lembre|salve|memorize|guarde)(?:-se)?(?: de)?(?: que)?\s+(.+)', text, re.IGNORECASE)
+        if not match:
+            return "Modo de aprendizado ativado. Me conte o que você gostaria que eu soubesse."
+        
+        fact = match.group(1).strip().rstrip('.!')
+        if record:
+            self.add_knowledge(fact[:80], fact, source='user', confidence=0.9)
+        return f"Entendido. Vou lembrar que {fact}."
+    
+    def general_response(self, input_text, knowledge):
+        """Resposta geral, usando o conhecimento encontrado se houver"""
+        if knowledge:
+            return f"Sobre {knowledge[0]['topic']}: {knowledge[0]['data'][:200]}"
+        return "Entendido. Como posso ajudar com isso?"
+    
     def handle_network_query(self, query):
         """Lidar com consultas de rede"""
         return "Acessando sistemas de rede... Analisando dispositivos conectados e identificando vulnerabilidades. Momento."
@@ -278,11 +579,8 @@ class AdvancedAI:
         return response
     
     def save_conversation(self, user_input, ai_response, context, emotion, learning_tags):
-        """Salvar conversa no banco"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        """Salvar conversa no banco (gravação em segundo plano)"""
+        self.store.execute('''
             INSERT INTO conversations 
             (timestamp, user_input, ai_response, context, emotion_detected, learning_tags)
             VALUES (?, ?, ?, ?, ?, ?)
@@ -294,35 +592,232 @@ class AdvancedAI:
             emotion,
             json.dumps(learning_tags)
         ))
-        
-        conn.commit()
-        conn.close()
+        self._semantic_dirty.set()
     
     def save_preference(self, category, key, value, confidence):
-        """Salvar preferência do usuário"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO user_preferences 
+        """Salvar preferência do usuário (gravação em segundo plano)"""
+        self.store.execute('''
+            INSERT INTO user_preferences 
             (category, preference_key, preference_value, confidence, last_updated)
             VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(category, preference_key) DO UPDATE SET
+                preference_value = excluded.preference_value,
+                confidence = excluded.confidence,
+                last_updated = excluded.last_updated
         ''', (category, key, value, confidence, datetime.now().isoformat()))
-        
-        conn.commit()
-        conn.close()
     
-    def search_knowledge(self, query):
-        """Buscar conhecimento relevante"""
-        # Implementação básica - pode ser melhorada com embeddings
-        query_words = query.lower().split()
-        relevant = []
-        
-        for topic, data in self.knowledge_base.items():
-            if any(word in topic.lower() for word in query_words):
-                relevant.append({'topic': topic, 'data': data})
+    def flush(self, timeout=None):
+        """Espera as gravações pendentes da memória serem confirmadas"""
+        return self.store.flush(timeout)
+    
+    def close(self):
+        """Grava o que estiver pendente e fecha o banco"""
+        self._semantic_closed = True
+        self._semantic_dirty.set()
+        if self._semantic_thread is not None:
+            self._semantic_thread.join(timeout=10)
+        self.store.close()
+    
+    def add_knowledge(self, topic, data, source='conversation', confidence=0.8):
+        """Adicionar (ou atualizar) um tópico da base de conhecimento
+        
+        Gravação incremental em segundo plano; os triggers mantêm o índice.
+        UPSERT em vez de INSERT OR REPLACE: o REPLACE apaga a linha sem
+        disparar o trigger de remoção.
+        """
+        if not isinstance(data, str):
+            data = json.dumps(data, ensure_ascii=False, default=str)
+        self.store.execute('''
+            INSERT INTO knowledge_base (topic, knowledge_data, source, confidence, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(topic) DO UPDATE SET
+                knowledge_data = excluded.knowledge_data,
+                source = excluded.source,
+                confidence = excluded.confidence
+        ''', (topic, data, source, confidence, datetime.now().isoformat()))
+        self._semantic_dirty.set()
+    
+    def count_knowledge(self):
+        """Número de tópicos na base de conhecimento"""
+        return self.get_table_counts()['knowledge_base']
+    
+    def get_table_counts(self):
+        """Totais de conversas, preferências e conhecimento (O(1), via learning_stats)
+        
+        Só incluem gravações já confirmadas (no máximo ``flush_interval``
+        de atraso); chame ``flush`` antes para contar tudo.
+        """
+        counts = dict.fromkeys(self.COUNTED_TABLES, 0)
+        counts.update(self.store.query('SELECT name, value FROM learning_stats'))
+        return counts
+    
+    def init_semantic_index(self):
+        """Busca semântica sobre conhecimento e conversas
+        
+        Cada origem tem seu índice em ``data/semantic_index_<origem>.*``,
+        sincronizado com o banco pelos ids já indexados. A sincronização roda
+        numa thread própria: o histórico inteiro na partida e, depois, as
+        linhas novas sempre que uma gravação avisar (nunca numa busca). Um
+        índice que já passou do maior id do banco (banco apagado ou
+        restaurado de um backup) é refeito do zero.
+        """
+        semantic_config = self.config.get('semantic_index', {})
+        self.semantic_min_score = semantic_config.get('min_score', 0.15)
+        self.semantic_sync_delay = semantic_config.get('sync_delay', 0.2)
+        if not semantic_config.get('enabled', True):
+            return
+        
+        self.embedder = HashingEmbedder(dim=semantic_config.get('dim', 256), stopwords=SEARCH_STOPWORDS)
+        self.semantic_indexes = {}
+        for source, (_, _, max_id_sql) in self.SEMANTIC_SOURCES.items():
+            index = SemanticIndex(f"data/semantic_index_{source}", dim=self.embedder.dim)
+            max_id = self.store.query(max_id_sql)[0][0] or 0
+            if index.mark > max_id:
+                index.reset()  # Vetores de linhas que não existem mais
+            self.semantic_indexes[source] = index
+        self._semantic_lock = threading.Lock()
+        self._semantic_thread = threading.Thread(target=self._semantic_sync_loop, name="SemanticIndexSync", daemon=True)
+        self._semantic_thread.start()
+    
+    def _semantic_sync_loop(self):
+        """Thread de indexação: espera ``sync_delay`` após um aviso para juntar as gravações num lote"""
+        while not self._semantic_closed:
+            try:
+                self.sync_semantic_index()
+            except RuntimeError:
+                break  # Banco encerrado
+            
+            self._semantic_dirty.wait()
+            time.sleep(self.semantic_sync_delay)
+            self._semantic_dirty.clear()
+            if self._semantic_closed:
+                break
+            self.store.flush()
+    
+    def sync_semantic_index(self, batch_size=2000):
+        """Indexa as linhas de knowledge_base e conversations ainda não indexadas
+        
+        Só entram linhas novas: um tópico atualizado mantém o vetor antigo.
+        Cada lote de ``batch_size`` linhas é gravado em disco de uma vez.
+        Retorna quantas linhas foram indexadas.
+        """
+        if not self.semantic_indexes:
+            return 0
+        
+        added = 0
+        with self._semantic_lock:
+            for source, index in self.semantic_indexes.items():
+                sql = self.SEMANTIC_SOURCES[source][0]
+                while True:
+                    rows = self.store.query(sql, (index.mark, batch_size))
+                    if not rows:
+                        break
+                    vectors = self.embedder.embed_batch([text or '' for _, text in rows])
+                    index.append([row_id for row_id, _ in rows], vectors, mark=rows[-1][0])
+                    index.commit()
+                    added += len(rows)
+                    if len(rows) < batch_size:
+                        break
+        return added
+    
+    def semantic_search(self, query, k=5, source=None, min_score=None):
+        """Conhecimento e conversas mais parecidos com a consulta (cosseno)
         
-        return relevant[:3]  # Retornar top 3
+        ``source`` restringe a 'knowledge' ou 'conversation'. Cada resultado
+        traz ``source``, ``id``, ``score`` e os campos da linha.
+        """
+        return self.semantic_search_batch([query], k, source, min_score)[0]
+    
+    def semantic_search_batch(self, queries, k=5, source=None, min_score=None):
+        """``semantic_search`` para várias consultas (produto matriz-matriz por origem)"""
+        if not self.semantic_indexes or not queries:
+            return [[] for _ in queries]
+        
+        min_score = self.semantic_min_score if min_score is None else min_score
+        sources = list(self.semantic_indexes) if source is None else [source]
+        vectors = self.embedder.embed_batch(queries)
+        
+        batch_results = [[] for _ in queries]
+        for name in sources:
+            index = self.semantic_indexes.get(name)
+            if index is None:
+                continue
+            all_hits = index.search_batch(vectors, k, min_score)
+            
+            rows = {}
+            ids = sorted({row_id for hits in all_hits for row_id, _ in hits})
+            for offset in range(0, len(ids), 500):
+                chunk = ids[offset:offset + 500]
+                for row in self.store.query(self.SEMANTIC_SOURCES[name][1].format(','.join('?' * len(chunk))), chunk):
+                    rows[row[0]] = row[1:]
+            
+            for results, hits in zip(batch_results, all_hits):
+                for row_id, score in hits:
+                    row = rows.get(row_id)
+                    if row is None:
+                        continue  # Linha removida depois de indexada
+                    result = {'source': name, 'id': row_id, 'score': score}
+                    if name == 'knowledge':
+                        result.update(topic=row[0], data=row[1])
+                    else:
+                        result.update(timestamp=row[0], user_input=row[1], ai_response=row[2])
+                    results.append(result)
+        
+        if len(sources) > 1:
+            batch_results = [sorted(results, key=lambda result: -result['score'])[:k] for results in batch_results]
+        return batch_results
+    
+    def search_knowledge(self, query, limit=3):
+        """Buscar conhecimento relevante (BM25 sobre tópico e conteúdo)"""
+        return self.search_knowledge_batch([query], limit)[0]
+    
+    def search_knowledge_batch(self, queries, limit=3):
+        """``search_knowledge`` para várias consultas
+        
+        Cada consulta distinta faz uma busca ordenada por BM25 e limitada a
+        ``limit`` linhas (o SQLite para no ``LIMIT``); a complementação por
+        busca semântica é feita de uma vez para todas.
+        """
+        unique = list(dict.fromkeys(queries))
+        found = {query: [] for query in unique}
+        
+        for query in unique:
+            if self.fts_enabled:
+                # Palavras com 3+ letras, como prefixos entre aspas (sem sintaxe FTS vinda do usuário)
+                words = [word for word in normalize_text(query).split() if len(word) >= 3 and word not in SEARCH_STOPWORDS]
+                if not words:
+                    continue
+                match = ' OR '.join(f'"{word}"*' for word in dict.fromkeys(words))
+                rows = self.store.query('''
+                    SELECT knowledge_base.topic, knowledge_base.knowledge_data
+                    FROM knowledge_fts
+                    JOIN knowledge_base ON knowledge_base.id = knowledge_fts.rowid
+                    WHERE knowledge_fts MATCH ?
+                    ORDER BY bm25(knowledge_fts, 10.0, 1.0)
+                    LIMIT ?
+                ''', (match, limit))
+            else:
+                # Sem FTS5: palavra no tópico, como a busca original
+                patterns = ['%' + re.sub(r'([%_\\])', r'\\\1', word) + '%' for word in re.findall(r'\w{3,}', query.lower())]
+                if not patterns:
+                    continue
+                condition = ' OR '.join("topic LIKE ? ESCAPE '\\'" for _ in patterns)
+                rows = self.store.query(
+                    f'SELECT topic, knowledge_data FROM knowledge_base WHERE {condition} LIMIT ?',
+                    (*patterns, limit)
+                )
+            found[query] = [{'topic': topic, 'data': data} for topic, data in rows]
+        
+        # Completar com tópicos parecidos (variações das palavras, erros de digitação)
+        short = [query for query in unique if len(found[query]) < limit and normalize_text(query)]
+        for query, hits in zip(short, self.semantic_search_batch(short, k=limit, source='knowledge')):
+            results = found[query]
+            seen = {result['topic'] for result in results}
+            for hit in hits:
+                if hit['topic'] not in seen and len(results) < limit:
+                    results.append({'topic': hit['topic'], 'data': hit['data']})
+        
+        return [found[query] for query in queries]
     
     def load_personality(self):
         """Carregar personalidade salva"""
@@ -341,44 +836,40 @@ class AdvancedAI:
             json.dump(self.personality, f, indent=2)
     
     def load_knowledge(self):
-        """Carregar base de conhecimento"""
+        """Carregar base de conhecimento
+        
+        O conhecimento fica no SQLite e é consultado sob demanda. Um
+        ``knowledge_base.pkl`` antigo é importado uma única vez e renomeado
+        para ``knowledge_base.pkl.migrated``.
+        """
+        pickle_path = "data/knowledge_base.pkl"
         try:
-            with open("data/knowledge_base.pkl", "rb") as f:
-                self.knowledge_base = pickle.load(f)
+            with open(pickle_path, "rb") as f:
+                legacy = pickle.load(f)
         except FileNotFoundError:
-            self.knowledge_base = {}
+            return
+        
+        for topic, data in legacy.items():
+            self.add_knowledge(str(topic), data, source='pickle')
+        self.store.flush()
+        os.replace(pickle_path, pickle_path + ".migrated")
     
     def save_knowledge(self):
-        """Salvar base de conhecimento"""
-        os.makedirs("data", exist_ok=True)
-        with open("data/knowledge_base.pkl", "wb") as f:
-            pickle.dump(self.knowledge_base, f)
+        """Salvar base de conhecimento (as gravações já são incrementais)"""
+        self.store.flush()
     
     def get_learning_stats(self):
         """Obter estatísticas de aprendizado"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Total de conversas
-        cursor.execute('SELECT COUNT(*) FROM conversations')
-        total_conversations = cursor.fetchone()[0]
-        
-        # Preferências aprendidas
-        cursor.execute('SELECT COUNT(*) FROM user_preferences')
-        total_preferences = cursor.fetchone()[0]
-        
-        # Conhecimento acumulado
-        cursor.execute('SELECT COUNT(*) FROM knowledge_base')
-        total_knowledge = cursor.fetchone()[0]
-        
-        conn.close()
+        # Totais mantidos por triggers: uma leitura de poucas linhas, qualquer que seja o tamanho das tabelas
+        counts = self.get_table_counts()
         
         return {
-            'conversations': total_conversations,
-            'preferences': total_preferences,
-            'knowledge_items': total_knowledge,
+            'conversations': counts['conversations'],
+            'preferences': counts['user_preferences'],
+            'knowledge_items': counts['knowledge_base'],
             'learning_patterns': dict(self.learning_patterns),
-            'personality': self.personality
+            'personality': self.personality,
+            'storage': self.store.get_stats()
         }
 
 # Classe para processamento de linguagem natural avançado
@@ -392,6 +883,7 @@ class NLPProcessor:
             'ip': r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b',
             'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
         }
+        self.sentiment = SentimentScorer()
     
     def extract_entities(self, text):
         """Extrair entidades do texto"""
@@ -407,12 +899,12 @@ class NLPProcessor:
     
     def sentiment_analysis_advanced(self, text):
         """Análise de sentimento avançada"""
-        blob = TextBlob(text)
+        sentiment = self.sentiment.score(text)
         
         return {
-            'polarity': blob.sentiment.polarity,
-            'subjectivity': blob.sentiment.subjectivity,
-            'emotion': self.map_emotion(blob.sentiment.polarity, blob.sentiment.subjectivity)
+            'polarity': sentiment.polarity,
+            'subjectivity': sentiment.subjectivity,
+            'emotion': self.map_emotion(sentiment.polarity, sentiment.subjectivity)
         }
     
     def map_emotion(self, polarity, subjectivity):
@@ -8,15 +8,33 @@ Processamento de linguagem natural com personalidade própria
 import openai
 import json
 import time
+import itertools
 import threading
+from collections import deque
 from datetime import datetime
 import re
+import uuid
 from core.logger import JarvisLogger
 from core.events import EventManager, Events
+from ai.conversation_memory import ConversationMemory
+from ai.fuzzy_index import FuzzyIndex
+from ai.intent_matcher import IntentMatcher
+from ai.llm_client import LLMClient
+from ai.response_cache import ResponseCache, is_context_dependent, normalize_text
+from ai.single_flight import SingleFlight
 
 class AIBrain:
     """Motor de IA conversacional com personalidade do JARVIS"""
     
+    # Palavras-chave dos comandos especiais
+    LIGHT_KEYWORDS = ['luz', 'luzes', 'acender', 'apagar']
+    LIGHT_ON_KEYWORDS = ['acender', 'ligar', 'acenda']
+    LIGHT_OFF_KEYWORDS = ['apagar', 'desligar', 'apague']
+    LIGHT_NOUNS = ['luz', 'lâmpada', 'abajur']
+    CLIMATE_KEYWORDS = ['temperatura', 'clima', 'ar condicionado']
+    MUSIC_KEYWORDS = ['música', 'tocar', 'som']
+    LOCATIONS = ['sala', 'quarto', 'cozinha', 'banheiro', 'escritório', 'garagem']
+    
     def __init__(self, config):
         self.config = config
         self.logger = JarvisLogger(__name__)
@@ -38,18 +56,99 @@ class AIBrain:
             self.ai_enabled = False
             self.logger.ai("OpenAI API não configurada - usando respostas pré-definidas")
         
-        # Contexto da conversa
-        self.conversation_history = []
-        self.max_history = 10
+        # Cliente HTTP assíncrono com pool de conexões (fallback: módulo openai)
+        self.llm_client = None
+        self.request_timeout = ai_config.get('client', {}).get('timeout', 10)
+        self.streaming = ai_config.get('streaming', True)
+        if self.ai_enabled:
+            self.llm_client = self._create_llm_client(ai_config)
+        
+        # Cadeia de fallback com prazo: modelo local em paralelo e resposta do cache
+        # (só com um modelo local configurado; sem ele vale o timeout normal do cliente)
+        fallback_config = ai_config.get('fallback', {})
+        self.hedge_after = fallback_config.get('hedge_after', 1.5)
+        self.response_budget = fallback_config.get('response_budget') or self.request_timeout
+        self.local_model = fallback_config.get('local_model', 'llama3')
+        self.local_client = None
+        if fallback_config.get('enabled', True) and self.llm_client and fallback_config.get('local_api_base'):
+            self.local_client = self._create_llm_client({
+                'api_base': fallback_config['local_api_base'],
+                'client': {'max_concurrency': fallback_config.get('local_concurrency', 2), 'max_retries': 0}
+            }, api_key=fallback_config.get('local_api_key', 'local'))
+        self.hedging = self.local_client is not None
+        
+        # Contexto da conversa, limitado por interações e por tokens do prompt
+        memory_config = ai_config.get('memory', {})
+        self.conversation_memory = ConversationMemory(
+            max_turns=memory_config.get('max_turns', 10),
+            token_budget=memory_config.get('token_budget', 1200),
+            summary_tokens=memory_config.get('summary_tokens', 120)
+        )
+        self.prompt_turns = memory_config.get('prompt_turns')
+        
+        # Cache de respostas do modelo
+        cache_config = ai_config.get('response_cache', {})
+        self.response_cache = None
+        self.cache_context_turns = cache_config.get('context_turns', 1)
+        if cache_config.get('enabled', True):
+            self.response_cache = ResponseCache(
+                max_entries=cache_config.get('max_entries', 256),
+                ttl=cache_config.get('ttl', 3600),
+                similarity_threshold=cache_config.get('similarity_threshold')
+            )
+        
+        # Comandos idênticos simultâneos (voz, painéis web) compartilham uma execução
+        self.single_flight = SingleFlight()
         
         # Comandos pré-definidos
         self.predefined_responses = self._load_predefined_responses()
+        self.intent_matcher = self._build_intent_matcher()
+        
+        # Correção aproximada de erros do reconhecimento antes do casamento
+        fuzzy_config = ai_config.get('fuzzy_matching', {})
+        self.fuzzy_matching = fuzzy_config.get('enabled', True)
+        self.fuzzy_min_confidence = fuzzy_config.get('min_confidence', 0.7)
+        self.fuzzy_new_intent_confidence = fuzzy_config.get('new_intent_confidence', 0.8)
+        self.fuzzy_max_words = fuzzy_config.get('max_words', 8)
+        self.fuzzy_index = self._build_fuzzy_index()
+        self.fuzzy_anchors = frozenset(
+            normalize_text(word) for phrase in itertools.chain(
+                self.LIGHT_KEYWORDS, self.LIGHT_ON_KEYWORDS, self.LIGHT_OFF_KEYWORDS, self.LIGHT_NOUNS,
+                self.CLIMATE_KEYWORDS, self.MUSIC_KEYWORDS, self.LOCATIONS
+            ) for word in phrase.split()
+        )
+        
+        # Casamento antecipado sobre hipóteses parciais do reconhecimento
+        partial_config = ai_config.get('partial_matching', {})
+        self.partial_matching = partial_config.get('enabled', True)
+        self._speculations = {}
+        self._finished_utterances = deque(maxlen=32)
+        self._speculation_lock = threading.Lock()
         
         # Inscrever-se em eventos
         self.event_manager.subscribe(Events.VOICE_COMMAND, self.process_command)
+        self.event_manager.subscribe(Events.VOICE_PARTIAL, self.process_partial)
         
         self.logger.ai("Motor de IA inicializado")
     
+    def _create_llm_client(self, ai_config, api_key=None):
+        """Cria o cliente LLM assíncrono, se o aiohttp estiver disponível"""
+        client_config = ai_config.get('client', {})
+        try:
+            return LLMClient(
+                api_key=api_key or self.api_key,
+                api_base=ai_config.get('api_base', 'https://api.openai.com/v1'),
+                max_concurrency=client_config.get('max_concurrency', 4),
+                pool_size=client_config.get('pool_size', 8),
+                max_retries=client_config.get('max_retries', 2),
+                timeout=self.request_timeout,
+                backoff_base=client_config.get('backoff_base', 0.25),
+                backoff_max=client_config.get('backoff_max', 4.0)
+            )
+        except ImportError:
+            self.logger.error("aiohttp não instalado - usando cliente OpenAI síncrono")
+            return None
+    
     def _get_default_prompt(self):
         """Prompt padrão do sistema para definir personalidade"""
         return """Você é JARVIS, um assistente pessoal inteligente inspirado no assistente do Tony Stark. 
@@ -104,6 +203,39 @@ Você está integrado a um sistema de automação residencial e pode controlar d
             'não entendi': 'Poderia reformular sua solicitação? Não compreendi completamente.',
         }
     
+    def _build_intent_matcher(self):
+        """Compila todas as palavras-chave num único autômato
+        
+        A precedência original é preservada: respostas pré-definidas (na ordem
+        do dicionário), depois iluminação, clima e música.
+        """
+        matcher = IntentMatcher()
+        matcher.add_family('predefined', list(self.predefined_responses), rank=0)
+        matcher.add_family('lights', self.LIGHT_KEYWORDS, rank=1)
+        matcher.add_family('climate', self.CLIMATE_KEYWORDS, rank=2)
+        matcher.add_family('music', self.MUSIC_KEYWORDS, rank=3)
+        matcher.add_family('lights_on', self.LIGHT_ON_KEYWORDS)
+        matcher.add_family('lights_off', self.LIGHT_OFF_KEYWORDS)
+        matcher.add_family('light_nouns', self.LIGHT_NOUNS)
+        matcher.add_family('location', self.LOCATIONS)
+        return matcher.build()
+    
+    def _build_fuzzy_index(self):
+        """Vocabulário de todos os comandos, palavras-chave e cômodos conhecidos"""
+        index = FuzzyIndex()
+        for phrase in itertools.chain(
+            self.predefined_responses, self.LIGHT_KEYWORDS, self.LIGHT_ON_KEYWORDS, self.LIGHT_OFF_KEYWORDS,
+            self.CLIMATE_KEYWORDS, self.MUSIC_KEYWORDS, self.LOCATIONS
+        ):
+            index.add(phrase)
+        return index
+    
+    def add_predefined_response(self, key, response):
+        """Adiciona (ou substitui) uma resposta pré-definida"""
+        self.predefined_responses[key.lower().strip()] = response
+        self.intent_matcher = self._build_intent_matcher()
+        self.fuzzy_index.add(key)
+    
     def process_command(self, data):
         """Processa comando de voz recebido"""
         if not data or 'text' not in data:
@@ -116,101 +248,412 @@ Você está integrado a um sistema de automação residencial e pode controlar d
         self.event_manager.emit(Events.AI_THINKING, {'command': command_text})
         
         try:
-            # Tentar resposta pré-definida primeiro
-            response = self._try_predefined_response(command_text)
-            
-            if not response and self.ai_enabled:
-                # Usar IA para resposta
-                response = self._get_ai_response(command_text)
+            # Confirmar execução antecipada feita sobre hipótese parcial
+            response = self._commit_speculation(data.get('utterance_id'), command_text)
+            stream = {'stream_id': uuid.uuid4().hex, 'chunks': 0}
             
             if not response:
-                # Fallback para resposta padrão
-                response = "Desculpe, não consigo processar essa solicitação no momento."
+                # Quem chega com o mesmo comando em andamento só aguarda: a
+                # resposta da primeira execução é emitida uma vez para todos
+                (response, stream), shared = self.single_flight.do(
+                    normalize_text(command_text), self._compute_response, command_text, stream
+                )
+                if shared:
+                    self.logger.ai("Comando idêntico já em processamento - resposta compartilhada")
+                    return
             
             # Adicionar à conversa
             self._add_to_conversation(command_text, response)
             
             # Emitir resposta
-            self.event_manager.emit(Events.AI_RESPONSE, {
+            response_data = {
                 'text': response,
                 'command': command_text,
                 'timestamp': time.time()
-            })
+            }
+            if stream['chunks']:
+                response_data.update(streamed=True, stream_id=stream['stream_id'], chunks=stream['chunks'])
+            self.event_manager.emit(Events.AI_RESPONSE, response_data)
             
         except Exception as e:
             self.logger.error(f"Erro ao processar comando: {e}")
             self.event_manager.emit(Events.AI_ERROR, {'error': str(e)})
     
-    def _try_predefined_response(self, command):
-        """Tenta encontrar resposta em comandos pré-definidos"""
+    def _compute_response(self, command_text, stream):
+        """Resposta pré-definida, da IA ou padrão (sem emitir AI_RESPONSE)"""
+        # Tentar resposta pré-definida primeiro
+        response = self._try_predefined_response(command_text)
+        
+        if not response and self.ai_enabled:
+            # Usar IA para resposta (em streaming, os trechos já foram emitidos)
+            response = self._get_ai_response(command_text, stream)
+        
+        if not response:
+            # Fallback para resposta padrão
+            response = "Desculpe, não consigo processar essa solicitação no momento."
+        
+        return response, stream
+    
+    def process_partial(self, data):
+        """Casamento antecipado sobre hipótese parcial do reconhecimento
+        
+        A intenção é identificada sem efeitos colaterais a cada hipótese. Só uma
+        intenção completa (luz com ação e cômodo, ou resposta sem efeitos) é
+        executada antes do fim da fala, e no máximo uma vez por frase; uma
+        incompleta ("apagar", que ainda pode virar "apagar as luzes do quarto")
+        fica apenas preparada e a ação espera a transcrição final. A resposta
+        só é emitida quando a transcrição final confirma a mesma intenção (ver
+        ``_commit_speculation``).
+        """
+        if not self.partial_matching or not data or 'text' not in data:
+            return
+        
+        utterance_id = data.get('utterance_id')
+        if utterance_id is None:
+            return
+        
+        match = self._match_command(data['text'])
+        if not match:
+            return
+        key, action, complete = match
+        
+        with self._speculation_lock:
+            if utterance_id in self._finished_utterances:
+                return  # Hipótese parcial atrasada: a frase já foi concluída
+            
+            speculation = self._speculations.get(utterance_id)
+            if speculation is not None and speculation['response'] is not None:
+                return  # Ação já executada: hipóteses seguintes não disparam outra
+            
+            if speculation is None or speculation['key'] != key:
+                speculation = {'key': key, 'response': None}
+                self._speculations[utterance_id] = speculation
+            
+            if not complete:
+                return
+            
+            speculation['response'] = self._resolve_match(action)
+        
+        self.logger.ai(f"Intenção antecipada a partir de hipótese parcial: '{data['text']}' -> {key}")
+    
+    def _commit_speculation(self, utterance_id, command):
+        """Confirma a intenção antecipada se a transcrição final a mantém"""
+        if utterance_id is None:
+            return None
+        
+        with self._speculation_lock:
+            self._finished_utterances.append(utterance_id)
+            speculation = self._speculations.pop(utterance_id, None)
+            # Descartar especulações antigas de frases que nunca concluíram
+            for stale in [u for u in self._speculations if u < utterance_id]:
+                del self._speculations[stale]
+        
+        if not speculation or speculation['response'] is None:
+            return None
+        
+        match = self._match_command(command)
+        if match and match[0] == speculation['key']:
+            return speculation['response']
+        
+        self.logger.ai(f"Transcrição final divergiu da hipótese parcial ({speculation['key']})")
+        return None
+    
+    def _match_command(self, command):
+        """Identifica o comando sem executá-lo
+        
+        Retorna ``(chave, ação, completa)`` ou None. A ação é a resposta ou
+        uma função que a produz (executando o comando); ``completa`` indica
+        que ela pode rodar antes da transcrição final: sem efeitos colaterais,
+        ou um comando de luz com ação e cômodo definidos.
+        """
         command_lower = command.lower().strip()
         
         # Busca exata
         if command_lower in self.predefined_responses:
-            response = self.predefined_responses[command_lower]
-            if callable(response):
-                return response()
-            return response
+            return command_lower, self.predefined_responses[command_lower], True
         
-        # Busca por palavras-chave
-        for key, response in self.predefined_responses.items():
-            if key in command_lower:
-                if callable(response):
-                    return response()
-                return response
+        # Palavras-chave e comandos especiais: uma passada pelo autômato
+        result = self.intent_matcher.match(command_lower)
+        intent = result.best
         
-        # Comandos especiais
-        if any(word in command_lower for word in ['luz', 'luzes', 'acender', 'apagar']):
-            return self._handle_light_command(command)
+        # Sem intenção (ou luz sem ação/cômodo): tentar de novo com erros do reconhecimento corrigidos
+        if self.fuzzy_matching and (intent is None or (intent.family == 'lights' and self._light_details(result) < 2)):
+            corrected = self.fuzzy_index.correct(command_lower, self.fuzzy_max_words)
+            if corrected.corrections and corrected.confidence >= self.fuzzy_min_confidence:
+                corrected_result = self.intent_matcher.match(corrected.text)
+                if corrected_result.best is not None and (
+                    self._plausible_new_intent(command_lower, corrected, corrected_result) if intent is None
+                    else self._light_details(corrected_result) > self._light_details(result)
+                ):
+                    self.logger.ai(f"Comando corrigido: '{command_lower}' -> '{corrected.text}' "
+                                   f"(confiança {corrected.confidence:.2f})")
+                    command_lower, result, intent = corrected.text, corrected_result, corrected_result.best
         
-        if any(word in command_lower for word in ['temperatura', 'clima', 'ar condicionado']):
-            return self._handle_climate_command(command)
+        if intent is None:
+            return None
         
-        if any(word in command_lower for word in ['música', 'tocar', 'som']):
-            return self._handle_music_command(command)
+        if intent.family == 'predefined':
+            return intent.keyword, self.predefined_responses[intent.keyword], True
         
-        return None
+        if intent.family == 'lights':
+            if result.has('lights_on'):
+                action = 'on'
+            elif result.has('lights_off'):
+                action = 'off'
+            else:
+                action = 'unknown'
+            location = result.first('location') or 'all'
+            complete = action != 'unknown' and location != 'all'
+            return f"lights:{action}:{location}", lambda: self._handle_light_command(command, result), complete
+        
+        if intent.family == 'climate':
+            return 'climate', lambda: self._handle_climate_command(command), True
+        
+        return 'music', lambda: self._handle_music_command(command), True
+    
+    def _plausible_new_intent(self, command, corrected, result):
+        """A correção pode criar uma intenção onde não havia nenhuma?
+        
+        Uma palavra certa de outro assunto ("pagar", "atender") também fica
+        a uma edição de um comando. Então, além de confiança maior, a frase
+        precisa ser só de palavras de comando (nada sobrou fora do
+        vocabulário) ou ter uma âncora dita exatamente: palavra-chave de
+        luz, clima ou música, lâmpada ou cômodo. Para luzes, a lâmpada ou o
+        cômodo precisa estar no texto corrigido.
+        """
+        if corrected.confidence < self.fuzzy_new_intent_confidence:
+            return False
+        if corrected.unknown and not any(normalize_text(word) in self.fuzzy_anchors for word in command.split()):
+            return False
+        if result.best.family == 'lights':
+            return result.has('light_nouns') or result.has('location')
+        return True
+    
+    @staticmethod
+    def _light_details(result):
+        """Quantos detalhes do comando de luz foram reconhecidos (ação e cômodo)"""
+        return int(result.has('lights_on') or result.has('lights_off')) + int(result.has('location'))
+    
+    def _resolve_match(self, action):
+        """Produz a resposta de uma ação identificada por _match_command"""
+        if callable(action):
+            return action()
+        return action
+    
+    def _try_predefined_response(self, command):
+        """Tenta encontrar resposta em comandos pré-definidos"""
+        match = self._match_command(command)
+        if not match:
+            return None
+        return self._resolve_match(match[1])
+    
+    def _cache_context(self, command):
+        """Assinatura de contexto da chave do cache de respostas
+        
+        Inclui a configuração do modelo e, só quando o comando depende da
+        conversa anterior ("e amanhã?"), as últimas interações.
+        """
+        context = [self.model, self.temperature, hash(self.system_prompt)]
+        if self.cache_context_turns and is_context_dependent(normalize_text(command)):
+            for turn in self.conversation_memory.recent(self.cache_context_turns):
+                context.extend([turn['user'], turn['assistant']])
+        return context
     
-    def _get_ai_response(self, command):
-        """Obtém resposta usando OpenAI"""
+    def _stream_ai_response(self, messages, command, stream):
+        """Obtém a resposta em streaming, emitindo AI_RESPONSE_CHUNK a cada trecho
+        
+        Retorna ``(texto, completo)``; se o stream cair no meio, o texto parcial
+        (já emitido) é mantido como resposta.
+        """
+        parts = []
         try:
-            # Preparar mensagens
-            messages = [{"role": "system", "content": self.system_prompt}]
-            
-            # Adicionar histórico recente
-            for entry in self.conversation_history[-3:]:  # Últimas 3 interações
-                messages.append({"role": "user", "content": entry['command']})
-                messages.append({"role": "assistant", "content": entry['response']})
-            
-            # Adicionar comando atual
-            messages.append({"role": "user", "content": command})
-            
-            # Fazer request
-            response = openai.ChatCompletion.create(
+            for delta in self.llm_client.stream_chat(
+                messages,
                 model=self.model,
-                messages=messages,
                 max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                timeout=10
+                temperature=self.temperature
+            ):
+                self.event_manager.emit(Events.AI_RESPONSE_CHUNK, {
+                    'stream_id': stream['stream_id'],
+                    'index': len(parts),
+                    'text': delta,
+                    'command': command,
+                    'timestamp': time.time()
+                })
+                parts.append(delta)
+                stream['chunks'] = len(parts)
+            return ''.join(parts).strip(), True
+            
+        except Exception as e:
+            if not parts:
+                raise
+            self.logger.error(f"Streaming da resposta interrompido: {e}")
+            return ''.join(parts).strip(), False
+    
+    def _hedged_ai_response(self, messages, command, stream, context=None):
+        """Chamada remota com prazo, disputada com o modelo local se atrasar
+        
+        A chamada remota começa na hora. Se em ``hedge_after`` segundos ela não
+        tiver respondido (em streaming: enviado o primeiro trecho) ou tiver
+        falhado, o modelo local entra na disputa. O primeiro a responder vence e
+        o outro é cancelado. Sem vencedor (prazo ``response_budget`` esgotado ou
+        todos falharam), tudo é cancelado e vale a resposta do cache para o
+        mesmo comando, pela busca normal do cache (ou None). Retorna
+        ``(texto, completo, origem)``; a origem é 'remote', 'local' ou 'cache'.
+        """
+        streaming = self.streaming and stream is not None
+        condition = threading.Condition()
+        race = {'winner': None, 'pending': 0}
+        parts = []
+        futures = {}
+        
+        def claim(name):
+            with condition:
+                if race['winner'] is None:
+                    race['winner'] = name
+                    condition.notify_all()
+                return race['winner'] == name
+        
+        def on_delta_for(name):
+            def on_delta(delta):
+                if not claim(name):
+                    return
+                self.event_manager.emit(Events.AI_RESPONSE_CHUNK, {
+                    'stream_id': stream['stream_id'],
+                    'index': len(parts),
+                    'text': delta,
+                    'command': command,
+                    'timestamp': time.time()
+                })
+                parts.append(delta)
+                stream['chunks'] = len(parts)
+            return on_delta
+        
+        def on_done_for(name):
+            def on_done(future):
+                if not future.cancelled() and future.exception() is None and future.result():
+                    claim(name)
+                with condition:
+                    race['pending'] -= 1
+                    condition.notify_all()
+            return on_done
+        
+        def start(name, client, model):
+            if streaming:
+                coro = client.astream_chat(messages, on_delta_for(name), model=model, max_tokens=self.max_tokens,
+                                           temperature=self.temperature, timeout=self.request_timeout)
+            else:
+                coro = client.achat(messages, model=model, max_tokens=self.max_tokens,
+                                    temperature=self.temperature, timeout=self.request_timeout)
+            with condition:
+                race['pending'] += 1
+            futures[name] = client.submit(coro)
+            futures[name].add_done_callback(on_done_for(name))
+        
+        def wait_decision(timeout):
+            with condition:
+                condition.wait_for(lambda: race['winner'] or race['pending'] == 0, max(timeout, 0))
+                return race['winner']
+        
+        deadline = time.time() + self.response_budget
+        start('remote', self.llm_client, self.model)
+        winner = wait_decision(self.hedge_after)
+        
+        if winner is None:
+            self.logger.ai("Modelo remoto atrasado - consultando modelo local em paralelo")
+            start('local', self.local_client, self.local_model)
+            winner = wait_decision(deadline - time.time())
+        
+        with condition:
+            timed_out = race['pending'] > 0
+        
+        # Cancelar os perdedores (ou todos, se o prazo acabou)
+        for name, future in futures.items():
+            if name != winner:
+                future.cancel()
+        
+        if winner is None:
+            if timed_out:
+                self.logger.error(f"Nenhum modelo respondeu em {self.response_budget:.1f}s")
+            else:
+                errors = ', '.join(
+                    f"{name}: {future.exception() or 'resposta vazia'}" for name, future in futures.items()
+                )
+                self.logger.error(f"Todos os modelos falharam ({errors})")
+            if context is not None:
+                cached = self.response_cache.get(command, context)
+                if cached:
+                    self.logger.ai("Usando resposta do cache")
+                    return cached, False, 'cache'
+            return None, False, None
+        
+        if winner != 'remote':
+            self.logger.ai(f"Resposta obtida do modelo {winner}")
+        
+        try:
+            # Em streaming, o vencedor continua até o fim da resposta
+            return futures[winner].result(self.request_timeout), True, winner
+        except Exception as e:
+            if not parts:
+                raise
+            self.logger.error(f"Streaming da resposta interrompido: {e}")
+            return ''.join(parts).strip(), False, winner
+    
+    def _get_ai_response(self, command, stream=None):
+        """Obtém resposta usando OpenAI
+        
+        Com ``stream`` (e ``ai.streaming`` ativo), os trechos são emitidos como
+        AI_RESPONSE_CHUNK conforme chegam e ``stream['chunks']`` conta quantos.
+        """
+        context = self._cache_context(command) if self.response_cache else None
+        if context is not None:
+            cached = self.response_cache.get(command, context)
+            if cached:
+                self.logger.ai("Resposta obtida do cache")
+                return cached
+        
+        try:
+            # Preparar mensagens: system prompt, resumo e histórico recente dentro do orçamento
+            messages = self.conversation_memory.build_messages(
+                self.system_prompt, command, max_turns=self.prompt_turns
             )
             
-            return response.choices[0].message.content.strip()
+            # Fazer request
+            complete = True
+            source = 'remote'
+            if self.hedging:
+                text, complete, source = self._hedged_ai_response(messages, command, stream, context)
+            elif self.llm_client and self.streaming and stream is not None:
+                text, complete = self._stream_ai_response(messages, command, stream)
+            elif self.llm_client:
+                text = self.llm_client.chat(
+                    messages,
+                    model=self.model,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature
+                )
+            else:
+                response = openai.ChatCompletion.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                    timeout=self.request_timeout
+                )
+                text = response.choices[0].message.content.strip()
+            
+            # Respostas do modelo local de reserva não entram no cache do remoto
+            if context is not None and complete and source == 'remote':
+                self.response_cache.put(command, text, context)
+            return text
             
         except Exception as e:
             self.logger.error(f"Erro na API OpenAI: {e}")
             return None
     
     def _add_to_conversation(self, command, response):
-        """Adiciona interação ao histórico"""
-        self.conversation_history.append({
-            'command': command,
-            'response': response,
-            'timestamp': time.time()
-        })
-        
-        # Limitar tamanho do histórico
-        if len(self.conversation_history) > self.max_history:
-            self.conversation_history.pop(0)
+        """Adiciona interação ao histórico (as mais antigas viram resumo)"""
+        self.conversation_memory.add(command, response, timestamp=time.time())
     
     def _get_current_time(self):
         """Retorna hora atual"""
@@ -224,26 +667,28 @@ Você está integrado a um sistema de automação residencial e pode controlar d
                   'sexta-feira', 'sábado', 'domingo'][now.weekday()]
         return f"Hoje é {weekday}, {now.strftime('%d de %B de %Y')}."
     
-    def _handle_light_command(self, command):
+    def _handle_light_command(self, command, result=None):
         """Processa comandos relacionados à iluminação"""
-        command_lower = command.lower()
+        if result is None:
+            result = self.intent_matcher.match(command.lower())
+        location = result.first('location') or 'all'
         
-        if any(word in command_lower for word in ['acender', 'ligar', 'acenda']):
+        if result.has('lights_on'):
             # Emitir evento de automação
             from core.events import EventManager
             event_manager = EventManager.get_instance()
             event_manager.emit(Events.AUTOMATION_TRIGGERED, {
                 'action': 'turn_on_lights',
-                'location': self._extract_location(command)
+                'location': location
             })
             return "Acendendo as luzes conforme solicitado."
         
-        elif any(word in command_lower for word in ['apagar', 'desligar', 'apague']):
+        elif result.has('lights_off'):
             from core.events import EventManager
             event_manager = EventManager.get_instance()
             event_manager.emit(Events.AUTOMATION_TRIGGERED, {
                 'action': 'turn_off_lights',
-                'location': self._extract_location(command)
+                'location': location
             })
             return "Apagando as luzes."
         
@@ -259,22 +704,31 @@ Você está integrado a um sistema de automação residencial e pode controlar d
     
     def _extract_location(self, command):
         """Extrai localização do comando"""
-        locations = ['sala', 'quarto', 'cozinha', 'banheiro', 'escritório', 'garagem']
-        command_lower = command.lower()
-        
-        for location in locations:
-            if location in command_lower:
-                return location
-        
-        return 'all'  # Todas as luzes se não especificado
+        location = self.intent_matcher.match(command.lower()).first('location')
+        return location or 'all'  # Todas as luzes se não especificado
+    
+    def get_cache_stats(self):
+        """Métricas do cache de respostas"""
+        return self.response_cache.get_stats() if self.response_cache else {}
+    
+    def get_single_flight_stats(self):
+        """Métricas de coalescência de comandos"""
+        return self.single_flight.get_stats()
+    
+    def get_client_stats(self):
+        """Métricas do cliente LLM"""
+        return self.llm_client.get_stats() if self.llm_client else {}
     
     def get_conversation_history(self):
         """Retorna histórico da conversa"""
-        return self.conversation_history.copy()
+        return [
+            {'command': turn['user'], 'response': turn['assistant'], 'timestamp': turn['timestamp']}
+            for turn in self.conversation_memory.recent()
+        ]
     
     def clear_conversation_history(self):
         """Limpa histórico da conversa"""
-        self.conversation_history.clear()
+        self.conversation_memory.clear()
         self.logger.ai("Histórico da conversa limpo")
     
     def set_personality(self, new_prompt):
@@ -285,4 +739,9 @@ Você está integrado a um sistema de automação residencial e pode controlar d
     def shutdown(self):
         """Finaliza o motor de IA"""
         self.event_manager.unsubscribe(Events.VOICE_COMMAND, self.process_command)
+        self.event_manager.unsubscribe(Events.VOICE_PARTIAL, self.process_partial)
+        if self.llm_client:
+            self.llm_client.close()
+        if self.local_client:
+            self.local_client.close()
         self.logger.ai("Motor de IA finalizado")
\ No newline at end of file
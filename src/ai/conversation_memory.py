@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memória de Conversa do JARVIS
+Histórico limitado por orçamento de tokens, com resumo das interações antigas
+
+Também é usada pelo chatbot da interface Qt, então não depende de ``core.*``.
+"""
+
+import threading
+import time
+from collections import deque
+
+# Custo fixo de cada mensagem no formato de chat (papel, separadores)
+MESSAGE_OVERHEAD = 4
+
+def estimate_tokens(text):
+    """Estimativa rápida de tokens (~4 caracteres por token)"""
+    return (len(text or '') + 3) // 4 + MESSAGE_OVERHEAD
+
+def extractive_summary(previous_summary, turns, max_tokens):
+    """Resumo sem modelo: os assuntos mais recentes pedidos pelo usuário
+    
+    Mantém o resumo anterior e acrescenta as perguntas das interações
+    removidas; quando passa de ``max_tokens``, descarta os assuntos mais
+    antigos primeiro.
+    """
+    topics = [topic for topic in (previous_summary or '').split('; ') if topic]
+    for turn in turns:
+        question = ' '.join(turn['user'].split())
+        if len(question) > 80:
+            question = question[:77].rstrip() + '...'
+        if question:
+            topics.append(question)
+    
+    while topics and estimate_tokens('; '.join(topics)) > max_tokens:
+        topics.pop(0)
+    return '; '.join(topics)
+
+class ConversationMemory:
+    """Histórico de conversa com limite de interações e de tokens
+    
+    As interações ficam num deque; ao passar de ``max_turns`` ou do orçamento
+    de tokens do histórico, as mais antigas saem e viram um resumo curto
+    (``summarizer(resumo_anterior, interações, max_tokens)``). O prompt
+    montado por ``build_messages`` nunca passa de ``token_budget``: entram o
+    system prompt, o resumo e tantas interações recentes quanto couberem.
+    """
+    
+    def __init__(self, max_turns=10, token_budget=1200, summary_tokens=120,
+                 summarizer=extractive_summary):
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.summarizer = summarizer
+        
+        self._turns = deque()
+        self._tokens = 0
+        self._lock = threading.Lock()
+        
+        self.summary = ''
+        self.summarized_turns = 0
+    
+    def add(self, user, assistant, **extra):
+        """Registra uma interação (campos extras ficam junto dela)"""
+        turn = dict(extra)
+        turn.update(user=user, assistant=assistant)
+        turn.setdefault('timestamp', time.time())
+        turn['tokens'] = estimate_tokens(user) + estimate_tokens(assistant)
+        
+        with self._lock:
+            self._turns.append(turn)
+            self._tokens += turn['tokens']
+            
+            evicted = []
+            while self._turns and (len(self._turns) > self.max_turns or self._tokens > self.token_budget):
+                old = self._turns.popleft()
+                self._tokens -= old['tokens']
+                evicted.append(old)
+            
+            if evicted:
+                self.summarized_turns += len(evicted)
+                if self.summarizer:
+                    self.summary = self.summarizer(self.summary, evicted, self.summary_tokens)
+        return turn
+    
+    def recent(self, count=None):
+        """Últimas ``count`` interações (todas, se None), da mais antiga à mais nova"""
+        with self._lock:
+            turns = list(self._turns)
+        return turns if count is None else turns[-count:] if count > 0 else []
+    
+    def build_messages(self, system_prompt, user_message, max_turns=None):
+        """Monta as mensagens de chat dentro do orçamento de tokens"""
+        messages = [{"role": "system", "content": system_prompt}]
+        used = estimate_tokens(system_prompt) + estimate_tokens(user_message)
+        
+        with self._lock:
+            summary = self.summary
+            turns = list(self._turns)
+        
+        if summary:
+            summary_message = f"Resumo da conversa anterior: {summary}"
+            if used + estimate_tokens(summary_message) <= self.token_budget:
+                messages.append({"role": "system", "content": summary_message})
+                used += estimate_tokens(summary_message)
+        
+        # Das interações mais novas para as mais antigas, enquanto couberem
+        selected = []
+        for turn in reversed(turns):
+            if max_turns is not None and len(selected) >= max_turns:
+                break
+            if used + turn['tokens'] > self.token_budget:
+                break
+            selected.append(turn)
+            used += turn['tokens']
+        
+        for turn in reversed(selected):
+            messages.append({"role": "user", "content": turn['user']})
+            messages.append({"role": "assistant", "content": turn['assistant']})
+        
+        messages.append({"role": "user", "content": user_message})
+        return messages
+    
+    def clear(self):
+        """Apaga o histórico e o resumo"""
+        with self._lock:
+            self._turns.clear()
+            self._tokens = 0
+            self.summary = ''
+            self.summarized_turns = 0
+    
+    def get_stats(self):
+        """Métricas da memória"""
+        with self._lock:
+            return {
+                'turns': len(self._turns),
+                'tokens': self._tokens,
+                'token_budget': self.token_budget,
+                'summarized_turns': self.summarized_turns,
+                'summary_tokens': estimate_tokens(self.summary) if self.summary else 0
+            }
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._turns)
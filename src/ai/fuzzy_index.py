@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Correção Aproximada de Comandos do JARVIS
+Índice de trigramas e distância de edição sobre o vocabulário de comandos conhecidos
+
+Erros típicos do reconhecimento de voz ("a cender", "quartto", "musica")
+são corrigidos para as palavras do vocabulário antes do casamento de
+intenções, sem precisar do modelo de linguagem.
+"""
+
+import re
+from collections import defaultdict, namedtuple
+
+from .response_cache import normalize_text
+
+# Resultado da correção: texto corrigido, trocas (original, corrigida, distância), confiança
+# e palavras deixadas como foram ditas por não estarem no vocabulário
+Correction = namedtuple('Correction', ['text', 'corrections', 'confidence', 'unknown'])
+
+_NON_WORD = re.compile(r'[^\w]')
+
+def bounded_levenshtein(a, b, max_distance):
+    """Distância de edição, interrompida ao passar de ``max_distance``
+    
+    Retorna ``max_distance + 1`` quando a distância real é maior.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if current[j] < row_min:
+                row_min = current[j]
+        if row_min > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+def max_edits(length):
+    """Edições toleradas para uma palavra desse tamanho"""
+    if length < 4:
+        return 0
+    if length < 7:
+        return 1
+    return 2
+
+class FuzzyIndex:
+    """Vocabulário de comandos com busca aproximada por palavra
+    
+    As palavras são comparadas sem acentos. Cada uma é indexada pelos seus
+    trigramas; uma consulta só calcula a distância de edição (limitada) para
+    os poucos candidatos que compartilham trigramas e têm tamanho compatível.
+    Palavras curtas só são corrigidas na acentuação e empates entre
+    candidatos diferentes não são corrigidos. O índice não sabe se uma
+    palavra fora do vocabulário é um erro ou uma palavra certa de outro
+    assunto ("pagar" está a uma edição de "apagar"): ``Correction.unknown``
+    conta as palavras que sobraram para quem decide usar a correção.
+    """
+    
+    def __init__(self, ngram=3, max_candidates=8, memo_size=4096):
+        self.ngram = ngram
+        self.max_candidates = max_candidates
+        self.memo_size = memo_size
+        
+        self._words = {}                   # Forma sem acentos -> palavra original
+        self._grams = defaultdict(set)     # Trigrama -> formas sem acentos
+        self._memo = {}
+    
+    def _ngrams(self, word):
+        padded = f"{'$' * (self.ngram - 1)}{word}$"
+        return {padded[i:i + self.ngram] for i in range(len(padded) - self.ngram + 1)}
+    
+    def add(self, phrase):
+        """Adiciona as palavras de uma frase ao vocabulário"""
+        for word in phrase.lower().split():
+            word = _NON_WORD.sub('', word)
+            folded = normalize_text(word)
+            if not folded or folded in self._words:
+                continue
+            self._words[folded] = word
+            for gram in self._ngrams(folded):
+                self._grams[gram].add(folded)
+        self._memo.clear()
+    
+    def lookup(self, word):
+        """Palavra do vocabulário mais próxima: ``(palavra, distância)`` ou None"""
+        folded = normalize_text(word)
+        if not folded:
+            return None
+        if folded in self._words:
+            return self._words[folded], 0
+        
+        if folded in self._memo:
+            return self._memo[folded]
+        
+        result = None
+        limit = max_edits(len(folded))
+        if limit:
+            # Candidatos pelos trigramas em comum (coeficiente de Dice)
+            grams = self._ngrams(folded)
+            shared = defaultdict(int)
+            for gram in grams:
+                for candidate in self._grams.get(gram, ()):
+                    if abs(len(candidate) - len(folded)) <= limit:
+                        shared[candidate] += 1
+            
+            ranked = sorted(
+                shared,
+                key=lambda candidate: -2 * shared[candidate] / (len(grams) + len(candidate) + 1)
+            )[:self.max_candidates]
+            
+            best_distance = limit + 1
+            best = []
+            for candidate in ranked:
+                distance = bounded_levenshtein(folded, candidate, min(limit, best_distance))
+                if distance < best_distance:
+                    best_distance = distance
+                    best = [candidate]
+                elif distance == best_distance and distance <= limit:
+                    best.append(candidate)
+            
+            if len(best) == 1:
+                result = self._words[best[0]], best_distance
+        
+        if len(self._memo) >= self.memo_size:
+            self._memo.clear()
+        self._memo[folded] = result
+        return result
+    
+    def correct(self, text, max_words=None):
+        """Corrige as palavras do texto para o vocabulário
+        
+        Também junta palavras quebradas pelo reconhecimento ("a cender" ->
+        "acender"). A confiança é a da pior troca (1 - distância/tamanho);
+        1.0 quando nada mudou.
+        """
+        tokens = text.lower().split()
+        if max_words is not None and len(tokens) > max_words:
+            return Correction(text.lower(), [], 1.0, len(tokens))
+        
+        output = []
+        corrections = []
+        confidence = 1.0
+        unknown = 0
+        index = 0
+        
+        while index < len(tokens):
+            word = _NON_WORD.sub('', tokens[index])
+            
+            # Palavra partida em duas: só quando a junção é exata e nenhuma das partes é conhecida
+            if index + 1 < len(tokens):
+                following = _NON_WORD.sub('', tokens[index + 1])
+                joined = normalize_text(word + following)
+                if joined in self._words and not any(
+                    normalize_text(part) in self._words for part in (word, following)
+                ):
+                    output.append(self._words[joined])
+                    corrections.append((f"{word} {following}", self._words[joined], 0))
+                    index += 2
+                    continue
+            
+            hit = self.lookup(word) if word else None
+            if hit and hit[0] != word:
+                replacement, distance = hit
+                output.append(replacement)
+                corrections.append((word, replacement, distance))
+                confidence = min(confidence, 1 - distance / max(len(word), len(replacement)))
+            else:
+                output.append(tokens[index])
+                if word and not hit:
+                    unknown += 1
+            index += 1
+        
+        return Correction(' '.join(output), corrections, confidence, unknown)
+    
+    def __len__(self):
+        return len(self._words)
\ No newline at end of file
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Roteamento de Intenções do JARVIS
+Autômato Aho-Corasick que casa todas as famílias de palavras-chave numa única passada
+"""
+
+from collections import deque, namedtuple
+
+# Intenção encontrada no comando: família, palavra-chave e posição [start, end)
+Intent = namedtuple('Intent', ['family', 'keyword', 'start', 'end'])
+
+class KeywordAutomaton:
+    """Autômato Aho-Corasick sobre um conjunto de palavras-chave
+    
+    A busca percorre o texto uma única vez e encontra todas as ocorrências
+    (inclusive sobrepostas) de todas as palavras-chave; o custo depende do
+    tamanho do texto e do número de ocorrências, não do número de palavras.
+    A semântica é a de substring, como ``keyword in text``.
+    """
+    
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._keywords = [[]]  # Palavras que terminam em cada estado
+        self._output = [[]]    # Idem, mais as herdadas pelos links de falha
+        self._count = 0
+        self._built = True
+    
+    def add(self, keyword, value=None):
+        """Adiciona uma palavra-chave associada a um valor"""
+        if not keyword:
+            return
+        
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._keywords.append([])
+                self._output.append([])
+            state = next_state
+        
+        self._keywords[state].append((len(keyword), keyword, value))
+        self._count += 1
+        self._built = False
+    
+    def build(self):
+        """Calcula os links de falha (BFS a partir da raiz)"""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            self._output[state] = list(self._keywords[state])
+            queue.append(state)
+        
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                
+                # Saídas herdadas: sufixos que também são palavras-chave
+                self._output[next_state] = self._keywords[next_state] + self._output[self._fail[next_state]]
+        
+        self._built = True
+    
+    def iter_matches(self, text):
+        """Gera ``(start, end, keyword, value)`` para cada ocorrência"""
+        if not self._built:
+            self.build()
+        
+        state = 0
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            
+            for length, keyword, value in output[state]:
+                yield index + 1 - length, index + 1, keyword, value
+    
+    def __len__(self):
+        return self._count
+
+class MatchResult:
+    """Resultado do casamento de um comando"""
+    
+    def __init__(self, intents, hits):
+        self.intents = intents
+        self._hits = hits
+    
+    def has(self, family):
+        """Indica se alguma palavra-chave da família apareceu"""
+        return family in self._hits
+    
+    def first(self, family):
+        """Palavra-chave da família com maior precedência (ordem de cadastro)"""
+        hits = self._hits.get(family)
+        return min(hits)[1] if hits else None
+    
+    def spans(self, family):
+        """Ocorrências ``(start, end, palavra)`` da família, em ordem no texto"""
+        return sorted(span for _, _, span in self._hits.get(family, []))
+    
+    @property
+    def best(self):
+        """Intenção de maior precedência (ou None)"""
+        return self.intents[0] if self.intents else None
+
+class IntentMatcher:
+    """Famílias de palavras-chave compiladas num único autômato
+    
+    Famílias com ``rank`` são intenções, ordenadas por rank e, dentro da
+    família, pela ordem de cadastro das palavras. Famílias sem rank são
+    atributos (ação, cômodo...) consultados via ``MatchResult``.
+    """
+    
+    def __init__(self):
+        self._ranks = {}
+        self._sizes = {}
+        self._automaton = KeywordAutomaton()
+    
+    def add_family(self, family, keywords, rank=None):
+        """Cadastra uma família de palavras-chave"""
+        self._ranks[family] = rank
+        self._sizes.setdefault(family, 0)
+        for keyword in keywords:
+            self.add_keyword(family, keyword)
+    
+    def add_keyword(self, family, keyword):
+        """Adiciona uma palavra-chave ao fim de uma família (menor precedência)"""
+        order = self._sizes.get(family, 0)
+        self._sizes[family] = order + 1
+        self._automaton.add(keyword, (family, order))
+    
+    def build(self):
+        """Compila o autômato"""
+        self._automaton.build()
+        return self
+    
+    def match(self, text):
+        """Casa o texto (já normalizado) contra todas as famílias"""
+        hits = {}
+        for start, end, keyword, (family, order) in self._automaton.iter_matches(text):
+            hits.setdefault(family, []).append((order, keyword, (start, end, keyword)))
+        
+        intents = []
+        for family, family_hits in hits.items():
+            rank = self._ranks.get(family)
+            if rank is None:
+                continue
+            order, keyword, (start, end, _) = min(family_hits)
+            intents.append((rank, order, Intent(family, keyword, start, end)))
+        
+        intents.sort(key=lambda item: (item[0], item[1]))
+        return MatchResult([intent for _, _, intent in intents], hits)
+    
+    def __len__(self):
+        return len(self._automaton)
\ No newline at end of file
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cliente LLM Assíncrono do JARVIS
+Pool de conexões keep-alive, limite de concorrência, retentativas e prazos por chamada
+
+Também é usado pelo LocalModelWrapper do jarvis-cyber (carregado por
+``jarvis-cyber/models/llm_client.py``), então não depende de ``core.*``
+(apenas ``logging``).
+"""
+
+import asyncio
+import json
+import logging
+import queue
+import random
+import threading
+import time
+
+try:
+    import aiohttp
+except ImportError:  # Dependência opcional: quem usa cai para o cliente openai síncrono
+    aiohttp = None
+
+DEFAULT_API_BASE = "https://api.openai.com/v1"
+
+# Respostas que valem nova tentativa (limite de taxa e falhas do servidor)
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+class LLMError(Exception):
+    """Falha definitiva numa chamada ao modelo"""
+    
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+class LLMClient:
+    """Cliente HTTP assíncrono para APIs compatíveis com OpenAI
+    
+    Um único event loop numa thread de fundo atende todas as chamadas: as
+    conexões TCP/TLS ficam abertas no pool (keep-alive) e um semáforo limita
+    as requisições simultâneas, sem uma thread por chamada. Cada chamada tem
+    um prazo total; as retentativas (backoff exponencial com jitter) só
+    acontecem se couberem nele. Threads comuns usam a fachada síncrona
+    ``chat``; código assíncrono pode usar ``achat`` no loop do cliente.
+    """
+    
+    def __init__(self, api_key, api_base=DEFAULT_API_BASE, max_concurrency=4,
+                 pool_size=8, max_retries=2, timeout=10.0, backoff_base=0.25,
+                 backoff_max=4.0, keepalive_timeout=30.0):
+        if aiohttp is None:
+            raise ImportError("aiohttp não instalado")
+        
+        self.api_key = api_key
+        self.api_base = (api_base or DEFAULT_API_BASE).rstrip('/')
+        self.max_concurrency = max_concurrency
+        self.pool_size = max(pool_size, max_concurrency)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.keepalive_timeout = keepalive_timeout
+        self.logger = logging.getLogger(__name__)
+        
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._semaphore = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._closed = False
+        
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.total_latency = 0.0
+    
+    def _ensure_loop(self):
+        """Inicia o event loop de fundo na primeira chamada"""
+        with self._start_lock:
+            if self._closed:
+                raise LLMError("Cliente LLM finalizado")
+            if self._loop is not None:
+                return self._loop
+            
+            ready = threading.Event()
+            loop = asyncio.new_event_loop()
+            
+            def run():
+                asyncio.set_event_loop(loop)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                ready.set()
+                loop.run_forever()
+            
+            self._thread = threading.Thread(target=run, name="LLMClientLoop", daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+            return loop
+    
+    async def _get_session(self):
+        """Sessão HTTP compartilhada (criada dentro do loop)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                }
+            )
+        return self._session
+    
+    def _backoff(self, attempt, retry_after=None):
+        """Espera antes da próxima tentativa (full jitter)"""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, cap)
+    
+    @staticmethod
+    def _retry_after(response):
+        """Lê o cabeçalho Retry-After (segundos), se houver"""
+        value = response.headers.get('Retry-After')
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+    
+    async def _post(self, path, payload, timeout=None, consume=None):
+        """POST com limite de concorrência, retentativas e prazo total
+        
+        Sem ``consume``, retorna o JSON da resposta. Com ``consume`` (streaming),
+        a resposta é entregue a ele: o prazo vale até o início da resposta e,
+        depois, como limite de cada leitura.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout if timeout is not None else self.timeout)
+        session = await self._get_session()
+        url = f"{self.api_base}{path}"
+        last_error = None
+        
+        for attempt in range(self.max_retries + 1):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            
+            retry_after = None
+            try:
+                # A espera pelo semáforo também conta no prazo da chamada
+                await asyncio.wait_for(self._semaphore.acquire(), remaining)
+                try:
+                    self.in_flight += 1
+                    remaining = max(deadline - loop.time(), 0.001)
+                    if consume:
+                        request_timeout = aiohttp.ClientTimeout(sock_connect=remaining, sock_read=remaining)
+                    else:
+                        request_timeout = aiohttp.ClientTimeout(total=remaining)
+                    async with session.post(url, json=payload, timeout=request_timeout) as response:
+                        if response.status == 200:
+                            if consume:
+                                return await consume(response)
+                            return await response.json()
+                        
+                        body = await response.text()
+                        last_error = LLMError(f"HTTP {response.status}: {body[:200]}", response.status)
+                        if response.status not in RETRY_STATUS:
+                            raise last_error
+                        retry_after = self._retry_after(response)
+                finally:
+                    self.in_flight -= 1
+                    self._semaphore.release()
+                
+            except LLMError:
+                raise
+            except asyncio.TimeoutError:
+                last_error = LLMError("Tempo limite da chamada esgotado")
+            except aiohttp.ClientError as e:
+                last_error = LLMError(f"Erro de conexão: {e}")
+            
+            if attempt >= self.max_retries:
+                break
+            
+            delay = self._backoff(attempt, retry_after)
+            if loop.time() + delay >= deadline:
+                break
+            with self._stats_lock:
+                self.retries += 1
+            self.logger.warning(f"Chamada ao modelo falhou ({last_error}); nova tentativa em {delay:.2f}s")
+            await asyncio.sleep(delay)
+        
+        raise last_error or LLMError("Tempo limite da chamada esgotado")
+    
+    async def achat(self, messages, model="gpt-3.5-turbo", max_tokens=150,
+                    temperature=0.7, timeout=None):
+        """Chat completion assíncrono; retorna o texto da resposta"""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+        
+        start = time.time()
+        with self._stats_lock:
+            self.requests += 1
+        try:
+            data = await self._post("/chat/completions", payload, timeout)
+        except LLMError:
+            with self._stats_lock:
+                self.failures += 1
+            raise
+        
+        with self._stats_lock:
+            self.total_latency += time.time() - start
+        
+        try:
+            return data['choices'][0]['message']['content'].strip()
+        except (KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"Resposta inesperada do modelo: {e}")
+    
+    async def astream_chat(self, messages, on_delta, model="gpt-3.5-turbo",
+                           max_tokens=150, temperature=0.7, timeout=None):
+        """Chat completion em streaming (SSE)
+        
+        Chama ``on_delta(texto)`` a cada trecho recebido e retorna o texto
+        completo. Só há retentativa antes do primeiro trecho: depois dele,
+        uma falha interrompe o stream com LLMError.
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True
+        }
+        
+        async def consume(response):
+            parts = []
+            try:
+                async for raw_line in response.content:
+                    line = raw_line.decode('utf-8').strip()
+                    if not line.startswith('data:'):
+                        continue
+                    
+                    data = line[5:].strip()
+                    if data == '[DONE]':
+                        break
+                    try:
+                        delta = json.loads(data)['choices'][0].get('delta', {}).get('content')
+                    except (ValueError, KeyError, IndexError, TypeError):
+                        continue
+                    
+                    if delta:
+                        parts.append(delta)
+                        on_delta(delta)
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                if parts:
+                    raise LLMError(f"Stream interrompido: {e}")
+                raise
+            return ''.join(parts).strip()
+        
+        start = time.time()
+        with self._stats_lock:
+            self.requests += 1
+        try:
+            text = await self._post("/chat/completions", payload, timeout, consume)
+        except LLMError:
+            with self._stats_lock:
+                self.failures += 1
+            raise
+        
+        with self._stats_lock:
+            self.total_latency += time.time() - start
+        return text
+    
+    def submit(self, coro):
+        """Agenda uma corrotina no loop do cliente (retorna Future)"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+    
+    def chat(self, messages, model="gpt-3.5-turbo", max_tokens=150,
+             temperature=0.7, timeout=None):
+        """Fachada síncrona de ``achat`` para threads comuns"""
+        timeout = timeout if timeout is not None else self.timeout
+        future = self.submit(self.achat(messages, model, max_tokens, temperature, timeout))
+        try:
+            # Folga para o loop entregar o resultado após o prazo interno
+            return future.result(timeout + 1.0)
+        except Exception:
+            future.cancel()
+            raise
+    
+    def stream_chat(self, messages, model="gpt-3.5-turbo", max_tokens=150,
+                    temperature=0.7, timeout=None):
+        """Fachada síncrona de ``astream_chat``: gera os trechos conforme chegam"""
+        deltas = queue.Queue()
+        finished = object()
+        
+        async def run():
+            try:
+                return await self.astream_chat(messages, deltas.put, model, max_tokens, temperature, timeout)
+            finally:
+                deltas.put(finished)
+        
+        future = self.submit(run())
+        try:
+            while True:
+                delta = deltas.get()
+                if delta is finished:
+                    break
+                yield delta
+            future.result()  # Propaga erros do stream
+        finally:
+            future.cancel()
+    
+    def get_stats(self):
+        """Métricas do cliente"""
+        with self._stats_lock:
+            succeeded = self.requests - self.failures
+            return {
+                'requests': self.requests,
+                'failures': self.failures,
+                'retries': self.retries,
+                'in_flight': self.in_flight,
+                'max_concurrency': self.max_concurrency,
+                'avg_latency': self.total_latency / succeeded if succeeded > 0 else 0.0
+            }
+    
+    def close(self):
+        """Fecha o pool de conexões e encerra o loop de fundo"""
+        with self._start_lock:
+            self._closed = True
+            loop = self._loop
+            self._loop = None
+        if loop is None:
+            return
+        
+        async def shutdown():
+            if self._session is not None and not self._session.closed:
+                await self._session.close()
+        
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(5)
+        except Exception as e:
+            self.logger.error(f"Erro ao fechar sessão HTTP: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+        loop.close()
\ No newline at end of file
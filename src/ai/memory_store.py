@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Armazenamento da Memória da IA
+Conexão SQLite única em modo WAL, com escrita em segundo plano e em lotes
+
+Quem grava só enfileira o comando; a thread de escrita agrupa o que chegou
+numa transação por lote, de modo que a latência de cada requisição não
+inclui mais abrir conexões nem esperar fsync.
+"""
+
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+class MemoryStore:
+    """Banco SQLite com uma thread dona da conexão de escrita
+    
+    ``execute``/``executemany`` enfileiram escritas (write-behind) e retornam
+    na hora. A thread de escrita aplica até ``batch_size`` comandos por
+    transação e confirma o lote quando a fila esvazia por ``flush_interval``
+    segundos. ``call`` executa uma função com a conexão na própria thread de
+    escrita (depois das escritas já enfileiradas) e devolve o resultado;
+    ``flush`` espera tudo o que foi enfileirado ser confirmado.
+    
+    Leituras usam um pool de até ``max_readers`` conexões, emprestadas a cada
+    consulta (quem passar do limite espera uma ser devolvida): no modo WAL
+    elas não bloqueiam nem são bloqueadas pela escrita, mas só enxergam
+    lotes já confirmados (use ``fresh=True`` para confirmar antes).
+    """
+    
+    def __init__(self, db_path, batch_size=128, flush_interval=0.05, max_queue=10000, max_readers=4):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger(__name__)
+        
+        self._queue = queue.Queue(maxsize=max_queue)
+        self.max_readers = max_readers
+        self._idle_readers = queue.LifoQueue()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        
+        self.queued = 0
+        self.written = 0
+        self.errors = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.last_commit_ms = 0.0
+        
+        self._thread = threading.Thread(target=self._run, name="MemoryStoreWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')  # Em WAL, fsync só nos checkpoints
+        conn.execute('PRAGMA busy_timeout=10000')
+        return conn
+    
+    def execute(self, sql, params=()):
+        """Enfileira uma escrita"""
+        self._put(('execute', sql, params))
+    
+    def executemany(self, sql, seq_of_params):
+        """Enfileira a mesma escrita para vários registros"""
+        self._put(('executemany', sql, list(seq_of_params)))
+    
+    def call(self, fn, timeout=None):
+        """Executa ``fn(conexão)`` na thread de escrita e retorna o resultado
+        
+        A função roda dentro do lote corrente; o lote é confirmado logo em
+        seguida. Exceções são propagadas para quem chamou (e o que a função
+        já tinha escrito é desfeito).
+        """
+        future = Future()
+        self._put(('call', fn, future))
+        return future.result(timeout)
+    
+    def flush(self, timeout=None):
+        """Espera as escritas enfileiradas até aqui serem confirmadas"""
+        if self._closed or threading.current_thread() is self._thread:
+            return True
+        done = threading.Event()
+        self._put(('flush', done, None))
+        return done.wait(timeout)
+    
+    def query(self, sql, params=(), fresh=False):
+        """Executa uma leitura e retorna todas as linhas"""
+        if fresh:
+            self.flush()
+        conn = self._checkout_reader()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            self._idle_readers.put(conn)
+    
+    def _checkout_reader(self):
+        """Empresta uma conexão de leitura, abrindo outra enquanto couber no pool"""
+        try:
+            return self._idle_readers.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._readers_lock:
+            if self._closed:
+                raise RuntimeError("MemoryStore encerrado")
+            if len(self._readers) < self.max_readers:
+                conn = self._connect()
+                self._readers.append(conn)
+                return conn
+        return self._idle_readers.get()
+    
+    def _put(self, item):
+        if self._closed:
+            raise RuntimeError("MemoryStore encerrado")
+        self._queue.put(item)
+        if item[0] in ('execute', 'executemany'):
+            self.queued += 1
+    
+    def _run(self):
+        """Laço da thread de escrita"""
+        conn = self._connect()
+        pending = 0
+        
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval if conn.in_transaction else None)
+            except queue.Empty:
+                pending = self._commit(conn, pending)
+                continue
+            
+            if item is _STOP:
+                self._commit(conn, pending)
+                break
+            
+            kind, first, second = item
+            if kind == 'flush':
+                pending = self._commit(conn, pending)
+                first.set()
+                continue
+            
+            if not conn.in_transaction:
+                conn.execute('BEGIN')
+            
+            if kind == 'call':
+                conn.execute('SAVEPOINT store_call')
+                error = None
+                try:
+                    result = first(conn)
+                    conn.execute('RELEASE store_call')
+                except Exception as e:
+                    error = e
+                    conn.execute('ROLLBACK TO store_call')
+                    conn.execute('RELEASE store_call')
+                
+                # Confirmar antes de liberar quem chamou (leituras seguintes já enxergam)
+                pending = self._commit(conn, pending)
+                if error is not None:
+                    second.set_exception(error)
+                else:
+                    second.set_result(result)
+                continue
+            
+            try:
+                if kind == 'execute':
+                    conn.execute(first, second)
+                else:
+                    conn.executemany(first, second)
+                pending += 1
+            except sqlite3.Error as e:
+                # Cada comando é atômico: o erro descarta só ele, não o lote
+                self.errors += 1
+                self.logger.error(f"Erro ao gravar na memória: {e}")
+            
+            if pending >= self.batch_size:
+                pending = self._commit(conn, pending)
+        
+        conn.close()
+    
+    def _commit(self, conn, pending):
+        """Confirma a transação aberta; retorna o novo número de pendentes (0)"""
+        if not conn.in_transaction:
+            return 0
+        start = time.perf_counter()
+        try:
+            conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            self.errors += 1
+            self.logger.error(f"Erro ao confirmar lote da memória ({pending} escritas perdidas): {e}")
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            return 0
+        self.last_commit_ms = (time.perf_counter() - start) * 1000
+        if pending:
+            self.batches += 1
+            self.written += pending
+            self.largest_batch = max(self.largest_batch, pending)
+        return 0
+    
+    def get_stats(self):
+        """Métricas da escrita em segundo plano"""
+        return {
+            'queued': self.queued,
+            'written': self.written,
+            'pending': self._queue.qsize(),
+            'batches': self.batches,
+            'largest_batch': self.largest_batch,
+            'average_batch': self.written / self.batches if self.batches else 0.0,
+            'last_commit_ms': self.last_commit_ms,
+            'errors': self.errors,
+            'readers': len(self._readers)
+        }
+    
+    def close(self, timeout=10.0):
+        """Confirma o que estiver pendente e encerra a thread de escrita"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        with self._readers_lock:
+            for conn in self._readers:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._readers.clear()
\ No newline at end of file
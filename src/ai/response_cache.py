@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache de Respostas da IA do JARVIS
+Evita chamadas repetidas ao modelo para perguntas iguais ou quase iguais
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from difflib import SequenceMatcher
+
+# Palavras que indicam dependência da conversa anterior ("e amanhã?", "e isso?")
+ANAPHORIC_WORDS = {
+    'e', 'mas', 'entao', 'isso', 'isto', 'aquilo', 'ele', 'ela', 'eles', 'elas',
+    'dele', 'dela', 'disso', 'nisso', 'tambem', 'mesmo', 'mesma', 'outro', 'outra',
+    'anterior', 'ainda'
+}
+
+# Palavras que não mudam a pergunta ("qual é a capital" = "qual a capital")
+FUNCTION_WORDS = {
+    'o', 'a', 'os', 'as', 'um', 'uma', 'uns', 'umas', 'de', 'do', 'da', 'dos', 'das', 'em', 'no',
+    'na', 'nos', 'nas', 'ao', 'aos', 'e', 'eh', 'me', 'por', 'favor', 'jarvis', 'ai', 'ola', 'oi'
+}
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+_NUMBER = re.compile(r'\d+')
+
+def normalize_text(text):
+    """Normaliza para comparação: sem acentos, minúsculas, sem pontuação"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    folded = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    folded = _PUNCTUATION.sub(' ', folded.lower())
+    return _WHITESPACE.sub(' ', folded).strip()
+
+def is_context_dependent(normalized_command, max_short_words=2):
+    """Heurística: o comando só faz sentido com a conversa anterior?"""
+    words = normalized_command.split()
+    if len(words) <= max_short_words:
+        return True
+    return words[0] in ANAPHORIC_WORDS or any(word in ANAPHORIC_WORDS for word in words[1:] if word != 'e')
+
+def content_signature(normalized_command):
+    """Números e palavras de conteúdo, na ordem: o que não pode mudar num acerto aproximado"""
+    words = normalized_command.split()
+    return (
+        tuple(_NUMBER.findall(normalized_command)),
+        tuple(word for word in words if word not in FUNCTION_WORDS and not _NUMBER.search(word))
+    )
+
+class ResponseCache:
+    """Cache LRU de respostas com TTL e acertos aproximados opcionais
+    
+    A chave é o comando normalizado (acentos, caixa, pontuação e espaços) mais
+    uma assinatura de contexto: a configuração do modelo e, quando o comando
+    depende da conversa anterior, as últimas interações. Por padrão só essa
+    chave exata acerta. Com ``similarity_threshold``, um comando parecido o
+    bastante com outro já respondido (no mesmo contexto) também é um acerto,
+    desde que os números e as palavras de conteúdo sejam os mesmos: "quanto
+    é 12 mais 14" nunca recebe a resposta de "quanto é 12 mais 13".
+    """
+    
+    def __init__(self, max_entries=256, ttl=3600, similarity_threshold=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+    
+    def make_key(self, command, context=()):
+        """Chave do cache: (comando normalizado, assinatura do contexto)"""
+        return normalize_text(command), tuple(normalize_text(str(part)) for part in context)
+    
+    def get(self, command, context=()):
+        """Retorna a resposta em cache ou None"""
+        key = self.make_key(command, context)
+        now = time.time()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry['expires_at'] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry['response']
+                del self._entries[key]
+                self.expired += 1
+            
+            if self.similarity_threshold:
+                similar_key = self._find_similar(key, now, self.similarity_threshold)
+                if similar_key is not None:
+                    self._entries.move_to_end(similar_key)
+                    self.fuzzy_hits += 1
+                    return self._entries[similar_key]['response']
+            
+            self.misses += 1
+            return None
+    
+    def _find_similar(self, key, now, threshold):
+        """Procura a entrada válida mais parecida no mesmo contexto"""
+        command, context = key
+        signature = content_signature(command)
+        best_key = None
+        best_ratio = threshold
+        
+        for candidate_key, entry in self._entries.items():
+            candidate, candidate_context = candidate_key
+            if candidate_context != context or entry['expires_at'] <= now:
+                continue
+            if entry['signature'] != signature:
+                continue
+            
+            # Limite superior da razão pelo tamanho, antes da comparação completa
+            total = len(command) + len(candidate) or 1
+            if 2 * min(len(command), len(candidate)) / total < best_ratio:
+                continue
+            
+            matcher = SequenceMatcher(None, command, candidate)
+            if matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best_key = candidate_key
+                best_ratio = ratio
+        
+        return best_key
+    
+    def put(self, command, response, context=(), ttl=None):
+        """Armazena uma resposta"""
+        if not response:
+            return
+        
+        key = self.make_key(command, context)
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl)
+        
+        with self._lock:
+            self._entries[key] = {
+                'response': response,
+                'expires_at': expires_at,
+                'signature': content_signature(key[0])
+            }
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Remove todas as entradas"""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self):
+        """Métricas do cache"""
+        with self._lock:
+            lookups = self.hits + self.fuzzy_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'fuzzy_hits': self.fuzzy_hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits + self.fuzzy_hits) / lookups if lookups else 0.0
+            }
\ No newline at end of file
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Busca Semântica do JARVIS
+Embeddings por hashing numa matriz float32 mapeada em disco, com top-k por cosseno
+
+Sem modelo nem vocabulário para treinar: palavras e trigramas de caracteres
+são espalhados por hashing num vetor de tamanho fixo, então textos com
+palavras em comum (ou variações delas) ficam próximos. Novos textos entram
+no fim da matriz sem recalcular nada.
+"""
+
+import json
+import math
+import os
+import threading
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from .response_cache import normalize_text
+
+class HashingEmbedder:
+    """Vetoriza textos por hashing de palavras e trigramas de caracteres
+    
+    Palavras curtas e ``stopwords`` são ignoradas. Cada palavra contribui com a própria característica (peso 1) e com seus
+    trigramas (peso ``char_weight``), somando ``±peso`` na posição
+    ``hash % dim`` (o sinal também vem do hash, para os choques se
+    cancelarem em média). A contribuição de cada palavra fica em cache; a
+    frequência no texto é amortecida com log e o vetor final tem norma 1.
+    """
+    
+    def __init__(self, dim=256, char_weight=0.5, stopwords=None, min_word_length=3, cache_size=50000):
+        self.dim = dim
+        self.char_weight = char_weight
+        self.min_word_length = min_word_length
+        self.stopwords = frozenset(stopwords or ())
+        self.cache_size = cache_size
+        self._cache = {}
+    
+    def _word_vector(self, word):
+        """Posições e pesos (com sinal) das características de uma palavra"""
+        cached = self._cache.get(word)
+        if cached is None:
+            padded = f" {word} "
+            features = ['w:' + word] + ['c:' + padded[i:i + 3] for i in range(len(padded) - 2)]
+            hashes = np.fromiter((zlib.crc32(feature.encode('utf-8')) for feature in features),
+                                 dtype=np.uint32, count=len(features))
+            weights = np.full(len(features), self.char_weight, dtype=np.float32)
+            weights[0] = 1.0
+            weights[hashes & 0x80000000 != 0] *= -1.0
+            cached = ((hashes % self.dim).astype(np.intp), weights)
+            
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[word] = cached
+        return cached
+    
+    def embed(self, text):
+        """Vetor normalizado (float32) de um texto"""
+        counts = Counter(word for word in normalize_text(text).split()
+                         if len(word) >= self.min_word_length and word not in self.stopwords)
+        if not counts:
+            return np.zeros(self.dim, dtype=np.float32)
+        
+        positions = []
+        values = []
+        for word, count in counts.items():
+            word_positions, word_weights = self._word_vector(word)
+            positions.append(word_positions)
+            values.append(word_weights * (1.0 + math.log(count)))
+        vector = np.bincount(np.concatenate(positions), np.concatenate(values), minlength=self.dim).astype(np.float32)
+        
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+    
+    def embed_batch(self, texts):
+        """Matriz (len(texts) x dim) com um vetor por texto"""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row] = self.embed(text)
+        return matrix
+
+class SemanticIndex:
+    """Matriz de vetores em disco com o id da linha de origem de cada vetor
+    
+    Arquivos: ``<caminho>.f32`` (vetores, memmap), ``<caminho>.ids`` (id de
+    cada linha, memmap int64) e ``<caminho>.json`` (quantidade de linhas e
+    marcador de sincronização). Use um índice por origem: a busca é um único
+    produto matriz-vetor sobre as linhas ocupadas, sem filtrar outras
+    origens. A capacidade dobra quando enche. ``append`` só escreve nos
+    mapas; ``commit`` grava em disco e atualiza o cabeçalho, uma vez por lote.
+    """
+    
+    def __init__(self, path, dim=256, initial_capacity=1024):
+        self.path = path
+        self.dim = dim
+        self.count = 0
+        self.mark = 0
+        self._lock = threading.RLock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        capacity = initial_capacity
+        meta = self._read_meta()
+        if meta and meta.get('dim') == dim:
+            self.count = meta['count']
+            self.mark = meta.get('mark', 0)
+            capacity = max(capacity, meta.get('capacity', capacity))
+        elif meta:
+            # Dimensão mudou: os vetores antigos não servem mais
+            self._remove_files()
+        self._open(capacity)
+    
+    def _read_meta(self):
+        try:
+            with open(self.path + '.json', 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+    
+    def _write_meta(self):
+        meta = {
+            'dim': self.dim,
+            'count': self.count,
+            'capacity': self.capacity,
+            'mark': self.mark
+        }
+        temp_path = self.path + '.json.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(temp_path, self.path + '.json')
+    
+    def _remove_files(self):
+        for suffix in ('.f32', '.ids', '.json'):
+            try:
+                os.remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
+    
+    def _memmap(self, suffix, dtype, shape):
+        """Abre (criando ou aumentando) um arquivo mapeado com o formato pedido"""
+        file_path = self.path + suffix
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        with open(file_path, 'ab') as f:
+            if f.tell() < size:
+                f.truncate(size)
+        return np.memmap(file_path, dtype=dtype, mode='r+', shape=shape)
+    
+    def _open(self, capacity):
+        self.capacity = capacity
+        self.vectors = self._memmap('.f32', np.float32, (capacity, self.dim))
+        self.ids = self._memmap('.ids', np.int64, (capacity,))
+    
+    def append(self, ids, vectors, mark=None):
+        """Acrescenta vetores; ``mark`` registra até onde a origem foi indexada
+        
+        Só vale em disco depois de ``commit``.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            needed = self.count + len(vectors)
+            if needed > self.capacity:
+                capacity = self.capacity
+                while capacity < needed:
+                    capacity *= 2
+                self.vectors.flush()
+                self.ids.flush()
+                self._open(capacity)
+            
+            self.vectors[self.count:needed] = vectors
+            self.ids[self.count:needed] = np.asarray(ids, dtype=np.int64)
+            self.count = needed
+            if mark is not None:
+                self.mark = mark
+    
+    def commit(self):
+        """Grava os vetores acrescentados e o cabeçalho"""
+        with self._lock:
+            self.vectors.flush()
+            self.ids.flush()
+            self._write_meta()
+    
+    def reset(self):
+        """Esvazia o índice (os arquivos são reaproveitados)"""
+        with self._lock:
+            self.count = 0
+            self.mark = 0
+            self._write_meta()
+    
+    def search(self, vector, k=5, min_score=0.0):
+        """Top-k por cosseno: lista de ``(id, score)``, do maior para o menor"""
+        return self.search_batch([vector], k, min_score)[0]
+    
+    def search_batch(self, vectors, k=5, min_score=0.0, chunk_size=64):
+        """``search`` para várias consultas (uma matriz por bloco de ``chunk_size``)"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        results = []
+        with self._lock:
+            if not self.count or not len(vectors):
+                return [[] for _ in range(len(vectors))]
+            
+            k = min(k, self.count)
+            for offset in range(0, len(vectors), chunk_size):
+                scores = self.vectors[:self.count] @ vectors[offset:offset + chunk_size].T
+                top = np.argpartition(-scores, k - 1, axis=0)[:k]
+                for column in range(scores.shape[1]):
+                    rows = top[:, column]
+                    rows = rows[np.argsort(-scores[rows, column])]
+                    results.append([
+                        (int(row_id), float(score))
+                        for row_id, score in zip(self.ids[rows], scores[rows, column]) if score > min_score
+                    ])
+        return results
+    
+    def __len__(self):
+        return self.count
\ No newline at end of file
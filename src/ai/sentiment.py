@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Análise de Sentimento do JARVIS
+Léxico em português compilado para busca em dicionário/array, com cache e lote vetorizado
+
+O TextBlob (inglês, lento) continua disponível como caminho opcional.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from .response_cache import normalize_text
+
+try:
+    from textblob import TextBlob
+except ImportError:
+    TextBlob = None
+
+Sentiment = namedtuple('Sentiment', ['polarity', 'subjectivity'])
+
+NEUTRAL = Sentiment(0.0, 0.0)
+
+# Polaridade por palavra, na forma normalizada (minúsculas, sem acentos)
+PORTUGUESE_LEXICON = {
+    # Positivas
+    'bom': 0.6, 'boa': 0.6, 'bons': 0.6, 'boas': 0.6, 'otimo': 0.8, 'otima': 0.8, 'excelente': 0.9,
+    'maravilhoso': 0.9, 'maravilhosa': 0.9, 'incrivel': 0.8, 'perfeito': 0.9, 'perfeita': 0.9,
+    'fantastico': 0.9, 'fantastica': 0.9, 'legal': 0.5, 'bacana': 0.5, 'show': 0.6, 'top': 0.6,
+    'lindo': 0.7, 'linda': 0.7, 'bonito': 0.6, 'bonita': 0.6, 'feliz': 0.8, 'alegre': 0.7,
+    'contente': 0.7, 'satisfeito': 0.6, 'satisfeita': 0.6, 'gosto': 0.5, 'gostei': 0.6, 'gosta': 0.5,
+    'adoro': 0.8, 'adorei': 0.8, 'amo': 0.9, 'amei': 0.9, 'curto': 0.4, 'curti': 0.5,
+    'obrigado': 0.5, 'obrigada': 0.5, 'valeu': 0.4, 'parabens': 0.7, 'sucesso': 0.6,
+    'funcionou': 0.5, 'funciona': 0.3, 'rapido': 0.4, 'rapida': 0.4, 'eficiente': 0.6, 'util': 0.5,
+    'facil': 0.4, 'agradavel': 0.6, 'tranquilo': 0.4, 'tranquila': 0.4, 'calmo': 0.3, 'seguro': 0.3,
+    'melhor': 0.6, 'genial': 0.8, 'sensacional': 0.9, 'demais': 0.4, 'certo': 0.2, 'correto': 0.3,
+    'animado': 0.6, 'animada': 0.6, 'empolgado': 0.6, 'empolgada': 0.6, 'grato': 0.6, 'grata': 0.6,
+    'positivo': 0.4, 'positiva': 0.4, 'divertido': 0.6, 'divertida': 0.6, 'agradeco': 0.6,
+    'good': 0.6, 'great': 0.8, 'nice': 0.6, 'love': 0.8, 'thanks': 0.5, 'awesome': 0.9,
+    # Negativas
+    'ruim': -0.6, 'ruins': -0.6, 'pessimo': -0.9, 'pessima': -0.9, 'horrivel': -0.9, 'terrivel': -0.9,
+    'odeio': -0.9, 'odiei': -0.9, 'detesto': -0.8, 'detestei': -0.8, 'triste': -0.7, 'chateado': -0.6,
+    'chateada': -0.6, 'irritado': -0.7, 'irritada': -0.7, 'raiva': -0.8, 'bravo': -0.6, 'brava': -0.6,
+    'cansado': -0.4, 'cansada': -0.4, 'frustrado': -0.7, 'frustrada': -0.7, 'decepcionado': -0.7,
+    'decepcionada': -0.7, 'preocupado': -0.5, 'preocupada': -0.5, 'medo': -0.6, 'problema': -0.4,
+    'problemas': -0.4, 'erro': -0.5, 'erros': -0.5, 'falha': -0.6, 'falhou': -0.6, 'quebrado': -0.6,
+    'quebrou': -0.6, 'lento': -0.5, 'lenta': -0.5, 'travou': -0.6, 'travando': -0.6, 'bug': -0.5,
+    'chato': -0.5, 'chata': -0.5, 'dificil': -0.4, 'errado': -0.5, 'errada': -0.5, 'pior': -0.7,
+    'inutil': -0.7, 'lixo': -0.8, 'droga': -0.6, 'porcaria': -0.8, 'merda': -0.9, 'saco': -0.4,
+    'infelizmente': -0.4, 'infeliz': -0.7, 'mal': -0.5, 'negativo': -0.4, 'negativa': -0.4,
+    'perigo': -0.5, 'perigoso': -0.5, 'ataque': -0.5, 'invasao': -0.6, 'ameaca': -0.6,
+    'bad': -0.6, 'terrible': -0.9, 'hate': -0.9, 'awful': -0.9, 'wrong': -0.5
+}
+
+# Invertem a polaridade da próxima palavra de opinião (até NEGATION_SCOPE palavras adiante)
+NEGATIONS = {'nao', 'nunca', 'jamais', 'nem', 'nenhum', 'nenhuma', 'sem', 'not', 'never'}
+
+# Multiplicam a intensidade da próxima palavra
+MODIFIERS = {
+    'muito': 1.5, 'muita': 1.5, 'super': 1.6, 'bastante': 1.4, 'extremamente': 1.8, 'demais': 1.3,
+    'tao': 1.4, 'mega': 1.6, 'totalmente': 1.5, 'bem': 1.2, 'pouco': 0.5, 'meio': 0.6, 'quase': 0.6,
+    'very': 1.5, 'really': 1.4
+}
+
+NEGATION_SCOPE = 3
+
+class SentimentScorer:
+    """Polaridade e subjetividade por léxico
+    
+    O léxico é compilado num dicionário palavra → índice e num array de
+    polaridades. A polaridade é a média das palavras de opinião (uma
+    negação inverte a próxima delas e um intensificador multiplica a palavra
+    seguinte), limitada a [-1, 1]; a subjetividade é a fração de palavras
+    de opinião no texto (x2, limitada a 1). ``score`` guarda os resultados
+    num cache LRU; ``score_batch`` agrega muitos textos de uma vez com numpy.
+    
+    Com ``use_textblob=True`` (e o TextBlob instalado) ``score`` e
+    ``score_batch`` usam o TextBlob em vez do léxico.
+    """
+    
+    def __init__(self, lexicon=None, cache_size=4096, use_textblob=False):
+        lexicon = PORTUGUESE_LEXICON if lexicon is None else lexicon
+        self.index = {normalize_text(word): position for position, word in enumerate(lexicon)}
+        self.polarities = np.array(list(lexicon.values()), dtype=np.float32)
+        self._polarity_list = self.polarities.tolist()  # Textos isolados: soma em Python é mais rápida
+        self.use_textblob = use_textblob and TextBlob is not None
+        self.score = lru_cache(maxsize=cache_size)(self._score)
+    
+    def _opinions(self, words):
+        """Índices no léxico e multiplicadores das palavras de opinião"""
+        positions = []
+        multipliers = []
+        negated = 0
+        modifier = 1.0
+        for word in words:
+            if word in NEGATIONS:
+                negated = NEGATION_SCOPE
+                continue
+            if word in MODIFIERS and word not in self.index:
+                modifier = MODIFIERS[word]
+                continue
+            
+            position = self.index.get(word)
+            if position is not None:
+                positions.append(position)
+                multipliers.append(-modifier if negated else modifier)
+                negated = 0
+            elif negated:
+                negated -= 1
+            modifier = 1.0
+        return positions, multipliers
+    
+    def _score(self, text):
+        if self.use_textblob:
+            return self.score_textblob(text)
+        
+        words = normalize_text(text).split()
+        positions, multipliers = self._opinions(words)
+        if not positions:
+            return NEUTRAL
+        
+        total = sum(self._polarity_list[position] * multiplier for position, multiplier in zip(positions, multipliers))
+        polarity = max(-1.0, min(1.0, total / len(positions)))
+        subjectivity = min(1.0, 2.0 * len(positions) / len(words))
+        return Sentiment(polarity, subjectivity)
+    
+    def score_batch(self, texts):
+        """Pontua vários textos; retorna arrays (polaridades, subjetividades)
+        
+        Com o TextBlob ativo não há caminho vetorizado: cada texto passa por
+        ``score`` (e pelo cache), só o resultado sai no mesmo formato.
+        """
+        if self.use_textblob:
+            results = [self.score(text) for text in texts]
+            polarities = np.array([result.polarity for result in results], dtype=np.float64)
+            subjectivities = np.array([result.subjectivity for result in results], dtype=np.float64)
+            return polarities, subjectivities
+        
+        text_ids = []
+        positions = []
+        multipliers = []
+        lengths = np.zeros(len(texts), dtype=np.float32)
+        for text_id, text in enumerate(texts):
+            words = normalize_text(text).split()
+            lengths[text_id] = len(words)
+            text_positions, text_multipliers = self._opinions(words)
+            positions.extend(text_positions)
+            multipliers.extend(text_multipliers)
+            text_ids.extend([text_id] * len(text_positions))
+        
+        weights = self.polarities[np.asarray(positions, dtype=np.intp)] * np.asarray(multipliers, dtype=np.float32)
+        totals = np.bincount(np.asarray(text_ids, dtype=np.intp), weights, minlength=len(texts))
+        counts = np.bincount(np.asarray(text_ids, dtype=np.intp), minlength=len(texts))
+        
+        polarities = np.clip(totals / np.maximum(counts, 1), -1.0, 1.0)
+        subjectivities = np.minimum(1.0, 2.0 * counts / np.maximum(lengths, 1))
+        return polarities, subjectivities
+    
+    @staticmethod
+    def score_textblob(text):
+        """Caminho lento: TextBlob (requer o pacote textblob)"""
+        if TextBlob is None:
+            raise ImportError("textblob não está instalado")
+        sentiment = TextBlob(text).sentiment
+        return Sentiment(sentiment.polarity, sentiment.subjectivity)
+    
+    def cache_info(self):
+        """Acertos e tamanho do cache LRU"""
+        return self.score.cache_info()
\ No newline at end of file
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Coalescência de Requisições do JARVIS
+Requisições idênticas simultâneas compartilham uma única execução
+"""
+
+import threading
+
+class _Call:
+    """Execução em andamento de uma chave"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Agrupa chamadas concorrentes com a mesma chave
+    
+    A primeira chamada para uma chave executa a função; as que chegam
+    enquanto ela está em andamento apenas esperam e recebem o mesmo
+    resultado (ou a mesma exceção). Nada fica guardado depois: terminada a
+    execução, a próxima chamada executa de novo (cache é outro assunto).
+    """
+    
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        
+        self.executions = 0
+        self.shared = 0
+    
+    def do(self, key, fn, *args, **kwargs):
+        """Executa ``fn`` uma vez por chave em andamento
+        
+        Retorna ``(resultado, compartilhado)``: ``compartilhado`` é True para
+        quem recebeu o resultado de uma execução iniciada por outra chamada.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        
+        return call.result, False
+    
+    def in_flight(self):
+        """Número de chaves em execução"""
+        with self._lock:
+            return len(self._calls)
+    
+    def get_stats(self):
+        """Métricas de coalescência"""
+        with self._lock:
+            total = self.executions + self.shared
+            return {
+                'executions': self.executions,
+                'shared': self.shared,
+                'in_flight': len(self._calls),
+                'shared_rate': self.shared / total if total else 0.0
+            }
\ No newline at end of file
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Captura de Áudio do JARVIS
+Captura em modo callback do PyAudio para um buffer circular pré-alocado
+"""
+
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+import numpy as np
+from core.logger import JarvisLogger
+
+try:
+    import pyaudio
+except ImportError:  # Só a captura de microfone precisa; WavFileSource funciona sem
+    pyaudio = None
+
+class AudioRingBuffer:
+    """Buffer circular pré-alocado de frames de áudio int16
+    
+    Cada frame ocupa uma linha fixa de uma matriz numpy alocada uma única vez.
+    Os consumidores recebem memoryviews dessas linhas, sem cópia; uma view
+    continua válida até o escritor dar a volta no buffer (``capacity`` frames).
+    """
+    
+    def __init__(self, frame_size, capacity=64, channels=1):
+        self.frame_size = frame_size
+        self.channels = channels
+        self.capacity = capacity
+        self.frame_bytes = frame_size * channels * 2
+        
+        self._frames = np.zeros((capacity, frame_size * channels), dtype=np.int16)
+        # Views criadas uma única vez: escrita em bytes, leitura em amostras
+        self._byte_views = [memoryview(self._frames[i]).cast('B') for i in range(capacity)]
+        self._sample_views = [memoryview(self._frames[i]) for i in range(capacity)]
+        
+        self._write_seq = 0
+        self._condition = threading.Condition()
+        self.overruns = 0
+    
+    @property
+    def write_seq(self):
+        """Sequência do próximo frame a ser escrito"""
+        return self._write_seq
+    
+    def write(self, data):
+        """Copia um chunk de bytes para o próximo slot (chamado pelo callback)"""
+        slot = self._write_seq % self.capacity
+        size = len(data)
+        
+        if size >= self.frame_bytes:
+            self._byte_views[slot][:] = data[:self.frame_bytes] if size > self.frame_bytes else data
+        else:
+            # Chunk parcial (fim de stream): completar com silêncio
+            self._byte_views[slot][:size] = data
+            self._frames[slot, size // 2:] = 0
+        
+        with self._condition:
+            self._write_seq += 1
+            self._condition.notify_all()
+    
+    def read(self, seq, timeout=None):
+        """Retorna (seq, memoryview) do frame ``seq``
+        
+        Bloqueia até o frame estar disponível. Se o leitor ficou para trás e o
+        frame já foi sobrescrito, salta para o frame mais antigo ainda válido.
+        Retorna None em caso de timeout.
+        """
+        with self._condition:
+            if seq >= self._write_seq:
+                self._condition.wait_for(lambda: seq < self._write_seq, timeout)
+                if seq >= self._write_seq:
+                    return None
+            
+            # O slot de write_seq - capacity pode estar sendo reescrito agora
+            oldest = self._write_seq - self.capacity + 1
+            if seq < oldest:
+                self.overruns += oldest - seq
+                seq = oldest
+        
+        return seq, self._sample_views[seq % self.capacity]
+    
+    def view(self, seq):
+        """Retorna a memoryview de um frame ainda presente no buffer"""
+        return self._sample_views[seq % self.capacity]
+    
+    def oldest_seq(self):
+        """Sequência do frame mais antigo ainda válido"""
+        return max(0, self._write_seq - self.capacity + 1)
+    
+    def clear(self):
+        """Reinicia o buffer"""
+        with self._condition:
+            self._write_seq = 0
+            self.overruns = 0
+
+class AudioSource(ABC):
+    """Fonte de áudio que alimenta o buffer circular do pipeline de voz
+    
+    Subclasses produzem chunks de ``chunk_size`` amostras int16 e os escrevem
+    em ``self.ring``; o restante do pipeline (VAD, endpointing e ASR) não sabe
+    se o áudio vem do microfone ou de um arquivo. Uma subclasse sem
+    ``is_active``, ``start`` ou ``stop`` não pode ser instanciada.
+    """
+    
+    def __init__(self, sample_rate=16000, chunk_size=1024, channels=1, capacity=64):
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.channels = channels
+        self.logger = JarvisLogger(__name__)
+        
+        self.ring = AudioRingBuffer(chunk_size, capacity, channels)
+    
+    @property
+    @abstractmethod
+    def is_active(self):
+        """Indica se a fonte está produzindo áudio"""
+    
+    @abstractmethod
+    def start(self):
+        """Inicia a produção de áudio"""
+    
+    @abstractmethod
+    def stop(self):
+        """Interrompe a produção de áudio"""
+
+class AudioCapture(AudioSource):
+    """Captura de microfone em modo callback do PyAudio"""
+    
+    def __init__(self, sample_rate=16000, chunk_size=1024, channels=1,
+                 device_index=None, capacity=64):
+        if pyaudio is None:
+            raise ImportError("pyaudio não está instalado (necessário para captura do microfone)")
+        super().__init__(sample_rate, chunk_size, channels, capacity)
+        self.device_index = device_index
+        
+        self._pyaudio = None
+        self._stream = None
+        # Tupla de retorno do callback alocada uma única vez
+        self._continue = (None, pyaudio.paContinue)
+    
+    @property
+    def is_active(self):
+        """Indica se o stream está capturando"""
+        return self._stream is not None and self._stream.is_active()
+    
+    def start(self):
+        """Abre o stream de captura"""
+        if self._stream is not None:
+            return
+        
+        self._pyaudio = pyaudio.PyAudio()
+        self._stream = self._pyaudio.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.sample_rate,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.chunk_size,
+            stream_callback=self._callback
+        )
+        self._stream.start_stream()
+        self.logger.voice("Captura de áudio iniciada (modo callback)")
+    
+    def stop(self):
+        """Fecha o stream de captura"""
+        if self._stream is not None:
+            try:
+                self._stream.stop_stream()
+                self._stream.close()
+            except Exception as e:
+                self.logger.error(f"Erro ao fechar stream de captura: {e}")
+            self._stream = None
+        
+        if self._pyaudio is not None:
+            self._pyaudio.terminate()
+            self._pyaudio = None
+    
+    def _callback(self, in_data, frame_count, time_info, status):
+        """Callback do PyAudio: grava o chunk no buffer circular"""
+        self.ring.write(in_data)
+        return self._continue
+
+class WavFileSource(AudioSource):
+    """Reproduz um arquivo WAV (ou PCM bruto) no pipeline de voz
+    
+    O áudio é escrito no buffer circular no ritmo real (``speed=1``) ou
+    acelerado (``speed>1``). ``tail_silence`` acrescenta silêncio ao final
+    para que a última frase seja encerrada pelo endpointing.
+    """
+    
+    def __init__(self, path, sample_rate=16000, chunk_size=1024, channels=1,
+                 capacity=64, speed=1.0, tail_silence=1.0, raw_pcm=False):
+        super().__init__(sample_rate, chunk_size, channels, capacity)
+        self.path = path
+        self.speed = max(0.01, speed)
+        self.tail_silence = tail_silence
+        
+        self.pcm = self._load(path, raw_pcm)
+        self.duration = len(self.pcm) / (2 * channels * sample_rate)
+        
+        self.started_at = None
+        self.finished = threading.Event()
+        self._thread = None
+        self._running = False
+    
+    def _load(self, path, raw_pcm):
+        """Carrega o áudio validando o formato esperado pelo pipeline"""
+        if raw_pcm:
+            with open(path, 'rb') as f:
+                return f.read()
+        
+        with wave.open(str(path), 'rb') as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError(f"{path}: apenas PCM de 16 bits é suportado")
+            if wav.getframerate() != self.sample_rate or wav.getnchannels() != self.channels:
+                raise ValueError(
+                    f"{path}: esperado {self.sample_rate} Hz/{self.channels} canal(is), "
+                    f"encontrado {wav.getframerate()} Hz/{wav.getnchannels()} canal(is)"
+                )
+            return wav.readframes(wav.getnframes())
+    
+    @property
+    def is_active(self):
+        """Indica se a reprodução está em andamento"""
+        return self._running and not self.finished.is_set()
+    
+    def start(self):
+        """Inicia a reprodução em thread própria"""
+        if self._running:
+            return
+        
+        self._running = True
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._replay, name='wav-replay')
+        self._thread.daemon = True
+        self._thread.start()
+        self.logger.voice(f"Reproduzindo '{self.path}' ({self.duration:.1f}s, {self.speed}x)")
+    
+    def stop(self):
+        """Interrompe a reprodução"""
+        self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+    
+    def wall_time(self, audio_seconds):
+        """Converte uma posição no áudio para o instante real em que foi escrita"""
+        if self.started_at is None:
+            return None
+        return self.started_at + audio_seconds / self.speed
+    
+    def _replay(self):
+        """Escreve os chunks no buffer respeitando o ritmo configurado"""
+        chunk_bytes = self.ring.frame_bytes
+        chunk_duration = self.chunk_size / self.sample_rate / self.speed
+        silence = bytes(chunk_bytes)
+        tail_chunks = int(self.tail_silence * self.sample_rate / self.chunk_size)
+        
+        pcm = memoryview(self.pcm)
+        offsets = range(0, len(pcm), chunk_bytes)
+        
+        self.started_at = time.time()
+        deadline = self.started_at
+        
+        try:
+            for index in range(len(offsets) + tail_chunks):
+                if not self._running:
+                    break
+                
+                # Cada chunk só fica disponível após sua duração (como um microfone)
+                deadline += chunk_duration
+                delay = deadline - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                
+                if index < len(offsets):
+                    offset = offsets[index]
+                    self.ring.write(pcm[offset:offset + chunk_bytes])
+                else:
+                    self.ring.write(silence)
+        finally:
+            self._running = False
+            self.finished.set()
+
+class PhraseDetector:
+    """Detector de voz por energia e endpointing sobre frames do buffer circular
+    
+    Segue os mesmos parâmetros do ``speech_recognition.Recognizer``: limiar de
+    energia (RMS), pausa que encerra a frase, tempo de pré-fala preservado e
+    duração máxima da frase. A frase é montada num buffer pré-alocado.
+    """
+    
+    def __init__(self, ring, sample_rate=16000, energy_threshold=300,
+                 pause_threshold=0.8, non_speaking_duration=0.5,
+                 phrase_time_limit=5):
+        self.ring = ring
+        self.sample_rate = sample_rate
+        self.energy_threshold = energy_threshold
+        
+        frame_duration = ring.frame_size / sample_rate
+        self.pause_frames = max(1, int(round(pause_threshold / frame_duration)))
+        self.preroll_frames = min(ring.capacity // 2, int(round(non_speaking_duration / frame_duration)))
+        self.max_frames = max(1, int(round(phrase_time_limit / frame_duration)))
+        
+        frame_samples = ring.frame_size * ring.channels
+        self._phrase = np.zeros((self.max_frames + self.preroll_frames) * frame_samples, dtype=np.int16)
+        self._scratch = np.zeros(frame_samples, dtype=np.float32)
+        self._frame_samples = frame_samples
+        
+        self.in_speech = False
+        self.last_energy = 0.0
+        self._length = 0
+        self._speech_frames = 0
+        self._silent_frames = 0
+    
+    def frame_energy(self, frame):
+        """RMS do frame sem alocar arrays temporários"""
+        np.copyto(self._scratch, np.asarray(frame))
+        return float(np.sqrt(np.dot(self._scratch, self._scratch) / self._scratch.size))
+    
+    def process(self, seq, frame):
+        """Processa um frame; retorna memoryview da frase quando ela termina"""
+        energy = self.frame_energy(frame)
+        self.last_energy = energy
+        is_speech = energy > self.energy_threshold
+        
+        if not self.in_speech:
+            if not is_speech:
+                return None
+            # Início de fala: recuperar a pré-fala ainda presente no buffer
+            self.in_speech = True
+            self._length = 0
+            self._speech_frames = 0
+            self._silent_frames = 0
+            for preroll_seq in range(max(self.ring.oldest_seq(), seq - self.preroll_frames), seq):
+                self._append(self.ring.view(preroll_seq))
+        
+        self._append(frame)
+        self._speech_frames += 1
+        self._silent_frames = 0 if is_speech else self._silent_frames + 1
+        
+        if self._silent_frames >= self.pause_frames or self._speech_frames >= self.max_frames:
+            return self._finish()
+        return None
+    
+    def current_audio(self):
+        """View das amostras da frase em andamento (pré-fala incluída)"""
+        return memoryview(self._phrase)[:self._length]
+    
+    def reset(self):
+        """Descarta a frase em andamento"""
+        self.in_speech = False
+        self._length = 0
+    
+    def _append(self, frame):
+        """Copia um frame para o buffer da frase"""
+        end = self._length + self._frame_samples
+        if end > self._phrase.size:
+            return
+        self._phrase[self._length:end] = frame
+        self._length = end
+    
+    def _finish(self):
+        """Encerra a frase atual e retorna a view correspondente"""
+        self.in_speech = False
+        # Remover o silêncio final, mantendo o mesmo padrão do speech_recognition
+        trailing = max(0, self._silent_frames - 1) * self._frame_samples
+        length = self._length - trailing
+        self._length = 0
+        return memoryview(self._phrase)[:length]
\ No newline at end of file
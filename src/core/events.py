@@ -93,6 +93,7 @@ class Events:
     # Eventos de voz
     WAKE_WORD_DETECTED = 'wake_word_detected'
     VOICE_COMMAND = 'voice_command'
+    VOICE_PARTIAL = 'voice_partial'
     VOICE_RESPONSE = 'voice_response'
     
     # Eventos do sistema
@@ -103,6 +104,7 @@ class Events:
     # Eventos de IA
     AI_THINKING = 'ai_thinking'
     AI_RESPONSE = 'ai_response'
+    AI_RESPONSE_CHUNK = 'ai_response_chunk'
     AI_ERROR = 'ai_error'
     
     # Eventos de automação
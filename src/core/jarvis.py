@@ -48,6 +48,7 @@ class JARVIS:
         """Configura handlers para eventos do sistema"""
         self.event_manager.subscribe(Events.WAKE_WORD_DETECTED, self._on_wake_word)
         self.event_manager.subscribe(Events.AI_RESPONSE, self._on_ai_response)
+        self.event_manager.subscribe(Events.AI_RESPONSE_CHUNK, self._on_ai_response_chunk)
         self.event_manager.subscribe(Events.SYSTEM_ERROR, self._on_system_error)
         self.event_manager.subscribe(Events.AUTOMATION_TRIGGERED, self._on_automation_triggered)
     
@@ -165,14 +166,10 @@ class JARVIS:
         self.logger.voice("Wake word detectado - JARVIS ativado!")
         
         if self.voice_synthesizer:
-            responses = [
-                "Sim, senhor?",
-                "Como posso ajudá-lo?",
-                "Às suas ordens.",
-                "Ouvindo."
-            ]
+            responses = self.voice_synthesizer.WAKE_RESPONSES
             response = responses[hash(str(time.time())) % len(responses)]
-            self.voice_synthesizer.speak(response)
+            # Confirmação tem precedência sobre respostas longas e perde o sentido em segundos
+            self.voice_synthesizer.speak(response, priority=self.voice_synthesizer.PRIORITY_HIGH, ttl=3)
     
     def _on_ai_response(self, data):
         """Handler para resposta da IA"""
@@ -182,9 +179,12 @@ class JARVIS:
         response_text = data['text']
         self.logger.ai(f"Resposta gerada: '{response_text}'")
         
-        # Falar resposta
+        # Falar resposta (em streaming, as frases já estão sendo faladas)
         if self.voice_synthesizer:
-            self.voice_synthesizer.speak(response_text)
+            if data.get('streamed'):
+                self.voice_synthesizer.finish_stream(data['stream_id'], data['chunks'])
+            else:
+                self.voice_synthesizer.speak(response_text)
         
         # Log da interação
         self.event_manager.emit(Events.USER_INTERACTION, {
@@ -193,6 +193,11 @@ class JARVIS:
             'timestamp': time.time()
         })
     
+    def _on_ai_response_chunk(self, data):
+        """Handler para trechos de resposta da IA em streaming"""
+        if self.voice_synthesizer and data:
+            self.voice_synthesizer.feed_stream(data['stream_id'], data['index'], data['text'])
+    
     def _on_system_error(self, data):
         """Handler para erros do sistema"""
         error_msg = data.get('error', 'Erro desconhecido') if data else 'Erro desconhecido'
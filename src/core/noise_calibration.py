@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Calibração Adaptativa de Ruído do JARVIS
+Acompanha o piso de ruído continuamente a partir dos frames de áudio
+"""
+
+import json
+import os
+import time
+import logging
+
+DEFAULT_CALIBRATION_PATH = "data/audio_calibration.json"
+
+def load_calibration(path=DEFAULT_CALIBRATION_PATH):
+    """Carrega a última calibração salva (ou None)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if float(data.get('energy_threshold', 0)) > 0:
+            return data
+    except FileNotFoundError:
+        pass
+    except (ValueError, TypeError, json.JSONDecodeError) as e:
+        logging.getLogger(__name__).warning(f"Calibração inválida em {path}: {e}")
+    return None
+
+def save_calibration(path, energy_threshold, noise_floor=None):
+    """Salva a calibração atual"""
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'energy_threshold': round(float(energy_threshold), 2),
+                'noise_floor': round(float(noise_floor), 2) if noise_floor is not None else None,
+                'updated_at': time.time()
+            }, f, indent=2)
+        return True
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Erro ao salvar calibração: {e}")
+        return False
+
+class NoiseFloorTracker:
+    """Estimador contínuo do piso de ruído por estatística de mínimos
+    
+    A energia de cada frame é suavizada por média exponencial e o piso de
+    ruído é o mínimo dessa energia numa janela deslizante (dois blocos de
+    ``window`` segundos). Assim o limiar acompanha mudanças no ambiente mesmo
+    durante fala contínua, sem nenhuma calibração bloqueante. O limiar de
+    fala é ``noise_floor * ratio``, nunca abaixo de ``min_threshold``.
+    """
+    
+    def __init__(self, frame_duration, path=DEFAULT_CALIBRATION_PATH,
+                 initial_threshold=300, ratio=2.0, min_threshold=100,
+                 window=3.0, smoothing=0.2, persist_interval=30.0):
+        self.path = path
+        self.ratio = ratio
+        self.min_threshold = min_threshold
+        self.smoothing = smoothing
+        self.persist_interval = persist_interval
+        
+        self.block_frames = max(1, int(round(window / frame_duration)))
+        
+        self.energy_threshold = float(initial_threshold)
+        self.noise_floor = self.energy_threshold / ratio
+        self.loaded = False
+        
+        saved = load_calibration(path) if path else None
+        if saved:
+            self.energy_threshold = float(saved['energy_threshold'])
+            self.noise_floor = float(saved.get('noise_floor') or self.energy_threshold / ratio)
+            self.loaded = True
+        
+        self._smoothed = None
+        self._block_min = float('inf')
+        self._previous_min = float('inf')
+        self._block_count = 0
+        self._last_persist = time.time()
+        self._persisted_threshold = self.energy_threshold
+    
+    def update(self, energy):
+        """Atualiza o estimador com a energia (RMS) de um frame
+        
+        Retorna o limiar de energia atualizado.
+        """
+        if self._smoothed is None:
+            self._smoothed = energy
+        else:
+            self._smoothed += self.smoothing * (energy - self._smoothed)
+        
+        if self._smoothed < self._block_min:
+            self._block_min = self._smoothed
+        
+        self._block_count += 1
+        if self._block_count >= self.block_frames:
+            self._previous_min = self._block_min
+            self._block_min = float('inf')
+            self._block_count = 0
+        
+        floor = min(self._block_min, self._previous_min)
+        threshold = max(self.min_threshold, floor * self.ratio)
+        if self._previous_min == float('inf'):
+            # Antes da primeira janela completa, o limiar só pode descer:
+            # fala logo no início não deve inflar o valor carregado
+            if threshold < self.energy_threshold:
+                self.noise_floor = floor
+                self.energy_threshold = threshold
+        else:
+            self.noise_floor = floor
+            self.energy_threshold = threshold
+        
+        if self.path and time.time() - self._last_persist >= self.persist_interval:
+            self.persist()
+        
+        return self.energy_threshold
+    
+    def persist(self, force=False):
+        """Salva a calibração se ela mudou de forma relevante"""
+        self._last_persist = time.time()
+        changed = abs(self.energy_threshold - self._persisted_threshold) > 0.05 * self._persisted_threshold
+        if self.path and (force or changed):
+            if save_calibration(self.path, self.energy_threshold, self.noise_floor):
+                self._persisted_threshold = self.energy_threshold
\ No newline at end of file
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache de Áudio Sintetizado do JARVIS
+Guarda o PCM renderizado de frases repetidas em memória (LRU) e em disco
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import uuid
+import wave
+from collections import OrderedDict
+
+class RenderedAudio:
+    """Áudio PCM renderizado pronto para reprodução"""
+    
+    def __init__(self, pcm, sample_rate, channels=1, sample_width=2):
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+    
+    @property
+    def duration(self):
+        """Duração em segundos"""
+        return len(self.pcm) / (self.sample_rate * self.channels * self.sample_width)
+    
+    @classmethod
+    def from_wav(cls, path):
+        """Carrega um arquivo WAV"""
+        with wave.open(str(path), 'rb') as wav:
+            return cls(
+                wav.readframes(wav.getnframes()),
+                wav.getframerate(),
+                wav.getnchannels(),
+                wav.getsampwidth()
+            )
+    
+    def to_wav(self, path):
+        """Salva como arquivo WAV"""
+        with wave.open(str(path), 'wb') as wav:
+            wav.setnchannels(self.channels)
+            wav.setsampwidth(self.sample_width)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(self.pcm)
+
+class RenderedAudioCache:
+    """Cache LRU em memória com persistência em disco
+    
+    As entradas são indexadas por texto, voz, velocidade e volume; o limite de
+    memória é em bytes de PCM. Entradas removidas da memória continuam em disco
+    e voltam para a memória no próximo acesso.
+    """
+    
+    def __init__(self, cache_dir="data/tts_cache", max_memory_bytes=32 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.logger = logging.getLogger(__name__)
+        
+        self._entries = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def make_key(text, voice, rate, volume):
+        """Chave estável para uma renderização"""
+        raw = f"{text}\x1f{voice}\x1f{rate}\x1f{volume:.3f}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.wav")
+    
+    def get(self, key):
+        """Retorna o áudio em cache (memória ou disco) ou None"""
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return audio
+        
+        if self.cache_dir and os.path.exists(self._path(key)):
+            try:
+                audio = RenderedAudio.from_wav(self._path(key))
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, audio)
+                return audio
+            except Exception as e:
+                self.logger.error(f"Entrada de cache de voz corrompida ({key[:8]}): {e}")
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def contains(self, key):
+        """Indica se a chave está em memória ou em disco"""
+        with self._lock:
+            if key in self._entries:
+                return True
+        return bool(self.cache_dir) and os.path.exists(self._path(key))
+    
+    def put(self, key, audio):
+        """Armazena o áudio em memória e em disco"""
+        self._remember(key, audio)
+        
+        if self.cache_dir:
+            # Escrita atômica: arquivo temporário e rename
+            tmp_path = os.path.join(self.cache_dir, f".{key}.{uuid.uuid4().hex}.tmp")
+            try:
+                audio.to_wav(tmp_path)
+                os.replace(tmp_path, self._path(key))
+            except Exception as e:
+                self.logger.error(f"Erro ao gravar cache de voz: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+    
+    def _remember(self, key, audio):
+        """Insere em memória respeitando o limite de bytes"""
+        size = len(audio.pcm)
+        if size > self.max_memory_bytes:
+            return
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous.pcm)
+            
+            self._entries[key] = audio
+            self._memory_bytes += size
+            
+            while self._memory_bytes > self.max_memory_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_bytes -= len(evicted.pcm)
+    
+    def get_stats(self):
+        """Estatísticas do cache"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'memory_bytes': self._memory_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
\ No newline at end of file
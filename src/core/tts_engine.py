@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Engine de Fala Compartilhado do JARVIS
+Workers de síntese pré-aquecidos e um único dono do dispositivo de reprodução
+
+Usado tanto pelo VoiceSynthesizer do núcleo quanto pela interface Qt, então
+não depende de ``core.*`` (apenas imports relativos e ``logging``).
+"""
+
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import pyaudio
+except ImportError:  # Só a reprodução de buffers precisa; a fala direta usa apenas o pyttsx3
+    pyaudio = None
+
+from .tts_cache import RenderedAudio
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?…;])\s+')
+CLAUSE_BOUNDARY = re.compile(r'(?<=[,:—])\s+')
+
+def _pack_parts(parts, first_limit, limit):
+    """Agrupa partes consecutivas em trechos de até ``limit`` caracteres"""
+    chunks = []
+    current = ""
+    
+    for part in parts:
+        cap = first_limit if not chunks else limit
+        candidate = f"{current} {part}" if current else part
+        if current and len(candidate) > cap:
+            chunks.append(current)
+            current = part
+        else:
+            current = candidate
+    
+    if current:
+        chunks.append(current)
+    return chunks
+
+def split_speech_chunks(text, max_chars=200, first_chunk_chars=80, min_chars=12):
+    """Divide o texto em trechos para síntese incremental
+    
+    Usa frases inteiras sempre que possível; frases longas são quebradas em
+    orações e, em último caso, entre palavras. O primeiro trecho é mais curto
+    para reduzir o tempo até o primeiro áudio.
+    """
+    sentences = [s.strip() for s in SENTENCE_BOUNDARY.split(text.strip()) if s.strip()]
+    
+    # Reagrupar fragmentos curtos (abreviações como "Sr.", enumerações)
+    merged = []
+    for sentence in sentences:
+        if merged and len(merged[-1]) < min_chars:
+            merged[-1] = f"{merged[-1]} {sentence}"
+        else:
+            merged.append(sentence)
+    
+    chunks = []
+    for sentence in merged:
+        cap = first_chunk_chars if not chunks else max_chars
+        if len(sentence) <= cap:
+            chunks.append(sentence)
+            continue
+        
+        parts = []
+        for clause in CLAUSE_BOUNDARY.split(sentence):
+            parts.extend(clause.split() if len(clause) > max_chars else [clause])
+        chunks.extend(_pack_parts(parts, cap, max_chars))
+    
+    return chunks
+
+# Engine pyttsx3 de cada processo worker (criado uma vez, no initializer)
+_worker_engine = None
+_worker_properties = {}
+
+def _apply_properties(engine, applied, rate, volume, voice):
+    """Aplica apenas as propriedades que mudaram desde a última renderização"""
+    for name, value in (('rate', rate), ('volume', volume), ('voice', voice)):
+        if value is not None and applied.get(name) != value:
+            engine.setProperty(name, value)
+            applied[name] = value
+
+def _render_with(engine, applied, text, rate, volume, voice, render_dir):
+    """Renderiza o texto para PCM com um engine pyttsx3"""
+    _apply_properties(engine, applied, rate, volume, voice)
+    tmp_path = os.path.join(render_dir, f".render-{os.getpid()}-{uuid.uuid4().hex}.wav")
+    
+    try:
+        engine.save_to_file(text, tmp_path)
+        engine.runAndWait()
+        return RenderedAudio.from_wav(tmp_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _describe_voices(engine):
+    """Lista as vozes do engine em formato serializável"""
+    return [
+        {
+            'id': voice.id,
+            'name': voice.name,
+            'languages': list(voice.languages or []),
+            'gender': getattr(voice, 'gender', 'unknown')
+        }
+        for voice in engine.getProperty('voices') or []
+    ]
+
+def _init_worker(rate, volume, voice):
+    """Initializer do worker: cria e configura o engine uma única vez"""
+    global _worker_engine
+    import pyttsx3  # Importado no processo worker, que é quem usa o engine
+    _worker_engine = pyttsx3.init()
+    _apply_properties(_worker_engine, _worker_properties, rate, volume, voice)
+
+def _ping_worker():
+    """Tarefa vazia usada para pré-aquecer os workers"""
+    return os.getpid()
+
+def _render_in_worker(text, rate, volume, voice, render_dir):
+    return _render_with(_worker_engine, _worker_properties, text, rate, volume, voice, render_dir)
+
+def _voices_in_worker():
+    return _describe_voices(_worker_engine)
+
+class PlaybackDevice:
+    """Dono único do dispositivo de saída de áudio
+    
+    Serializa a reprodução entre todos os clientes. O stream fica aberto
+    entre buffers do mesmo formato e a interrupção acontece na fronteira de
+    um bloco de ``chunk_frames`` amostras. Sem o PyAudio, ``available`` é
+    False e ``play`` levanta ImportError.
+    """
+    
+    def __init__(self, output_device=None, chunk_frames=1024):
+        self.output_device = output_device
+        self.chunk_frames = chunk_frames
+        self.logger = logging.getLogger(__name__)
+        
+        self._pyaudio = None
+        self._stream = None
+        self._stream_format = None
+        self._lock = threading.Lock()
+        self._current_cancel = None
+    
+    @property
+    def available(self):
+        """Indica se há como reproduzir buffers (PyAudio instalado)"""
+        return pyaudio is not None
+    
+    def _stream_for(self, audio):
+        """Retorna um stream aberto no formato do áudio"""
+        audio_format = (audio.sample_rate, audio.channels, audio.sample_width)
+        if self._stream is not None and audio_format != self._stream_format:
+            self._close_stream()
+        
+        if self._stream is None:
+            if pyaudio is None:
+                raise ImportError("pyaudio não está instalado (necessário para reproduzir áudio renderizado)")
+            if self._pyaudio is None:
+                self._pyaudio = pyaudio.PyAudio()
+            self._stream = self._pyaudio.open(
+                format=self._pyaudio.get_format_from_width(audio.sample_width),
+                channels=audio.channels,
+                rate=audio.sample_rate,
+                output=True,
+                output_device_index=self.output_device
+            )
+            self._stream_format = audio_format
+        return self._stream
+    
+    def _close_stream(self):
+        if self._stream is not None:
+            try:
+                self._stream.stop_stream()
+                self._stream.close()
+            except Exception as e:
+                self.logger.warning(f"Erro ao fechar stream de saída: {e}")
+            self._stream = None
+            self._stream_format = None
+    
+    def play(self, audio, cancel=None):
+        """Reproduz o buffer (bloqueante)
+        
+        Retorna True se tocou até o fim, False se foi cancelado.
+        """
+        cancel = cancel or threading.Event()
+        
+        with self._lock:
+            self._current_cancel = cancel
+            try:
+                stream = self._stream_for(audio)
+                step = self.chunk_frames * audio.sample_width * audio.channels
+                pcm = memoryview(audio.pcm)
+                for offset in range(0, len(pcm), step):
+                    if cancel.is_set():
+                        return False
+                    stream.write(bytes(pcm[offset:offset + step]))
+                return True
+            finally:
+                self._current_cancel = None
+    
+    def cancel(self):
+        """Interrompe a reprodução em andamento (no próximo bloco)"""
+        cancel = self._current_cancel
+        if cancel is not None:
+            cancel.set()
+    
+    def close(self):
+        """Libera o dispositivo"""
+        self.cancel()
+        with self._lock:
+            self._close_stream()
+            if self._pyaudio is not None:
+                self._pyaudio.terminate()
+                self._pyaudio = None
+
+class SpeechEngine:
+    """Engine de fala compartilhado (singleton por processo)
+    
+    A síntese roda num pool de processos, cada um com seu próprio engine
+    pyttsx3 criado uma vez e pré-aquecido na partida; assim renderizações
+    acontecem em paralelo e enquanto outro trecho toca. Com ``workers=0`` (ou
+    se o pool não puder ser criado) um único engine local renderiza numa
+    thread. A reprodução passa sempre pelo mesmo PlaybackDevice.
+    """
+    
+    _instance = None
+    _lock = threading.Lock()
+    
+    @classmethod
+    def get_instance(cls, workers=2, output_device=None, rate=None, volume=None, voice=None):
+        """Retorna a instância compartilhada, criando-a na primeira chamada"""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls(workers, output_device, rate, volume, voice)
+            return cls._instance
+    
+    def __init__(self, workers=2, output_device=None, rate=None, volume=None, voice=None):
+        self.logger = logging.getLogger(__name__)
+        self.workers = workers
+        self.defaults = (rate, volume, voice)
+        self.playback = PlaybackDevice(output_device)
+        self.render_dir = os.path.join(tempfile.gettempdir(), "jarvis_tts")
+        os.makedirs(self.render_dir, exist_ok=True)
+        
+        # Engine local: modo sem processos e fala direta (fallback)
+        self._local_engine = None
+        self._local_properties = {}
+        self._local_lock = threading.Lock()
+        self._saying = False
+        
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._render_fn = None
+        if workers > 0:
+            self._start_process_pool()
+        if self._pool is None:
+            self._start_local_pool()
+    
+    def _start_process_pool(self):
+        """Cria o pool de processos e pré-aquece todos os workers"""
+        try:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=self.defaults
+            )
+            # Uma tarefa por worker força a criação de todos os processos
+            # (e de seus engines) em segundo plano
+            for _ in range(self.workers):
+                self._pool.submit(_ping_worker)
+            self._render_fn = _render_in_worker
+            self.logger.info(f"Engine de fala com {self.workers} workers de síntese")
+        except Exception as e:
+            self.logger.warning(f"Pool de síntese indisponível, usando engine local: {e}")
+            self._pool = None
+    
+    def _start_local_pool(self):
+        """Renderização por um único engine local numa thread"""
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="TTSRender")
+        self._render_fn = self._render_local
+    
+    def _get_local_engine(self):
+        if self._local_engine is None:
+            import pyttsx3
+            self._local_engine = pyttsx3.init()
+        return self._local_engine
+    
+    def _render_local(self, text, rate, volume, voice, render_dir):
+        with self._local_lock:
+            return _render_with(self._get_local_engine(), self._local_properties,
+                                text, rate, volume, voice, render_dir)
+    
+    def _fallback_to_local(self, error):
+        """Troca o pool de processos quebrado pelo engine local"""
+        with self._pool_lock:
+            if self._render_fn is not self._render_local:
+                self.logger.error(f"Pool de síntese falhou, usando engine local: {error}")
+                if self._pool is not None:
+                    # Encerrar os workers restantes do pool quebrado
+                    self._pool.shutdown(wait=False, cancel_futures=True)
+                self._start_local_pool()
+    
+    def render(self, text, rate=None, volume=None, voice=None):
+        """Agenda a renderização do texto e retorna um Future de RenderedAudio"""
+        args = (
+            text,
+            rate if rate is not None else self.defaults[0],
+            volume if volume is not None else self.defaults[1],
+            voice if voice is not None else self.defaults[2],
+            self.render_dir
+        )
+        future = Future()
+        self._submit_render(future, args)
+        return future
+    
+    def _submit_render(self, future, args):
+        """Submete a renderização, repetindo no engine local se um worker morrer"""
+        try:
+            inner = self._pool.submit(self._render_fn, *args)
+        except BrokenProcessPool as e:
+            self._fallback_to_local(e)
+            inner = self._pool.submit(self._render_fn, *args)
+        
+        def on_done(inner):
+            if inner.cancelled():
+                future.cancel()
+                return
+            
+            error = inner.exception()
+            if isinstance(error, BrokenProcessPool):
+                self._fallback_to_local(error)
+                self._submit_render(future, args)
+            elif error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(inner.result())
+        
+        inner.add_done_callback(on_done)
+    
+    def speak(self, text, rate=None, volume=None, voice=None, cancel=None, chunked=True):
+        """Renderiza e reproduz o texto (bloqueante), trecho a trecho
+        
+        Os próximos trechos são renderizados enquanto o atual toca. Sem
+        dispositivo de reprodução (PyAudio), fala direto pelo engine local.
+        Retorna True se a fala terminou sem interrupção.
+        """
+        cancel = cancel or threading.Event()
+        if not self.playback.available:
+            self.say(text, rate, volume, voice, cancel)
+            return not cancel.is_set()
+        chunks = split_speech_chunks(text) if chunked else [text]
+        
+        # Janela de pré-renderização: um trecho por worker (mínimo dois buffers)
+        window = max(2, self.workers)
+        pending = deque()
+        next_chunk = 0
+        
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < window:
+                pending.append(self.render(chunks[next_chunk], rate, volume, voice))
+                next_chunk += 1
+            
+            audio = pending.popleft().result()
+            if cancel.is_set() or not self.playback.play(audio, cancel):
+                for future in pending:
+                    future.cancel()
+                return False
+        
+        return True
+    
+    def say(self, text, rate=None, volume=None, voice=None, cancel=None):
+        """Fala diretamente pelo engine local, sem buffer (fallback)"""
+        cancel = cancel or threading.Event()
+        with self._local_lock:
+            if cancel.is_set():
+                return
+            engine = self._get_local_engine()
+            _apply_properties(engine, self._local_properties,
+                              rate if rate is not None else self.defaults[0],
+                              volume if volume is not None else self.defaults[1],
+                              voice if voice is not None else self.defaults[2])
+            self._saying = True
+            try:
+                engine.say(text)
+                engine.runAndWait()
+            finally:
+                self._saying = False
+    
+    def stop_saying(self):
+        """Interrompe uma fala direta em andamento
+        
+        Só age durante ``say()``: parar o engine no meio de uma renderização
+        deixaria um arquivo incompleto.
+        """
+        if self._saying and self._local_engine is not None:
+            self._local_engine.stop()
+    
+    def list_voices(self, timeout=15):
+        """Vozes disponíveis (id, name, languages, gender)"""
+        if self._render_fn is _render_in_worker:
+            try:
+                return self._pool.submit(_voices_in_worker).result(timeout=timeout)
+            except BrokenProcessPool as e:
+                self._fallback_to_local(e)
+            except Exception as e:
+                self.logger.warning(f"Erro ao listar vozes no worker: {e}")
+        
+        with self._local_lock:
+            return _describe_voices(self._get_local_engine())
+    
+    def shutdown(self):
+        """Finaliza workers e dispositivo de reprodução"""
+        with SpeechEngine._lock:
+            if SpeechEngine._instance is self:
+                SpeechEngine._instance = None
+        
+        self.playback.close()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._local_engine is not None:
+            self._local_engine.stop()
\ No newline at end of file
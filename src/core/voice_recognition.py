@@ -6,17 +6,160 @@ Processa entrada de áudio e converte para texto
 """
 
 import speech_recognition as sr
-import pyaudio
 import threading
 import time
+import json
+from collections import deque
 from queue import Queue
-import logging
 from core.logger import JarvisLogger
+from core.audio_capture import AudioCapture, PhraseDetector
+from core.noise_calibration import NoiseFloorTracker, DEFAULT_CALIBRATION_PATH
+
+class RecognitionPool:
+    """Pool fixo de workers de reconhecimento com fila limitada
+    
+    Quando a fila está cheia, a frase mais antiga é descartada (drop-oldest):
+    áudio antigo perde o sentido e não deve atrasar a fala mais recente.
+    """
+    
+    def __init__(self, handler, num_workers=1, max_queue=4, name='recognition'):
+        self.handler = handler
+        self.num_workers = max(1, num_workers)
+        self.max_queue = max(1, max_queue)
+        self.name = name
+        self.logger = JarvisLogger(__name__)
+        
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._workers = []
+        self._running = False
+        
+        # Contadores
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.active = 0
+    
+    def start(self):
+        """Inicia os workers do pool"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        
+        for i in range(self.num_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"{self.name}-{i}")
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+    
+    def submit(self, *args):
+        """Enfileira um item; descarta o mais antigo se a fila estiver cheia"""
+        with self._condition:
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self.dropped += 1
+                self.logger.debug(f"Fila de reconhecimento cheia - frase antiga descartada ({self.dropped} no total)")
+            self._queue.append(args)
+            self.submitted += 1
+            self._condition.notify()
+    
+    def stop(self, timeout=1):
+        """Para os workers e descarta itens pendentes"""
+        with self._condition:
+            self._running = False
+            self.dropped += len(self._queue)
+            self._queue.clear()
+            self._condition.notify_all()
+        
+        for worker in self._workers:
+            worker.join(timeout=timeout)
+        self._workers = []
+    
+    def _worker_loop(self):
+        """Loop dos workers"""
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                args = self._queue.popleft()
+                self.active += 1
+            
+            try:
+                self.handler(*args)
+            except Exception as e:
+                self.logger.error(f"Erro no worker de reconhecimento: {e}")
+            finally:
+                with self._condition:
+                    self.active -= 1
+                    self.processed += 1
+    
+    def get_stats(self):
+        """Retorna profundidade da fila e contadores"""
+        with self._condition:
+            return {
+                'queue_depth': len(self._queue),
+                'max_queue': self.max_queue,
+                'workers': self.num_workers,
+                'active': self.active,
+                'submitted': self.submitted,
+                'processed': self.processed,
+                'dropped': self.dropped
+            }
+
+class VoskStreamingRecognizer:
+    """Backend de reconhecimento em streaming (Vosk) com hipóteses parciais
+    
+    Recebe os frames da frase à medida que são capturados e devolve a
+    hipótese parcial atual; ``finish`` retorna a transcrição final.
+    """
+    
+    def __init__(self, model_path, sample_rate=16000):
+        from vosk import Model, KaldiRecognizer
+        
+        self.sample_rate = sample_rate
+        self._model = Model(model_path)
+        self._recognizer_class = KaldiRecognizer
+        self._recognizer = None
+        self._committed = []
+    
+    def begin(self):
+        """Inicia uma nova frase"""
+        self._recognizer = self._recognizer_class(self._model, self.sample_rate)
+        self._committed = []
+    
+    def accept(self, samples):
+        """Alimenta amostras int16 e retorna a hipótese parcial"""
+        # O binding do Vosk exige bytes; esta cópia só existe no modo streaming
+        if self._recognizer.AcceptWaveform(bytes(samples)):
+            # O Vosk encerrou um segmento interno: guardar o texto confirmado
+            text = json.loads(self._recognizer.Result()).get('text', '')
+            if text:
+                self._committed.append(text)
+            partial = ''
+        else:
+            partial = json.loads(self._recognizer.PartialResult()).get('partial', '')
+        return ' '.join(self._committed + [partial]).strip()
+    
+    def finish(self):
+        """Encerra a frase e retorna a transcrição final"""
+        text = json.loads(self._recognizer.FinalResult()).get('text', '')
+        result = ' '.join(self._committed + [text]).strip()
+        self._recognizer = None
+        self._committed = []
+        return result
 
 class VoiceRecognizer:
-    """Sistema de reconhecimento de voz com suporte a múltiplos engines"""
+    """Sistema de reconhecimento de voz com suporte a múltiplos engines
     
-    def __init__(self, config):
+    ``audio_source`` permite substituir o microfone por outra fonte (por
+    exemplo ``WavFileSource``) e ``recognize`` substitui o engine de ASR por
+    qualquer função que receba um ``sr.AudioData`` e retorne o texto.
+    """
+    
+    def __init__(self, config, audio_source=None, recognize=None):
         self.config = config
         self.logger = JarvisLogger(__name__)
         
@@ -24,6 +167,23 @@ class VoiceRecognizer:
         self.sample_rate = config.get('audio', {}).get('sample_rate', 16000)
         self.chunk_size = config.get('audio', {}).get('chunk_size', 1024)
         self.channels = config.get('audio', {}).get('channels', 1)
+        self.phrase_time_limit = config.get('audio', {}).get('phrase_time_limit', 5)
+        
+        # Pool de reconhecimento
+        recognition_config = config.get('audio', {}).get('recognition', {})
+        self.recognition_pool = RecognitionPool(
+            self._process_audio,
+            num_workers=recognition_config.get('workers', 1),
+            max_queue=recognition_config.get('queue_size', 4)
+        )
+        self.recognition_engine = recognition_config.get('engine', 'google')
+        self.recognize = recognize or self._recognize
+        
+        # Backend de streaming (hipóteses parciais durante a fala)
+        self.streaming_backend = None
+        self.partial_interval = recognition_config.get('partial_interval', 0.2)
+        if self.recognition_engine == 'vosk' and recognize is None:
+            self._initialize_streaming(recognition_config)
         
         # Wake word e configurações
         self.wake_word = config.get('jarvis', {}).get('wake_word', 'jarvis').lower()
@@ -34,13 +194,63 @@ class VoiceRecognizer:
         self.is_activated = False
         self.listening_thread = None
         self.audio_queue = Queue()
+        self._utterance_id = 0
+        self._wake_utterance = None
+        self._last_partial = ''
+        self._last_partial_time = 0
         
         # Inicializar recognizer
         self.recognizer = sr.Recognizer()
         self.microphone = None
         
-        self._initialize_microphone()
-        self._calibrate_microphone()
+        # Calibração adaptativa: parte do último valor salvo, sem bloquear
+        calibration_config = config.get('audio', {}).get('calibration', {})
+        self.adaptive_calibration = calibration_config.get('adaptive', True)
+        self.noise_tracker = NoiseFloorTracker(
+            self.chunk_size / self.sample_rate,
+            path=calibration_config.get('path', DEFAULT_CALIBRATION_PATH),
+            initial_threshold=self.recognizer.energy_threshold,
+            ratio=calibration_config.get('ratio', 2.0),
+            min_threshold=calibration_config.get('min_threshold', 100),
+            window=calibration_config.get('window', 3.0)
+        )
+        self.recognizer.energy_threshold = self.noise_tracker.energy_threshold
+        if self.noise_tracker.loaded:
+            self.logger.voice(f"Calibração anterior carregada (limiar {self.recognizer.energy_threshold:.0f})")
+        
+        if audio_source is None:
+            self._initialize_microphone()
+            
+            # Captura em modo callback com buffer circular pré-alocado
+            audio_source = AudioCapture(
+                sample_rate=self.sample_rate,
+                chunk_size=self.chunk_size,
+                channels=self.channels,
+                device_index=config.get('audio', {}).get('input_device'),
+                capacity=config.get('audio', {}).get('ring_buffer_frames', 64)
+            )
+        self.capture = audio_source
+        self.phrase_detector = PhraseDetector(
+            self.capture.ring,
+            sample_rate=self.sample_rate,
+            energy_threshold=self.recognizer.energy_threshold,
+            pause_threshold=self.recognizer.pause_threshold,
+            non_speaking_duration=self.recognizer.non_speaking_duration,
+            phrase_time_limit=self.phrase_time_limit
+        )
+    
+    def _initialize_streaming(self, recognition_config):
+        """Carrega o backend de streaming (Vosk), se disponível"""
+        model_path = recognition_config.get('vosk_model_path', 'models/vosk-model-small-pt')
+        try:
+            self.streaming_backend = VoskStreamingRecognizer(model_path, self.sample_rate)
+            self.logger.voice(f"Reconhecimento em streaming ativo (Vosk: {model_path})")
+        except ImportError:
+            self.logger.error("Vosk não instalado - usando Google Speech Recognition")
+            self.recognition_engine = 'google'
+        except Exception as e:
+            self.logger.error(f"Erro ao carregar modelo Vosk: {e} - usando Google Speech Recognition")
+            self.recognition_engine = 'google'
     
     def _initialize_microphone(self):
         """Inicializa o microfone"""
@@ -53,11 +263,18 @@ class VoiceRecognizer:
             raise
     
     def _calibrate_microphone(self):
-        """Calibra o microfone para ruído ambiente"""
+        """Calibra o microfone para ruído ambiente (bloqueante, sob demanda)
+        
+        A escuta contínua já recalibra a partir do fluxo de frames; este método
+        fica disponível para forçar uma calibração imediata.
+        """
         try:
             with self.microphone as source:
                 self.logger.voice("Calibrando para ruído ambiente...")
                 self.recognizer.adjust_for_ambient_noise(source, duration=2)
+            self.noise_tracker.energy_threshold = self.recognizer.energy_threshold
+            self.phrase_detector.energy_threshold = self.recognizer.energy_threshold
+            self.noise_tracker.persist(force=True)
             self.logger.voice("Calibração concluída")
         except Exception as e:
             self.logger.error(f"Erro na calibração do microfone: {e}")
@@ -68,6 +285,7 @@ class VoiceRecognizer:
             return
             
         self.is_listening = True
+        self.recognition_pool.start()
         self.listening_thread = threading.Thread(target=self._listen_loop)
         self.listening_thread.daemon = True
         self.listening_thread.start()
@@ -78,45 +296,118 @@ class VoiceRecognizer:
         self.is_listening = False
         if self.listening_thread:
             self.listening_thread.join(timeout=1)
+        self.recognition_pool.stop()
+        if self.adaptive_calibration:
+            self.noise_tracker.persist(force=True)
         self.logger.voice("Escuta interrompida")
     
     def _listen_loop(self):
         """Loop principal de escuta"""
-        while self.is_listening:
-            try:
-                with self.microphone as source:
-                    # Escuta com timeout
-                    audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
+        try:
+            self.capture.start()
+        except Exception as e:
+            self.logger.error(f"Erro ao iniciar captura de áudio: {e}")
+            self.is_listening = False
+            return
+        
+        ring = self.capture.ring
+        seq = ring.write_seq
+        self.phrase_detector.reset()
+        
+        try:
+            while self.is_listening:
+                try:
+                    frame = ring.read(seq, timeout=1)
+                    if frame is None:
+                        continue
+                    frame_seq, samples = frame
+                    seq = frame_seq + 1
                     
-                # Processar áudio em thread separada
-                threading.Thread(target=self._process_audio, args=(audio,)).start()
-                
-            except sr.WaitTimeoutError:
-                continue
-            except Exception as e:
-                self.logger.error(f"Erro no loop de escuta: {e}")
-                time.sleep(1)
+                    # VAD e endpointing direto sobre a view do buffer circular
+                    was_in_speech = self.phrase_detector.in_speech
+                    phrase = self.phrase_detector.process(frame_seq, samples)
+                    if not was_in_speech and (self.phrase_detector.in_speech or phrase is not None):
+                        self._utterance_id += 1
+                    
+                    # Calibração contínua a partir da energia de cada frame
+                    if self.adaptive_calibration:
+                        threshold = self.noise_tracker.update(self.phrase_detector.last_energy)
+                        self.phrase_detector.energy_threshold = threshold
+                        self.recognizer.energy_threshold = threshold
+                    
+                    if self.streaming_backend:
+                        self._stream_frame(was_in_speech, samples, phrase)
+                        continue
+                    
+                    if phrase is None:
+                        continue
+                    
+                    # Única cópia por frase: o AudioData precisa de bytes próprios
+                    audio = sr.AudioData(phrase.tobytes(), self.sample_rate, 2)
+                    self.recognition_pool.submit(audio, time.time(), self._utterance_id)
+                    
+                except Exception as e:
+                    self.logger.error(f"Erro no loop de escuta: {e}")
+                    time.sleep(1)
+        finally:
+            self.capture.stop()
+    
+    def _stream_frame(self, was_in_speech, samples, phrase):
+        """Alimenta o backend de streaming e emite hipóteses parciais"""
+        detector = self.phrase_detector
+        
+        if not was_in_speech:
+            if not detector.in_speech and phrase is None:
+                return
+            # Início de frase: enviar também a pré-fala
+            self.streaming_backend.begin()
+            self._last_partial = ''
+            partial = self.streaming_backend.accept(phrase if phrase is not None else detector.current_audio())
+        else:
+            partial = self.streaming_backend.accept(samples)
+        
+        if phrase is not None:
+            text = self.streaming_backend.finish()
+            self._handle_transcript(text, time.time(), self._utterance_id)
+            return
+        
+        # Emitir quando a hipótese muda ou periodicamente enquanto se mantém
+        now = time.time()
+        if partial and (partial != self._last_partial or now - self._last_partial_time >= self.partial_interval):
+            self._last_partial = partial
+            self._last_partial_time = now
+            self._on_partial_transcript(partial, self._utterance_id)
+    
+    def _on_partial_transcript(self, text, utterance_id):
+        """Trata uma hipótese parcial da frase em andamento"""
+        if not self.is_activated:
+            # Wake word detectado antes do fim da frase
+            if self.wake_word in text.lower():
+                self.is_activated = True
+                self._wake_utterance = utterance_id
+                self.logger.voice("Wake word detectado (parcial) - JARVIS ativado!")
+                self._on_wake_word_detected(text, time.time())
+            return
+        
+        if utterance_id == self._wake_utterance:
+            return
+        
+        from core.events import EventManager
+        EventManager.emit_event('voice_partial', {
+            'text': text,
+            'utterance_id': utterance_id,
+            'timestamp': time.time()
+        })
     
-    def _process_audio(self, audio):
+    def _process_audio(self, audio, captured_at=None, utterance_id=None):
         """Processa o áudio capturado"""
+        if captured_at:
+            self.logger.debug(f"Frase aguardou {time.time() - captured_at:.2f}s na fila de reconhecimento")
+        
         try:
-            # Reconhecer fala usando Google Speech Recognition
-            text = self.recognizer.recognize_google(audio, language=self.language)
-            text_lower = text.lower()
+            text = self.recognize(audio)
+            self._handle_transcript(text, captured_at, utterance_id)
             
-            self.logger.voice(f"Texto reconhecido: '{text}'")
-            
-            # Verificar wake word
-            if not self.is_activated and self.wake_word in text_lower:
-                self.is_activated = True
-                self.logger.voice("Wake word detectado - JARVIS ativado!")
-                self._on_wake_word_detected(text)
-                
-            elif self.is_activated:
-                # Processar comando
-                self._on_command_received(text)
-                self.is_activated = False  # Desativar após comando
-                
         except sr.UnknownValueError:
             # Não conseguiu entender o áudio - normal, não logar
             pass
@@ -125,25 +416,71 @@ class VoiceRecognizer:
         except Exception as e:
             self.logger.error(f"Erro no processamento de áudio: {e}")
     
-    def _on_wake_word_detected(self, text):
+    def _handle_transcript(self, text, captured_at=None, utterance_id=None):
+        """Trata a transcrição final de uma frase"""
+        if not text:
+            return
+        text_lower = text.lower()
+        
+        self.logger.voice(f"Texto reconhecido: '{text}'")
+        
+        # Frase cujo wake word já foi tratado pela hipótese parcial
+        if utterance_id is not None and utterance_id == self._wake_utterance:
+            return
+        
+        # Verificar wake word
+        if not self.is_activated and self.wake_word in text_lower:
+            self.is_activated = True
+            self._wake_utterance = utterance_id
+            self.logger.voice("Wake word detectado - JARVIS ativado!")
+            self._on_wake_word_detected(text, captured_at)
+            
+        elif self.is_activated:
+            # Processar comando
+            self._on_command_received(text, captured_at, utterance_id)
+            self.is_activated = False  # Desativar após comando
+    
+    def _recognize(self, audio):
+        """Reconhece fala usando o engine configurado"""
+        if self.recognition_engine == 'sphinx':
+            # Reconhecimento offline (CPU) via PocketSphinx
+            return self.recognizer.recognize_sphinx(audio, language=self.language)
+        
+        # Reconhecer fala usando Google Speech Recognition
+        return self.recognizer.recognize_google(audio, language=self.language)
+    
+    def _on_wake_word_detected(self, text, captured_at=None):
         """Callback quando wake word é detectado"""
         # Implementar resposta de ativação
         from core.events import EventManager
-        EventManager.emit('wake_word_detected', {'text': text})
+        EventManager.emit_event('wake_word_detected', {'text': text, 'captured_at': captured_at})
     
-    def _on_command_received(self, text):
+    def _on_command_received(self, text, captured_at=None, utterance_id=None):
         """Callback quando comando é recebido"""
         from core.events import EventManager
-        EventManager.emit('voice_command', {'text': text, 'timestamp': time.time()})
+        EventManager.emit_event('voice_command', {
+            'text': text,
+            'timestamp': time.time(),
+            'captured_at': captured_at,
+            'utterance_id': utterance_id
+        })
+    
+    def get_recognition_stats(self):
+        """Retorna estatísticas do pool de reconhecimento"""
+        return self.recognition_pool.get_stats()
     
     def listen_once(self, timeout=5):
         """Escuta uma única vez e retorna o texto"""
+        if self.microphone is None:
+            self.logger.voice("Nenhum microfone em uso - escuta única indisponível")
+            return None
+        
         try:
             with self.microphone as source:
                 self.logger.voice("Escutando comando...")
                 audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=10)
             
-            text = self.recognizer.recognize_google(audio, language=self.language)
+            text = self.recognize(audio)
             self.logger.voice(f"Comando recebido: '{text}'")
             return text
             
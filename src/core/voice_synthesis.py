@@ -5,16 +5,248 @@ Sistema de Síntese de Voz do JARVIS
 Converte texto para fala com personalidade elegante e profissional
 """
 
-import pyttsx3
+import heapq
+import itertools
 import threading
 import time
-import queue
-import logging
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from core.logger import JarvisLogger
+from core.tts_cache import RenderedAudioCache
+from core.tts_engine import SpeechEngine, split_speech_chunks
+
+class SpeechItem:
+    """Fala agendada na fila de prioridade"""
+    
+    def __init__(self, text, priority, deadline, seq):
+        self.text = text
+        self.priority = priority
+        self.deadline = deadline
+        self.seq = seq
+        
+        self.interrupted = threading.Event()
+        self.done = threading.Event()
+        self.requeue = False
+        self.position = 0  # Próximo trecho a falar (retomada após preempção)
+    
+    def expired(self, now=None):
+        """Indica se o prazo de validade da fala passou"""
+        return self.deadline is not None and (now or time.time()) > self.deadline
+    
+    def __lt__(self, other):
+        # Maior prioridade primeiro; mesma prioridade em ordem de chegada
+        return (-self.priority, self.seq) < (-other.priority, other.seq)
+
+class SpeechScheduler:
+    """Fila de fala por prioridade (heap) com prazos de validade
+    
+    Números maiores são mais urgentes. Falas vencidas são descartadas ao
+    sair da fila, sem nunca chegar ao engine.
+    """
+    
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+    
+    def put(self, text, priority=1, ttl=None):
+        """Agenda uma fala e retorna o SpeechItem correspondente"""
+        deadline = time.time() + ttl if ttl else None
+        item = SpeechItem(text, priority, deadline, next(self._seq))
+        
+        with self._condition:
+            heapq.heappush(self._heap, item)
+            self._condition.notify()
+        return item
+    
+    def requeue(self, item):
+        """Devolve uma fala interrompida à fila, mantendo sua posição original"""
+        item.interrupted.clear()
+        item.requeue = False
+        
+        with self._condition:
+            heapq.heappush(self._heap, item)
+            self._condition.notify()
+    
+    def get(self, timeout=None):
+        """Retira a fala mais urgente ainda válida (ou None no timeout)"""
+        end = time.time() + timeout if timeout is not None else None
+        
+        with self._condition:
+            while True:
+                if self.closed:
+                    return None
+                
+                while self._heap:
+                    item = heapq.heappop(self._heap)
+                    if item.expired():
+                        self.dropped += 1
+                        item.done.set()
+                        continue
+                    return item
+                
+                remaining = end - time.time() if end is not None else None
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+    
+    def peek_priority(self):
+        """Prioridade da próxima fala (ou None se a fila estiver vazia)"""
+        with self._condition:
+            return self._heap[0].priority if self._heap else None
+    
+    def clear(self):
+        """Remove todas as falas pendentes e retorna quantas foram removidas"""
+        with self._condition:
+            removed = self._heap
+            self._heap = []
+        
+        for item in removed:
+            item.done.set()
+        return len(removed)
+    
+    def close(self):
+        """Encerra a fila, acordando o worker"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+    
+    def __len__(self):
+        with self._condition:
+            return len(self._heap)
+
+class SpeechStream:
+    """Resposta em streaming falada frase a frase
+    
+    Os trechos chegam por eventos (cada um em sua própria thread) e podem vir
+    fora de ordem: são reordenados pelo índice antes de entrar no buffer. Cada
+    trecho de fala completo (ver ``split_speech_chunks``) vai para a fila assim
+    que termina; o resto do buffer espera mais texto ou o fim do stream. A
+    personalidade é aplicada uma vez, no início da resposta (primeiro trecho).
+    """
+    
+    def __init__(self, synthesizer, priority, ttl):
+        self.synthesizer = synthesizer
+        self.priority = priority
+        self.ttl = ttl
+        
+        self._pending = {}
+        self._next_index = 0
+        self._buffer = ""
+        self._total = None
+        self._lock = threading.Lock()
+        
+        self.items = []
+        self.started = False
+        self.finished = False
+        self.cancelled = False
+    
+    def feed(self, index, text):
+        """Recebe o trecho ``index`` do stream; retorna True quando o stream termina"""
+        with self._lock:
+            if self.cancelled or self.finished:
+                return self.finished
+            
+            self._pending[index] = text
+            while self._next_index in self._pending:
+                self._buffer += self._pending.pop(self._next_index)
+                self._next_index += 1
+            
+            self._flush()
+            return self.finished
+    
+    def finish(self, total):
+        """Informa o número total de trechos; retorna True quando o stream termina"""
+        with self._lock:
+            self._total = total
+            if self.cancelled:
+                self.finished = True
+            else:
+                self._flush()
+            return self.finished
+    
+    def cancel(self):
+        """Descarta o restante do stream"""
+        with self._lock:
+            self.cancelled = True
+            self._pending.clear()
+            self._buffer = ""
+    
+    def _flush(self):
+        """Envia para a fila os trechos de fala já completos"""
+        synthesizer = self.synthesizer
+        final = self._total is not None and self._next_index >= self._total
+        
+        if not self._buffer.strip():
+            chunks = []
+        elif synthesizer.chunking:
+            first_chars = synthesizer.first_chunk_chars if not self.items else synthesizer.chunk_chars
+            chunks = split_speech_chunks(self._buffer, synthesizer.chunk_chars, first_chars)
+        else:
+            chunks = [self._buffer.strip()]
+        
+        # O último trecho pode ser uma frase ainda incompleta
+        ready = chunks if final else chunks[:-1]
+        for chunk in ready:
+            item = synthesizer.speak(chunk, self.priority, self.ttl, prefetch=True, personality=not self.started)
+            self.started = True
+            if item is not None:
+                self.items.append(item)
+        
+        if final:
+            self._buffer = ""
+            self.finished = True
+        elif ready:
+            self._buffer = chunks[-1] + (" " if self._buffer[-1:].isspace() else "")
 
 class VoiceSynthesizer:
     """Sistema de síntese de voz com personalidade personalizada"""
     
+    # Prioridades de fala (maior = mais urgente)
+    PRIORITY_LOW = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_HIGH = 5
+    PRIORITY_URGENT = 10
+    
+    # Frases fixas, pré-renderizadas no cache de áudio
+    WAKE_RESPONSES = [
+        "Sim, senhor?",
+        "Como posso ajudá-lo?",
+        "Às suas ordens.",
+        "Ouvindo."
+    ]
+    
+    GREETINGS = [
+        "Bom dia. Como posso ajudá-lo hoje?",
+        "Boa tarde. No que posso ser útil?",
+        "Boa noite. Em que posso assistí-lo?",
+        "Olá. Como posso ajudá-lo neste momento?"
+    ]
+    
+    FAREWELLS = [
+        "Foi um prazer ajudá-lo.",
+        "Até a próxima. Estarei aqui quando precisar.",
+        "Tenha um excelente dia.",
+        "À sua disposição sempre."
+    ]
+    
+    STARTUP_MESSAGES = [
+        "JARVIS inicializado e operacional. Todos os sistemas funcionando normalmente.",
+        "Olá. JARVIS está online e pronto para atendê-lo.",
+        "Sistemas carregados com sucesso. JARVIS à sua disposição.",
+        "Boa tarde. Sou JARVIS, seu assistente pessoal. Como posso ajudá-lo?"
+    ]
+    
+    ERROR_MESSAGES = {
+        "general": "Desculpe, encontrei um problema técnico.",
+        "connection": "Parece que há um problema de conexão.",
+        "recognition": "Não consegui compreender claramente. Poderia repetir?",
+        "service": "O serviço solicitado não está disponível no momento.",
+        "permission": "Não tenho permissão para executar essa ação."
+    }
+    
     def __init__(self, config):
         self.config = config
         self.logger = JarvisLogger(__name__)
@@ -33,29 +265,73 @@ class VoiceSynthesizer:
         
         # Estados
         self.is_speaking = False
-        self.speech_queue = queue.Queue()
+        self.speech_queue = SpeechScheduler()
         self.speech_thread = None
+        self._current = None
+        self._current_lock = threading.Lock()
+        
+        # Agendamento: prazo padrão e preempção de falas menos urgentes
+        speech_config = config.get('audio', {}).get('speech', {})
+        self.default_ttl = speech_config.get('default_ttl', 60)
+        self.preemption = speech_config.get('preemption', True)
+        self.chunking = speech_config.get('chunking', True)
+        self.chunk_chars = speech_config.get('chunk_chars', 200)
+        self.first_chunk_chars = speech_config.get('first_chunk_chars', 80)
+        self.synthesis_workers = speech_config.get('synthesis_workers', 2)
+        
+        # Cache de áudio renderizado (PCM) para frases repetidas
+        audio_config = config.get('audio', {})
+        cache_config = audio_config.get('tts_cache', {})
+        self.output_device = audio_config.get('output_device')
+        self.cache_max_chars = cache_config.get('max_chars', 120)
+        self.audio_cache = None
+        if cache_config.get('enabled', True):
+            self.audio_cache = RenderedAudioCache(
+                cache_config.get('path', 'data/tts_cache'),
+                int(cache_config.get('memory_mb', 32) * 1024 * 1024)
+            )
+        
+        # Consultas ao cache e esperas por renderização, em paralelo com a reprodução
+        self._render_executor = ThreadPoolExecutor(
+            max_workers=max(1, self.synthesis_workers), thread_name_prefix="TTSRender"
+        )
+        self._shutdown = threading.Event()
+        self._voice_key = None
+        
+        # Renderizações antecipadas (trechos de respostas em streaming) e streams ativos
+        self._prefetched = OrderedDict()
+        self._prefetch_lock = threading.Lock()
+        self._streams = {}
+        self._closed_streams = deque(maxlen=32)
+        self._streams_lock = threading.Lock()
         
         # Inicializar engine
         self.engine = None
         self._initialize_engine()
         self._start_speech_thread()
+        
+        if self.audio_cache and self.engine.playback.available and cache_config.get('warm_on_startup', True):
+            self._start_cache_warming()
     
     def _initialize_engine(self):
         """Inicializa o engine de síntese de voz"""
         try:
-            self.engine = pyttsx3.init()
-            
-            # Configurar propriedades
-            self.engine.setProperty('rate', self.rate)
-            self.engine.setProperty('volume', self.volume)
+            # Engine compartilhado: workers de síntese e dispositivo de reprodução
+            self.engine = SpeechEngine.get_instance(
+                workers=self.synthesis_workers,
+                output_device=self.output_device,
+                rate=self.rate,
+                volume=self.volume
+            )
             
             # Configurar voz
-            voices = self.engine.getProperty('voices')
+            voices = self.engine.list_voices()
             if voices and len(voices) > self.voice_id:
-                self.engine.setProperty('voice', voices[self.voice_id].id)
-                self.logger.voice(f"Voz configurada: {voices[self.voice_id].name}")
+                self._voice_key = voices[self.voice_id]['id']
+                self.logger.voice(f"Voz configurada: {voices[self.voice_id]['name']}")
             
+            if not self.engine.playback.available:
+                self.logger.voice("PyAudio não instalado - falando direto pelo pyttsx3, sem cache nem renderização antecipada")
             self.logger.voice("Engine de síntese inicializado com sucesso")
             
         except Exception as e:
@@ -72,62 +348,277 @@ class VoiceSynthesizer:
         """Worker thread para processar fila de fala"""
         while True:
             try:
-                text, priority = self.speech_queue.get(timeout=1)
-                if text is None:  # Sinal para parar
-                    break
+                item = self.speech_queue.get(timeout=1)
+                if item is None:
+                    if self.speech_queue.closed:  # Sinal para parar
+                        break
+                    continue
                 
-                self._speak_now(text)
-                self.speech_queue.task_done()
+                with self._current_lock:
+                    self._current = item
+                
+                item.position = self._speak_now(item.text, item.interrupted, item.position)
+                
+                with self._current_lock:
+                    self._current = None
+                
+                # Fala preemptada volta para a fila se ainda for válida
+                if item.interrupted.is_set() and item.requeue and not item.expired():
+                    self.speech_queue.requeue(item)
+                else:
+                    item.done.set()
                 
-            except queue.Empty:
-                continue
             except Exception as e:
                 self.logger.error(f"Erro no worker de fala: {e}")
     
-    def _speak_now(self, text):
-        """Executa a síntese de voz imediatamente"""
+    def _start_cache_warming(self):
+        """Pré-renderiza as frases fixas em segundo plano"""
+        thread = threading.Thread(target=self._warm_cache, name="TTSCacheWarmer")
+        thread.daemon = True
+        thread.start()
+    
+    def _warm_cache(self):
+        """Renderiza as frases fixas que ainda não estão em cache"""
+        phrases = (self.WAKE_RESPONSES + self.STARTUP_MESSAGES + list(self.ERROR_MESSAGES.values())
+                   + self.GREETINGS + self.FAREWELLS)
+        rendered = 0
+        
+        for phrase in phrases:
+            if self._shutdown.is_set():
+                break
+            
+            text = self._apply_personality(phrase)
+            if len(text) > self.cache_max_chars:
+                continue
+            
+            key = self._cache_key(text)
+            if self.audio_cache.contains(key):
+                continue
+            
+            audio = self._render_to_buffer(text)
+            if audio is not None:
+                self.audio_cache.put(key, audio)
+                rendered += 1
+        
+        self.logger.voice(f"Cache de voz aquecido: {rendered} frases renderizadas")
+    
+    def _cache_key(self, text):
+        """Chave do cache para o texto com as configurações atuais de voz"""
+        return RenderedAudioCache.make_key(text, self._voice_key, self.rate, self.volume)
+    
+    def _render_to_buffer(self, text):
+        """Sintetiza o texto para um buffer PCM, sem reproduzir"""
+        try:
+            return self.engine.render(text, self.rate, self.volume, self._voice_key).result()
+        except Exception as e:
+            self.logger.error(f"Erro ao renderizar fala: {e}")
+            return None
+    
+    def _get_rendered(self, text):
+        """Retorna o áudio renderizado do texto (do cache ou sintetizado agora)
+        
+        Textos longos são renderizados sem passar pelo cache.
+        """
+        cacheable = self.audio_cache is not None and len(text) <= self.cache_max_chars
+        
+        if cacheable:
+            key = self._cache_key(text)
+            audio = self.audio_cache.get(key)
+            if audio is not None:
+                return audio
+        
+        audio = self._render_to_buffer(text)
+        if cacheable and audio is not None:
+            self.audio_cache.put(key, audio)
+        return audio
+    
+    def _prefetch(self, text):
+        """Começa a renderizar os primeiros trechos do texto antes de ele sair da fila"""
+        if not self.engine.playback.available:
+            return
+        
+        chunks = split_speech_chunks(text, self.chunk_chars, self.first_chunk_chars) if self.chunking else [text]
+        
+        with self._prefetch_lock:
+            for chunk in chunks[:max(2, self.synthesis_workers)]:
+                if chunk not in self._prefetched:
+                    self._prefetched[chunk] = self._render_executor.submit(self._get_rendered, chunk)
+            
+            # Falas descartadas da fila nunca consomem sua renderização
+            while len(self._prefetched) > 16:
+                self._prefetched.popitem(last=False)
+    
+    def _take_prefetched(self, chunk):
+        """Renderização antecipada do trecho (ou None)"""
+        with self._prefetch_lock:
+            return self._prefetched.pop(chunk, None)
+    
+    def _say(self, text, interrupted):
+        """Fala pelo engine diretamente, sem buffer (se a renderização falhar)"""
+        self.engine.say(text, self.rate, self.volume, self._voice_key, interrupted)
+    
+    def _speak_now(self, text, interrupted=None, start_chunk=0):
+        """Executa a síntese de voz imediatamente
+        
+        O texto é falado em trechos (frases/orações): enquanto um trecho toca,
+        os seguintes são renderizados pelos workers de síntese. Interrupções
+        são verificadas a cada bloco de áudio e durante a espera pela
+        renderização. Retorna o índice do próximo trecho a falar, para
+        retomar uma fala preemptada do trecho em que parou.
+        """
+        interrupted = interrupted or threading.Event()
+        if self.chunking:
+            chunks = split_speech_chunks(text, self.chunk_chars, self.first_chunk_chars)
+        else:
+            chunks = [text]
+        
+        index = start_chunk
+        window = max(2, self.synthesis_workers)
+        pending = deque()
+        next_chunk = index
+        
         try:
             self.is_speaking = True
             self.logger.voice(f"Falando: '{text}'")
             
-            self.engine.say(text)
-            self.engine.runAndWait()
+            while index < len(chunks):
+                # Sem dispositivo de reprodução: fala direta, sem renderizar
+                if not self.engine.playback.available:
+                    self._say(chunks[index], interrupted)
+                    if interrupted.is_set():
+                        break
+                    index += 1
+                    continue
+                
+                # Manter os próximos trechos renderizando enquanto este toca
+                while next_chunk < len(chunks) and len(pending) < window:
+                    future = self._take_prefetched(chunks[next_chunk])
+                    if future is None:
+                        future = self._render_executor.submit(self._get_rendered, chunks[next_chunk])
+                    pending.append(future)
+                    next_chunk += 1
+                
+                # Esperar a renderização sem deixar de atender a uma interrupção
+                future = pending.popleft()
+                while not future.done() and not interrupted.wait(0.05):
+                    pass
+                if interrupted.is_set():
+                    break
+                audio = future.result()
+                
+                if audio is not None:
+                    self.engine.playback.play(audio, interrupted)
+                else:
+                    self._say(chunks[index], interrupted)
+                
+                if interrupted.is_set():
+                    break
+                index += 1
             
         except Exception as e:
             self.logger.error(f"Erro na síntese de voz: {e}")
         finally:
             self.is_speaking = False
+        
+        return index
+    
+    def _interrupt_current(self, requeue=False, below_priority=None):
+        """Interrompe a fala em andamento
+        
+        Com ``below_priority``, só interrompe falas menos urgentes que ela.
+        Com ``requeue``, a fala interrompida volta para a fila.
+        """
+        with self._current_lock:
+            item = self._current
+            if item is None:
+                return False
+            if below_priority is not None and item.priority >= below_priority:
+                return False
+            
+            item.requeue = requeue
+            item.interrupted.set()
+        
+        if self.engine:
+            self.engine.stop_saying()
+        return True
     
-    def speak(self, text, priority=1):
-        """Adiciona texto à fila de fala"""
+    def speak(self, text, priority=PRIORITY_NORMAL, ttl=None, prefetch=False, personality=True):
+        """Adiciona texto à fila de fala
+        
+        Falas com prioridade maior que a atual a interrompem; a fala
+        interrompida volta para a fila. Após ``ttl`` segundos (padrão
+        ``audio.speech.default_ttl``) uma fala ainda não iniciada é descartada.
+        Com ``prefetch``, a renderização começa já na entrada da fila.
+        ``personality=False`` fala o texto como veio (trechos do meio de uma
+        resposta em streaming).
+        """
         if not text or not text.strip():
-            return
+            return None
         
         # Processar texto com personalidade
-        processed_text = self._apply_personality(text)
+        processed_text = self._apply_personality(text) if personality else text
+        if prefetch:
+            self._prefetch(processed_text)
         
         # Adicionar à fila
-        self.speech_queue.put((processed_text, priority))
+        item = self.speech_queue.put(processed_text, priority, ttl if ttl is not None else self.default_ttl)
+        
+        if self.preemption:
+            self._interrupt_current(requeue=True, below_priority=priority)
+        return item
+    
+    def feed_stream(self, stream_id, index, text, priority=PRIORITY_NORMAL, ttl=None):
+        """Recebe um trecho de resposta em streaming (AI_RESPONSE_CHUNK)
+        
+        As frases são faladas conforme se completam, sem esperar o fim da
+        resposta.
+        """
+        with self._streams_lock:
+            if stream_id in self._closed_streams:
+                return None  # Trecho atrasado de um stream já encerrado
+            stream = self._streams.get(stream_id)
+            if stream is None:
+                stream = SpeechStream(self, priority, ttl)
+                self._streams[stream_id] = stream
+        
+        if stream.feed(index, text):
+            self._drop_stream(stream_id)
+        return stream
+    
+    def finish_stream(self, stream_id, total):
+        """Marca o fim de uma resposta em streaming com ``total`` trechos"""
+        with self._streams_lock:
+            if stream_id in self._closed_streams:
+                return None
+            stream = self._streams.get(stream_id)
+            if stream is None:
+                stream = SpeechStream(self, self.PRIORITY_NORMAL, None)
+                self._streams[stream_id] = stream
+        
+        if stream.finish(total):
+            self._drop_stream(stream_id)
+        return stream
+    
+    def _drop_stream(self, stream_id):
+        with self._streams_lock:
+            self._streams.pop(stream_id, None)
+            self._closed_streams.append(stream_id)
     
     def speak_immediately(self, text):
-        """Fala imediatamente, interrompendo outras falas"""
-        if not text or not text.strip():
-            return
+        """Fala imediatamente, interrompendo outras falas
         
-        # Limpar fila
-        while not self.speech_queue.empty():
-            try:
-                self.speech_queue.get_nowait()
-            except queue.Empty:
-                break
+        Retorna o SpeechItem; ``item.done.wait()`` aguarda o fim da fala.
+        """
+        if not text or not text.strip():
+            return None
         
-        # Parar fala atual se houver
-        if self.is_speaking and self.engine:
-            self.engine.stop()
+        # Limpar fila e parar fala atual se houver
+        self.speech_queue.clear()
+        self._interrupt_current()
         
         # Processar e falar
         processed_text = self._apply_personality(text)
-        self._speak_now(processed_text)
+        return self.speech_queue.put(processed_text, self.PRIORITY_URGENT)
     
     def _apply_personality(self, text):
         """Aplica personalidade ao texto"""
@@ -160,76 +651,50 @@ class VoiceSynthesizer:
         current_hour = time.localtime().tm_hour
         
         if 5 <= current_hour < 12:
-            return "Bom dia. Como posso ajudá-lo hoje?"
+            return self.GREETINGS[0]
         elif 12 <= current_hour < 18:
-            return "Boa tarde. No que posso ser útil?"
+            return self.GREETINGS[1]
         elif 18 <= current_hour < 22:
-            return "Boa noite. Em que posso assistí-lo?"
+            return self.GREETINGS[2]
         else:
-            return "Olá. Como posso ajudá-lo neste momento?"
+            return self.GREETINGS[3]
     
     def get_farewell(self):
         """Retorna despedida personalizada"""
-        farewells = [
-            "Foi um prazer ajudá-lo.",
-            "Até a próxima. Estarei aqui quando precisar.",
-            "Tenha um excelente dia.",
-            "À sua disposição sempre."
-        ]
-        return farewells[hash(str(time.time())) % len(farewells)]
+        return self.FAREWELLS[hash(str(time.time())) % len(self.FAREWELLS)]
     
     def speak_startup(self):
         """Mensagem de inicialização do JARVIS"""
-        startup_messages = [
-            "JARVIS inicializado e operacional. Todos os sistemas funcionando normalmente.",
-            "Olá. JARVIS está online e pronto para atendê-lo.",
-            "Sistemas carregados com sucesso. JARVIS à sua disposição.",
-            "Boa tarde. Sou JARVIS, seu assistente pessoal. Como posso ajudá-lo?"
-        ]
-        
-        message = startup_messages[hash(str(time.time())) % len(startup_messages)]
+        message = self.STARTUP_MESSAGES[hash(str(time.time())) % len(self.STARTUP_MESSAGES)]
         self.speak_immediately(message)
     
     def speak_error(self, error_type="general"):
         """Mensagens de erro personalizadas"""
-        error_messages = {
-            "general": "Desculpe, encontrei um problema técnico.",
-            "connection": "Parece que há um problema de conexão.",
-            "recognition": "Não consegui compreender claramente. Poderia repetir?",
-            "service": "O serviço solicitado não está disponível no momento.",
-            "permission": "Não tenho permissão para executar essa ação."
-        }
-        
-        message = error_messages.get(error_type, error_messages["general"])
+        message = self.ERROR_MESSAGES.get(error_type, self.ERROR_MESSAGES["general"])
         self.speak_immediately(message)
     
     def stop_speaking(self):
         """Para toda síntese de voz"""
-        # Limpar fila
-        while not self.speech_queue.empty():
-            try:
-                self.speech_queue.get_nowait()
-            except queue.Empty:
-                break
+        # Limpar fila e descartar respostas em streaming ainda chegando
+        self.speech_queue.clear()
+        with self._streams_lock:
+            streams = list(self._streams.values())
+        for stream in streams:
+            stream.cancel()
         
-        # Parar engine
-        if self.engine and self.is_speaking:
-            self.engine.stop()
+        # Parar engine e reprodução do cache
+        self._interrupt_current()
         
         self.logger.voice("Síntese de voz interrompida")
     
     def set_voice_rate(self, rate):
         """Ajusta velocidade da fala"""
         self.rate = max(50, min(300, rate))  # Limitar entre 50-300
-        if self.engine:
-            self.engine.setProperty('rate', self.rate)
         self.logger.voice(f"Velocidade da fala ajustada para: {self.rate}")
     
     def set_voice_volume(self, volume):
         """Ajusta volume da fala"""
         self.volume = max(0.0, min(1.0, volume))  # Limitar entre 0-1
-        if self.engine:
-            self.engine.setProperty('volume', self.volume)
         self.logger.voice(f"Volume ajustado para: {self.volume}")
     
     def list_available_voices(self):
@@ -237,15 +702,15 @@ class VoiceSynthesizer:
         if not self.engine:
             return []
         
-        voices = self.engine.getProperty('voices')
+        voices = self.engine.list_voices()
         voice_list = []
         
         for i, voice in enumerate(voices):
             voice_info = {
                 'id': i,
-                'name': voice.name,
-                'languages': voice.languages,
-                'gender': getattr(voice, 'gender', 'unknown')
+                'name': voice['name'],
+                'languages': voice['languages'],
+                'gender': voice['gender']
             }
             voice_list.append(voice_info)
         
@@ -253,21 +718,29 @@ class VoiceSynthesizer:
     
     def change_voice(self, voice_index):
         """Muda a voz utilizada"""
-        voices = self.engine.getProperty('voices')
+        voices = self.engine.list_voices()
         if voices and 0 <= voice_index < len(voices):
-            self.engine.setProperty('voice', voices[voice_index].id)
             self.voice_id = voice_index
-            self.logger.voice(f"Voz alterada para: {voices[voice_index].name}")
+            self._voice_key = voices[voice_index]['id']
+            self.logger.voice(f"Voz alterada para: {voices[voice_index]['name']}")
             return True
         return False
     
+    def get_cache_stats(self):
+        """Estatísticas do cache de áudio renderizado"""
+        return self.audio_cache.get_stats() if self.audio_cache else {}
+    
     def shutdown(self):
         """Finaliza o sistema de síntese"""
-        self.speech_queue.put((None, 0))  # Sinal para parar worker
+        self._shutdown.set()
+        self.speech_queue.close()  # Sinal para parar worker
+        self._interrupt_current()
         if self.speech_thread:
             self.speech_thread.join(timeout=2)
         
+        self._render_executor.shutdown(wait=False)
+        
         if self.engine:
-            self.engine.stop()
+            self.engine.shutdown()
         
         self.logger.voice("Sistema de síntese finalizado")
\ No newline at end of file
@@ -161,6 +161,7 @@ class JarvisWebInterface:
         self.event_manager.subscribe(Events.SYSTEM_STARTUP, self._on_system_startup)
         self.event_manager.subscribe(Events.SYSTEM_SHUTDOWN, self._on_system_shutdown)
         self.event_manager.subscribe(Events.AI_RESPONSE, self._on_ai_response)
+        self.event_manager.subscribe(Events.AI_RESPONSE_CHUNK, self._on_ai_response_chunk)
         self.event_manager.subscribe(Events.VOICE_COMMAND, self._on_voice_command)
         self.event_manager.subscribe(Events.AUTOMATION_TRIGGERED, self._on_automation_triggered)
     
@@ -182,6 +183,19 @@ class JarvisWebInterface:
             self.socketio.emit('ai_response', {
                 'response': data.get('text', ''),
                 'command': data.get('command', ''),
+                'timestamp': data.get('timestamp', time.time()),
+                'streamed': data.get('streamed', False),
+                'stream_id': data.get('stream_id')
+            })
+    
+    def _on_ai_response_chunk(self, data):
+        """Handler para trechos de resposta da IA em streaming"""
+        if self.connected_clients > 0:
+            self.socketio.emit('ai_response_chunk', {
+                'stream_id': data.get('stream_id'),
+                'index': data.get('index', 0),
+                'text': data.get('text', ''),
+                'command': data.get('command', ''),
                 'timestamp': data.get('timestamp', time.time())
             })
     
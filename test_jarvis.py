@@ -123,6 +123,869 @@ def test_ai_brain():
         print(f"❌ Erro no motor de IA: {e}")
         return False
 
+def test_intent_matcher():
+    """Testa o autômato de intenções: ocorrências sobrepostas e precedência entre famílias"""
+    try:
+        from ai.intent_matcher import IntentMatcher, KeywordAutomaton
+        
+        failures = []
+        
+        # Todas as ocorrências, inclusive sobrepostas e contidas em outras palavras
+        automaton = KeywordAutomaton()
+        for keyword in ('luz', 'luzes', 'zes', 'sala'):
+            automaton.add(keyword)
+        matches = sorted((start, end, keyword) for start, end, keyword, _ in automaton.iter_matches('luzes da sala'))
+        if matches != [(0, 3, 'luz'), (0, 5, 'luzes'), (2, 5, 'zes'), (9, 13, 'sala')]:
+            failures.append(f"sobreposição: {matches}")
+        
+        # Mesma semântica de ``palavra in texto`` para cada família
+        families = {
+            'lights': ['acender', 'apagar', 'luz', 'luzes'],
+            'music': ['tocar música', 'música', 'tocar'],
+            'climate': ['temperatura', 'ar condicionado']
+        }
+        matcher = IntentMatcher()
+        for rank, (family, keywords) in enumerate(families.items(), 1):
+            matcher.add_family(family, keywords, rank=rank)
+        matcher.add_family('location', ['sala', 'quarto'])
+        matcher.build()
+        
+        for text in ('apagar as luzes da sala', 'tocar música no quarto', 'ar condicionado e luz', 'nada aqui'):
+            result = matcher.match(text)
+            for family, keywords in families.items():
+                if result.has(family) != any(keyword in text for keyword in keywords):
+                    failures.append(f"{text!r}: {family}")
+        
+        # Intenção pela ordem das famílias; dentro dela, pela ordem de cadastro (não pela posição no texto)
+        result = matcher.match('tocar música e acender a luz da sala')
+        if [intent.family for intent in result.intents] != ['lights', 'music'] or result.first('music') != 'tocar música':
+            failures.append(f"precedência: {result.intents}")
+        if result.best.keyword != 'acender' or result.first('location') != 'sala':
+            failures.append(f"melhor intenção: {result.best}")
+        
+        if not failures:
+            print("✅ Autômato de intenções funcionando")
+            return True
+        else:
+            print(f"❌ Autômato de intenções incorreto: {failures}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro no autômato de intenções: {e}")
+        return False
+
+def test_partial_commands():
+    """Testa o casamento antecipado: hipóteses parciais disparam no máximo uma ação"""
+    try:
+        import time
+        from ai.brain import AIBrain
+        from core.config_manager import ConfigManager
+        from core.events import EventManager, Events
+        
+        config = ConfigManager().load_config()
+        brain = AIBrain(config)
+        
+        actions = []
+        event_manager = EventManager.get_instance()
+        callback = lambda data: actions.append((data['action'], data['location']))
+        event_manager.subscribe(Events.AUTOMATION_TRIGGERED, callback)
+        
+        # (hipóteses parciais, transcrição final, ação esperada)
+        replays = [
+            (["apagar", "apagar as", "apagar as luzes", "apagar as luzes do", "apagar as luzes do quarto"],
+             "apagar as luzes do quarto", ('turn_off_lights', 'quarto')),
+            (["apagar", "apagar as", "apagar as luzes", "apagar as luzes do"], "apagar as luzes do quarto", ('turn_off_lights', 'quarto')),
+            (["acender", "acender a luz"], "acender a luz", ('turn_on_lights', 'all'))
+        ]
+        
+        failures = []
+        for utterance_id, (partials, final, expected) in enumerate(replays, 1000):
+            actions.clear()
+            for text in partials:
+                brain.process_partial({'text': text, 'utterance_id': utterance_id})
+                time.sleep(0.15)
+            brain.process_command({'text': final, 'utterance_id': utterance_id})
+            time.sleep(0.2)
+            if actions != [expected]:
+                failures.append(f"{final!r}: {actions}")
+        
+        event_manager.unsubscribe(Events.AUTOMATION_TRIGGERED, callback)
+        brain.shutdown()
+        
+        if not failures:
+            print("✅ Hipóteses parciais disparam exatamente uma ação por frase")
+            return True
+        else:
+            print(f"❌ Ações incorretas a partir de hipóteses parciais: {failures}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro no casamento antecipado: {e}")
+        return False
+
+def test_fuzzy_commands():
+    """Testa a correção aproximada: erros do reconhecimento sim, frases comuns não"""
+    try:
+        from ai.brain import AIBrain
+        from core.config_manager import ConfigManager
+        
+        config = ConfigManager().load_config()
+        brain = AIBrain(config)
+        
+        corrected = {
+            "jarvis a cender luz da sala": 'lights:on:sala',
+            "acender a luz do quartto": 'lights:on:quarto',
+            "apagar a luz da cosinha": 'lights:off:cozinha',
+            "que oras são": 'que horas são'
+        }
+        # Frases comuns com palavras válidas que ficam a uma edição de um comando
+        not_commands = [
+            "pagar o boleto", "preciso pagar a fatura", "apagão na rua", "ascender na carreira",
+            "conta a pagar", "atender o telefone", "trocar o pneu", "em cima da mesa",
+            "vai valer a pena", "eles tocam violão", "as tocas dos coelhos", "o povo clama por justiça",
+            "vou logar no sistema", "o fogo acendeu"
+        ]
+        
+        failures = []
+        for text, expected in corrected.items():
+            match = brain._match_command(text)
+            if not match or match[0] != expected:
+                failures.append(f"{text!r} -> {match and match[0]} (esperado {expected})")
+        for text in not_commands:
+            match = brain._match_command(text)
+            if match:
+                failures.append(f"{text!r} -> {match[0]} (esperado nenhum comando)")
+        brain.shutdown()
+        
+        if not failures:
+            print("✅ Correção aproximada de comandos funcionando")
+            return True
+        else:
+            print(f"❌ Correção aproximada incorreta: {failures}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro na correção aproximada: {e}")
+        return False
+
+def test_response_cache():
+    """Testa o cache de respostas: perguntas quase iguais não compartilham resposta"""
+    try:
+        from ai.response_cache import ResponseCache
+        
+        answers = {
+            "quanto é 12 mais 13": "25",
+            "me lembre da reunião às 15h": "ok 15h",
+            "qual a capital da austria": "Viena"
+        }
+        near_misses = ["quanto é 12 mais 14", "me lembre da reunião às 16h", "qual a capital da australia"]
+        
+        failures = []
+        for threshold in (None, 0.92):
+            cache = ResponseCache(similarity_threshold=threshold)
+            for question, answer in answers.items():
+                cache.put(question, answer)
+            
+            for question in near_misses:
+                cached = cache.get(question)
+                if cached is not None:
+                    failures.append(f"{question!r} (limiar {threshold}) -> {cached!r}")
+            
+            if cache.get("Quanto é 12 mais 13?") != "25":
+                failures.append(f"acerto exato normalizado falhou (limiar {threshold})")
+        
+        # Acerto aproximado só com os mesmos números e palavras de conteúdo
+        cache = ResponseCache(similarity_threshold=0.92)
+        cache.put("qual é a capital da austria", "Viena")
+        if cache.get("qual a capital da austria") != "Viena":
+            failures.append("acerto aproximado legítimo falhou")
+        
+        if not failures:
+            print(f"✅ Cache de respostas funcionando - Stats: {cache.get_stats()}")
+            return True
+        else:
+            print(f"❌ Cache de respostas serviu respostas erradas: {failures}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro no cache de respostas: {e}")
+        return False
+
+def start_stub_server(**settings):
+    """Servidor LLM simulado numa porta livre (llm_stub_server.py)"""
+    import socket
+    from llm_stub_server import StubLLMServer, StubSettings
+    
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    settings.setdefault('jitter', 0.0)
+    return StubLLMServer(StubSettings(**settings), port=port).start()
+
+def test_llm_client():
+    """Testa o cliente LLM: retentativas em 429/500 e limite de requisições simultâneas"""
+    try:
+        from ai.llm_client import LLMClient
+        
+        failures = []
+        
+        # Falhas e limites de taxa simulados: toda chamada termina com a resposta
+        server = start_stub_server(latency=0.01, tokens_per_second=0, rate_limit_rate=0.25,
+                                   failure_rate=0.25, retry_after=0.01, seed=7)
+        client = LLMClient('stub', server.api_base, max_retries=8, backoff_base=0.01, timeout=5)
+        replies = [client.chat([{'role': 'user', 'content': f'pergunta {i}'}]) for i in range(10)]
+        rejected = server.rate_limited + server.failures
+        if set(replies) != {server.settings.response} or not rejected or client.get_stats()['retries'] != rejected:
+            failures.append(f"retentativas: {client.get_stats()} / {server.get_stats()}")
+        client.close()
+        server.stop()
+        
+        # Oito chamadas ao mesmo tempo, no máximo duas no servidor
+        server = start_stub_server(latency=0.2, tokens_per_second=0)
+        client = LLMClient('stub', server.api_base, max_concurrency=2, timeout=5)
+        futures = [client.submit(client.achat([{'role': 'user', 'content': f'pergunta {i}'}])) for i in range(8)]
+        replies = [future.result(10) for future in futures]
+        if len(replies) != 8 or server.max_active != 2:
+            failures.append(f"concorrência: {server.get_stats()}")
+        client.close()
+        server.stop()
+        
+        if not failures:
+            print("✅ Cliente LLM funcionando")
+            return True
+        else:
+            print(f"❌ Cliente LLM incorreto: {failures}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro no cliente LLM: {e}")
+        return False
+
+def test_llm_streaming():
+    """Testa o streaming SSE do cliente LLM e o cancelamento de um stream em andamento"""
+    try:
+        import time
+        from ai.llm_client import LLMClient
+        
+        server = start_stub_server(latency=0.01, tokens_per_second=20)
+        client = LLMClient('stub', server.api_base, timeout=5)
+        messages = [{'role': 'user', 'content': 'status do sistema'}]
+        failures = []
+        
+        # Um evento SSE por token, entregues conforme chegam
+        deltas = list(client.stream_chat(messages))
+        if ''.join(deltas) != server.settings.response or len(deltas) < 2:
+            failures.append(f"streaming: {len(deltas)} trechos")
+        
+        # Abandonar o stream fecha a conexão: o servidor para de gerar
+        stream = client.stream_chat(messages)
+        next(stream)
+        next(stream)
+        stream.close()
+        deadline = time.time() + 3
+        while not server.cancelled and time.time() < deadline:
+            time.sleep(0.05)
+        if not server.cancelled:
+            failures.append(f"cancelamento: {server.get_stats()}")
+        
+        client.close()
+        server.stop()
+        
+        if not failures:
+            print("✅ Streaming do cliente LLM funcionando")
+            return True
+        else:
+            print(f"❌ Streaming do cliente LLM incorreto: {failures}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro no streaming do cliente LLM: {e}")
+        return False
+
+def test_single_flight():
+    """Testa a coalescência: comandos idênticos simultâneos geram uma chamada e um AI_RESPONSE"""
+    try:
+        import threading
+        import time
+        from ai.brain import AIBrain
+        from ai.single_flight import SingleFlight
+        from core.events import EventManager, Events
+        
+        failures = []
+        
+        # Quatro chamadas com a mesma chave: uma execução, três resultados compartilhados
+        flight = SingleFlight()
+        barrier = threading.Barrier(4)
+        results = []
+        
+        def slow_call():
+            time.sleep(0.2)
+            return 'resultado'
+        
+        def caller():
+            barrier.wait()
+            results.append(flight.do('chave', slow_call))
+        
+        threads = [threading.Thread(target=caller) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        if sorted(results) != [('resultado', False)] + [('resultado', True)] * 3 or flight.get_stats()['executions'] != 1:
+            failures.append(f"coalescência: {results}")
+        
+        # No AIBrain: um pedido ao modelo e uma única resposta emitida
+        server = start_stub_server(latency=0.3, tokens_per_second=0)
+        config = {'ai': {
+            'openai_api_key': 'stub',
+            'api_base': server.api_base,
+            'streaming': False,
+            'response_cache': {'enabled': False}
+        }}
+        brain = AIBrain(config)
+        responses = []
+        event_manager = EventManager.get_instance()
+        callback = lambda data: responses.append(data['text'])
+        event_manager.subscribe(Events.AI_RESPONSE, callback)
+        
+        threads = [threading.Thread(target=brain.process_command, args=({'text': 'explique a teoria da relatividade'},))
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        time.sleep(0.2)
+        
+        event_manager.unsubscribe(Events.AI_RESPONSE, callback)
+        brain.shutdown()
+        server.stop()
+        
+        if responses != [server.settings.response] or server.requests != 1:
+            failures.append(f"AI_RESPONSE: {len(responses)} respostas, {server.requests} chamadas ao modelo")
+        
+        if not failures:
+            print("✅ Coalescência de comandos funcionando")
+            return True
+        else:
+            print(f"❌ Coalescência de comandos incorreta: {failures}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro na coalescência de comandos: {e}")
+        return False
+
+def test_response_deadline():
+    """Testa o prazo das respostas: sem modelo local vale o timeout do cliente, não o orçamento do fallback"""
+    try:
+        from ai.brain import AIBrain
+        
+        server = start_stub_server(latency=1.0, tokens_per_second=0)
+        config = {'ai': {
+            'openai_api_key': 'stub',
+            'api_base': server.api_base,
+            'streaming': False,
+            'client': {'timeout': 5},
+            'fallback': {'hedge_after': 0.2, 'response_budget': 0.5},
+            'response_cache': {'enabled': False}
+        }}
+        brain = AIBrain(config)
+        response = brain._get_ai_response("resuma o estado dos sistemas")
+        hedging = brain.hedging
+        brain.shutdown()
+        server.stop()
+        
+        if not hedging and response == server.settings.response:
+            print("✅ Resposta lenta (entre o orçamento e o timeout) entregue sem modelo local")
+            return True
+        else:
+            print(f"❌ Resposta lenta descartada (hedging={hedging}): {response!r}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro no prazo das respostas: {e}")
+        return False
+
+def test_voice_replay():
+    """Testa o reconhecimento de voz reproduzindo um WAV (sem microfone)"""
+    try:
+        import tempfile
+        import time
+        import wave
+        import numpy as np
+        from core.audio_capture import WavFileSource
+        from core.events import EventManager, Events
+        from core.voice_recognition import VoiceRecognizer
+        
+        # Fixture: silêncio, "fala" sintética e silêncio
+        rate = 16000
+        t = np.arange(rate) / rate
+        speech = (np.sin(2 * np.pi * 200 * t) * 6000).astype(np.int16)
+        silence = np.zeros(rate // 2, dtype=np.int16)
+        
+        fixture = os.path.join(tempfile.mkdtemp(), 'fixture.wav')
+        with wave.open(fixture, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(rate)
+            wav.writeframes(np.concatenate([silence, speech, silence]).tobytes())
+        
+        received = []
+        event_manager = EventManager.get_instance()
+        callback = lambda data: received.append(data)
+        event_manager.subscribe(Events.WAKE_WORD_DETECTED, callback)
+        
+        source = WavFileSource(fixture, speed=8)
+        recognizer = VoiceRecognizer({'audio': {'calibration': {'path': None}}}, audio_source=source, recognize=lambda audio: "jarvis")
+        recognizer.start_listening()
+        source.finished.wait(timeout=5)
+        time.sleep(0.3)
+        recognizer.stop_listening()
+        event_manager.unsubscribe(Events.WAKE_WORD_DETECTED, callback)
+        
+        if received:
+            print(f"✅ Reconhecimento por replay funcionando - Stats: {recognizer.get_recognition_stats()}")
+            return True
+        else:
+            print("❌ Wake word não foi detectado no replay")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro no reconhecimento por replay: {e}")
+        return False
+
+def test_recognition_pool():
+    """Testa o pool de reconhecimento: fila cheia descarta a frase mais antiga"""
+    try:
+        import threading
+        import time
+        from core.voice_recognition import RecognitionPool
+        
+        release = threading.Event()
+        processed = []
+        
+        def handler(phrase):
+            release.wait(5)  # Worker ocupado enquanto as próximas frases chegam
+            processed.append(phrase)
+        
+        pool = RecognitionPool(handler, num_workers=1, max_queue=2)
+        pool.start()
+        pool.submit('frase 1')
+        deadline = time.time() + 2
+        while pool.get_stats()['active'] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        for phrase in ('frase 2', 'frase 3', 'frase 4'):
+            pool.submit(phrase)
+        release.set()
+        
+        deadline = time.time() + 2
+        while pool.get_stats()['processed'] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        pool.stop()
+        
+        stats = pool.get_stats()
+        if processed == ['frase 1', 'frase 3', 'frase 4'] and stats['dropped'] == 1:
+            print("✅ Pool de reconhecimento funcionando")
+            return True
+        else:
+            print(f"❌ Pool de reconhecimento incorreto: {processed} ({stats})")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro no pool de reconhecimento: {e}")
+        return False
+
+def test_audio_cache():
+    """Testa o cache de áudio renderizado: despejo LRU por bytes e retorno do disco"""
+    try:
+        import tempfile
+        from core.tts_cache import RenderedAudio, RenderedAudioCache
+        
+        audio = lambda byte: RenderedAudio(byte * 400, 16000)  # 400 bytes de PCM
+        failures = []
+        
+        # Só memória: cabem duas entradas; a menos usada recentemente sai
+        cache = RenderedAudioCache(cache_dir=None, max_memory_bytes=1000)
+        cache.put('a', audio(b'a'))
+        cache.put('b', audio(b'b'))
+        cache.get('a')
+        cache.put('c', audio(b'c'))
+        if cache.get('b') is not None or cache.get('a') is None or cache.get('c') is None:
+            failures.append("despejo LRU")
+        if cache.get_stats()['memory_bytes'] != 800:
+            failures.append(f"bytes em memória: {cache.get_stats()}")
+        
+        # Com disco: a entrada despejada volta do arquivo WAV
+        cache = RenderedAudioCache(cache_dir=tempfile.mkdtemp(), max_memory_bytes=500)
+        cache.put('a', audio(b'a'))
+        cache.put('b', audio(b'b'))
+        restored = cache.get('a')
+        if restored is None or restored.pcm != audio(b'a').pcm or cache.disk_hits != 1:
+            failures.append(f"retorno do disco: {cache.get_stats()}")
+        
+        if not failures:
+            print("✅ Cache de áudio funcionando")
+            return True
+        else:
+            print(f"❌ Cache de áudio incorreto: {failures}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro no cache de áudio: {e}")
+        return False
+
+def start_test_synthesizer(**speech):
+    """VoiceSynthesizer com um engine simulado (sem pyttsx3 nem dispositivo de áudio)
+    
+    O engine registra em ``spoken`` cada trecho falado até o fim; cada trecho
+    "toca" por 0,3 s ou até ser interrompido.
+    """
+    import threading
+    from core.voice_synthesis import VoiceSynthesizer
+    
+    class FakePlayback:
+        available = False  # Sem PyAudio: o sintetizador fala cada trecho pelo engine
+    
+    class FakeEngine:
+        def __init__(self):
+            self.playback = FakePlayback()
+            self.started = []
+            self.spoken = []
+        
+        def say(self, text, rate=None, volume=None, voice=None, cancel=None):
+            self.started.append(text)
+            if not (cancel or threading.Event()).wait(0.3):
+                self.spoken.append(text)
+        
+        def stop_saying(self):
+            pass
+        
+        def list_voices(self):
+            return []
+        
+        def shutdown(self):
+            pass
+    
+    class TestSynthesizer(VoiceSynthesizer):
+        def _initialize_engine(self):
+            self.engine = FakeEngine()
+    
+    return TestSynthesizer({'audio': {'tts_cache': {'enabled': False}, 'speech': speech}})
+
+def test_speech_scheduler():
+    """Testa a fila de fala: ordem por prioridade, prazo de validade e preempção"""
+    try:
+        import time
+        from core.voice_synthesis import SpeechScheduler
+        
+        failures = []
+        
+        # Maior prioridade primeiro; empate em ordem de chegada
+        scheduler = SpeechScheduler()
+        for text, priority in (('baixa', 0), ('normal', 1), ('urgente', 10), ('normal 2', 1)):
+            scheduler.put(text, priority)
+        order = [scheduler.get(timeout=0).text for _ in range(4)]
+        if order != ['urgente', 'normal', 'normal 2', 'baixa']:
+            failures.append(f"prioridade: {order}")
+        
+        # Fala vencida é descartada ao sair da fila, sem chegar ao engine
+        expired = scheduler.put('vencida', 10, ttl=0.01)
+        scheduler.put('válida', 1)
+        time.sleep(0.05)
+        item = scheduler.get(timeout=0)
+        if item is None or item.text != 'válida' or scheduler.dropped != 1 or not expired.done.is_set():
+            failures.append(f"prazo: {item and item.text} ({scheduler.dropped} descartadas)")
+        
+        # Fala urgente interrompe a menos urgente, que retoma do trecho em que parou
+        synthesizer = start_test_synthesizer(chunk_chars=40, first_chunk_chars=40)
+        engine = synthesizer.engine
+        low = synthesizer.speak("Primeira frase do relatório. Segunda frase do relatório.",
+                                synthesizer.PRIORITY_LOW, personality=False)
+        deadline = time.time() + 2
+        while not engine.started and time.time() < deadline:
+            time.sleep(0.01)
+        urgent = synthesizer.speak("Alerta de segurança.", synthesizer.PRIORITY_URGENT, personality=False)
+        low.done.wait(5)
+        urgent.done.wait(5)
+        synthesizer.shutdown()
+        
+        expected = ["Alerta de segurança.", "Primeira frase do relatório.", "Segunda frase do relatório."]
+        if engine.spoken != expected or engine.started[0] != expected[1]:
+            failures.append(f"preempção: {engine.started} → {engine.spoken}")
+        
+        if not failures:
+            print("✅ Fila de fala funcionando")
+            return True
+        else:
+            print(f"❌ Fila de fala incorreta: {failures}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro na fila de fala: {e}")
+        return False
+
+def test_speech_stream():
+    """Testa a fala em streaming: trechos fora de ordem são reordenados antes de falar"""
+    try:
+        synthesizer = start_test_synthesizer(chunk_chars=40, first_chunk_chars=40)
+        pieces = ["Primeira frase do ", "relatório. Segunda frase", " do relatório. Terceira", " frase."]
+        
+        for index in (2, 3, 0, 1):
+            stream = synthesizer.feed_stream('resposta-1', index, pieces[index])
+        synthesizer.finish_stream('resposta-1', len(pieces))
+        for item in stream.items:
+            item.done.wait(5)
+        synthesizer.shutdown()
+        
+        expected = ["Primeira frase do relatório.", "Segunda frase do relatório.", "Terceira frase."]
+        if synthesizer.engine.spoken == expected and stream.finished:
+            print("✅ Fala em streaming funcionando")
+            return True
+        else:
+            print(f"❌ Fala em streaming incorreta: {synthesizer.engine.spoken}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro na fala em streaming: {e}")
+        return False
+
+def test_memory_store():
+    """Testa o armazenamento da memória: leituras de muitas threads com conexões limitadas"""
+    try:
+        import tempfile
+        import threading
+        from ai.memory_store import MemoryStore
+        
+        store = MemoryStore(os.path.join(tempfile.mkdtemp(), 'memory.sqlite'), max_readers=4)
+        store.execute('CREATE TABLE notes (id INTEGER PRIMARY KEY, text TEXT)')
+        store.executemany('INSERT INTO notes (text) VALUES (?)', [(f"nota {n}",) for n in range(100)])
+        store.flush()
+        
+        # Uma thread curta por requisição, como no servidor web
+        counts = []
+        def request():
+            counts.append(store.query('SELECT COUNT(*) FROM notes')[0][0])
+        threads = [threading.Thread(target=request) for _ in range(200)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        stats = store.get_stats()
+        store.close()
+        
+        if counts == [100] * 200 and stats['readers'] <= 4:
+            print(f"✅ Armazenamento da memória funcionando - Stats: {stats}")
+            return True
+        else:
+            print(f"❌ Leituras incorretas ou conexões demais ({stats['readers']} leitores)")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro no armazenamento da memória: {e}")
+        return False
+
+def test_knowledge_search():
+    """Testa a base de conhecimento: BM25 sobre o FTS5 e os triggers que mantêm o índice"""
+    cwd = os.getcwd()
+    try:
+        import tempfile
+        from ai.advanced_brain import AdvancedAI
+        
+        os.chdir(tempfile.mkdtemp())  # Banco temporário em ./data
+        ai = AdvancedAI({'semantic_index': {'enabled': False}})
+        if not ai.fts_enabled:
+            ai.close()
+            print("❌ SQLite sem FTS5")
+            return False
+        
+        ai.add_knowledge('Configuração de firewall', 'Regras de filtragem de pacotes na rede.')
+        ai.add_knowledge('Roteadores', 'O firewall do roteador bloqueia portas.')
+        ai.add_knowledge('Criptografia', 'Cifras simétricas e assimétricas protegem dados.')
+        ai.flush()
+        
+        topics = lambda query: [result['topic'] for result in ai.search_knowledge(query)]
+        failures = []
+        
+        # Tópico pesa mais que o conteúdo; acentos e prefixos não importam
+        if topics('firewall') != ['Configuração de firewall', 'Roteadores']:
+            failures.append(f"ranking BM25: {topics('firewall')}")
+        if topics('configuracao') != ['Configuração de firewall']:
+            failures.append(f"sem acentos: {topics('configuracao')}")
+        
+        # UPDATE (via UPSERT) e DELETE chegam ao índice pelos triggers
+        ai.add_knowledge('Criptografia', 'Chaves públicas e privadas.')
+        ai.store.execute('DELETE FROM knowledge_base WHERE topic = ?', ('Roteadores',))
+        ai.flush()
+        if topics('chaves') != ['Criptografia'] or topics('cifras'):
+            failures.append(f"update: {topics('chaves')} / {topics('cifras')}")
+        if topics('roteador'):
+            failures.append(f"delete: {topics('roteador')}")
+        ai.close()
+        
+        if not failures:
+            print("✅ Busca na base de conhecimento funcionando")
+            return True
+        else:
+            print(f"❌ Busca na base de conhecimento incorreta: {failures}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro na busca da base de conhecimento: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+
+def test_semantic_search():
+    """Testa a busca semântica: complemento de erros de digitação e índice à frente do banco"""
+    cwd = os.getcwd()
+    try:
+        import glob
+        import tempfile
+        import time
+        from ai.advanced_brain import AdvancedAI
+        
+        os.chdir(tempfile.mkdtemp())  # Banco temporário em ./data
+        ai = AdvancedAI({'semantic_index': {'sync_delay': 0.05}})
+        ai.add_knowledge('Configuração de firewall', 'Regras de filtragem de pacotes na rede.')
+        ai.add_knowledge('Criptografia', 'Cifras simétricas e assimétricas protegem dados.')
+        ai.flush()
+        
+        index = ai.semantic_indexes['knowledge']
+        deadline = time.time() + 5
+        while len(index) < 2 and time.time() < deadline:
+            time.sleep(0.05)  # Indexação na thread de sincronização
+        
+        failures = []
+        
+        # "firewals" não casa no FTS5: o resultado vem do complemento semântico
+        topics = [result['topic'] for result in ai.search_knowledge('firewals')]
+        if topics[:1] != ['Configuração de firewall']:
+            failures.append(f"complemento semântico: {topics}")
+        ai.close()
+        
+        # Banco apagado com o índice mantido: o índice à frente do MAX(id) é refeito
+        for path in glob.glob('data/ai_memory.sqlite*'):
+            os.remove(path)
+        ai = AdvancedAI({'semantic_index': {'sync_delay': 0.05}})
+        if len(ai.semantic_indexes['knowledge']) or ai.semantic_search('firewall'):
+            failures.append("índice antigo não foi refeito")
+        ai.close()
+        
+        if not failures:
+            print("✅ Busca semântica funcionando")
+            return True
+        else:
+            print(f"❌ Busca semântica incorreta: {failures}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro na busca semântica: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+
+def test_learning_stats():
+    """Testa os contadores de learning_stats: carga inicial, UPSERT e remoção"""
+    cwd = os.getcwd()
+    try:
+        import sqlite3
+        import tempfile
+        from ai.advanced_brain import AdvancedAI
+        
+        os.chdir(tempfile.mkdtemp())  # Banco temporário em ./data
+        ai = AdvancedAI({'semantic_index': {'enabled': False}})
+        for text in ('oi', 'tudo bem?', 'até logo'):
+            ai.save_conversation(text, 'Olá, senhor.', None, 'neutral', ['casual'])
+        ai.save_preference('musica', 'genero', 'jazz', 0.9)
+        ai.save_preference('musica', 'genero', 'rock', 0.9)  # UPSERT: mesma linha
+        ai.add_knowledge('Redes', 'Endereços IP e máscaras.')
+        ai.add_knowledge('Redes', 'Endereços IPv6.')  # UPSERT: mesma linha
+        ai.store.execute('DELETE FROM conversations WHERE user_input = ?', ('oi',))
+        ai.flush()
+        
+        expected = {'conversations': 2, 'user_preferences': 1, 'knowledge_base': 1}
+        failures = []
+        if ai.get_table_counts() != expected:
+            failures.append(f"triggers: {ai.get_table_counts()}")
+        ai.close()
+        
+        # Banco anterior aos contadores: a tabela é criada e preenchida com COUNT(*)
+        connection = sqlite3.connect('data/ai_memory.sqlite')
+        connection.execute('DROP TABLE learning_stats')
+        for (trigger,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'learning_stats_%'").fetchall():
+            connection.execute(f'DROP TRIGGER {trigger}')
+        connection.commit()
+        connection.close()
+        
+        ai = AdvancedAI({'semantic_index': {'enabled': False}})
+        if ai.get_table_counts() != expected:
+            failures.append(f"carga inicial: {ai.get_table_counts()}")
+        ai.save_conversation('oi de novo', 'Olá, senhor.', None, 'neutral', ['casual'])
+        ai.flush()
+        if ai.get_table_counts()['conversations'] != 3:
+            failures.append(f"triggers recriados: {ai.get_table_counts()}")
+        ai.close()
+        
+        if not failures:
+            print("✅ Estatísticas de aprendizado funcionando")
+            return True
+        else:
+            print(f"❌ Estatísticas de aprendizado incorretas: {failures}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro nas estatísticas de aprendizado: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+
+def test_sentiment():
+    """Testa o léxico de sentimento: lote igual ao texto isolado e cache LRU"""
+    try:
+        import numpy as np
+        from ai.sentiment import SentimentScorer, TextBlob
+        
+        texts = [
+            "Adorei, ficou excelente!",
+            "Não gostei, o sistema travou de novo",
+            "muito bom, mas meio lento",
+            "ligar as luzes da sala",
+            "",
+            "really great, thanks"
+        ]
+        failures = []
+        
+        for use_textblob in (False, True):
+            if use_textblob and TextBlob is None:
+                print("⚠️ TextBlob não instalado: caminho opcional não testado")
+                continue
+            scorer = SentimentScorer(use_textblob=use_textblob)
+            polarities, subjectivities = scorer.score_batch(texts)
+            expected = [scorer.score(text) for text in texts]
+            if not (np.allclose(polarities, [result.polarity for result in expected], atol=1e-6)
+                    and np.allclose(subjectivities, [result.subjectivity for result in expected], atol=1e-6)):
+                failures.append(f"score_batch (textblob={use_textblob}): {polarities.tolist()}")
+            
+            hits = scorer.cache_info().hits
+            scorer.score(texts[0])
+            if scorer.cache_info().hits != hits + 1:
+                failures.append(f"cache LRU (textblob={use_textblob}): {scorer.cache_info()}")
+        
+        scorer = SentimentScorer()
+        if not (scorer.score(texts[0]).polarity > 0 > scorer.score(texts[1]).polarity):
+            failures.append(f"polaridade: {scorer.score(texts[0])} / {scorer.score(texts[1])}")
+        
+        if not failures:
+            print("✅ Análise de sentimento funcionando")
+            return True
+        else:
+            print(f"❌ Análise de sentimento incorreta: {failures}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erro na análise de sentimento: {e}")
+        return False
+
 def test_learning_system():
     """Testa sistema de aprendizado"""
     try:
@@ -168,6 +1031,24 @@ def main():
         ("Sistema de Logging", test_logging),
         ("Sistema de Eventos", test_events),
         ("Motor de IA", test_ai_brain),
+        ("Autômato de Intenções", test_intent_matcher),
+        ("Comandos por Hipótese Parcial", test_partial_commands),
+        ("Correção de Comandos", test_fuzzy_commands),
+        ("Cache de Respostas", test_response_cache),
+        ("Cliente LLM", test_llm_client),
+        ("Streaming do Cliente LLM", test_llm_streaming),
+        ("Coalescência de Comandos", test_single_flight),
+        ("Prazo das Respostas", test_response_deadline),
+        ("Reconhecimento de Voz (replay)", test_voice_replay),
+        ("Pool de Reconhecimento", test_recognition_pool),
+        ("Cache de Áudio", test_audio_cache),
+        ("Fila de Fala", test_speech_scheduler),
+        ("Fala em Streaming", test_speech_stream),
+        ("Armazenamento da Memória", test_memory_store),
+        ("Busca na Base de Conhecimento", test_knowledge_search),
+        ("Busca Semântica", test_semantic_search),
+        ("Estatísticas de Aprendizado", test_learning_stats),
+        ("Análise de Sentimento", test_sentiment),
         ("Sistema de Aprendizado", test_learning_system),
         ("Interface Web", test_web_interface),
     ]
@@ -168,15 +168,18 @@ def api_network_report():
 @app.route('/api/ai/stats')
 def api_ai_stats():
     """API para estatísticas da IA"""
-    if not ADVANCED_FEATURES or not ai_brain:
+    if not ADVANCED_FEATURES or not advanced_ai:
         return jsonify({'success': False, 'error': 'Cérebro AI não disponível'}), 503
     
     try:
+        learning = advanced_ai.get_learning_stats()
         stats = {
-            'memory_entries': len(getattr(ai_brain, 'memory', [])),
-            'learning_patterns': len(getattr(ai_brain, 'learning_patterns', [])),
+            'memory_entries': learning['conversations'],
+            'learning_patterns': len(learning['learning_patterns']),
+            'preferences': learning['preferences'],
+            'knowledge_items': learning['knowledge_items'],
             'status': 'active',
-            'uptime': int(time.time() - start_time) if 'start_time' in globals() else 0
+            'uptime': int(time.time() - start_time)
         }
         return jsonify(stats)
     except Exception as e: